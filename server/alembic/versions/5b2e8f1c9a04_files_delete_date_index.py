@@ -0,0 +1,28 @@
+"""files delete_date index
+
+Revision ID: 5b2e8f1c9a04
+Revises: a7c1e9d2f4b3
+Create Date: 2026-10-18 10:03:27.554190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8f1c9a04'
+down_revision: Union[str, Sequence[str], None] = 'a7c1e9d2f4b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_files_delete_date_id', 'files', ['delete_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_files_delete_date_id', table_name='files')
@@ -0,0 +1,41 @@
+"""file contents index
+
+Revision ID: a7c1e9d2f4b3
+Revises: b8e2d4f6a1c3
+Create Date: 2026-10-18 09:12:44.102311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c1e9d2f4b3'
+down_revision: Union[str, Sequence[str], None] = 'b8e2d4f6a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('file_contents',
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('object_name', sa.String(), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('content_hash')
+    )
+    op.add_column('files', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_foreign_key('files_content_hash_fkey', 'files', 'file_contents', ['content_hash'], ['content_hash'])
+    op.create_index(op.f('ix_files_content_hash'), 'files', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_files_content_hash'), table_name='files')
+    op.drop_constraint('files_content_hash_fkey', 'files', type_='foreignkey')
+    op.drop_column('files', 'content_hash')
+    op.drop_table('file_contents')
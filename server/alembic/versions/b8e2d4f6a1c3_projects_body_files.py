@@ -0,0 +1,91 @@
+"""projects body, files
+
+Revision ID: b8e2d4f6a1c3
+Revises: d003aaba5033
+Create Date: 2026-10-18 09:05:21.640173
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2d4f6a1c3'
+down_revision: Union[str, Sequence[str], None] = 'd003aaba5033'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _project_foreign_keys(inspector) -> list[tuple[str, dict]]:
+    return [
+        (table, foreign_key)
+        for table in inspector.get_table_names()
+        for foreign_key in inspector.get_foreign_keys(table)
+        if foreign_key['referred_table'] == 'projects'
+    ]
+
+
+def _alter_project_id(inspector, type_, existing_type, cast: str) -> None:
+    """projects.id 와 그것을 가리키는 FK 컬럼의 타입을 같이 바꾼다."""
+    foreign_keys = _project_foreign_keys(inspector)
+    for table, foreign_key in foreign_keys:
+        op.drop_constraint(foreign_key['name'], table, type_='foreignkey')
+    op.alter_column('projects', 'id', type_=type_, existing_type=existing_type, postgresql_using=f'id::{cast}')
+    for table, foreign_key in foreign_keys:
+        for column in foreign_key['constrained_columns']:
+            op.alter_column(table, column, type_=type_, existing_type=existing_type, postgresql_using=f'{column}::{cast}')
+        op.create_foreign_key(
+            foreign_key['name'], table, 'projects', foreign_key['constrained_columns'], foreign_key['referred_columns']
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 모델은 projects.body 와 files 를 쓰는데 이전 리비전에는 없다.
+    # 모델로 테이블을 만든 DB 에는 이미 있으므로 없는 것만 만든다.
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name']: column for column in inspector.get_columns('projects')}
+    if 'body' not in columns:
+        op.add_column('projects', sa.Column('body', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+        if 'title' in columns:
+            op.execute("""
+                UPDATE projects SET body = jsonb_build_object(
+                    'id', id::text, 'title', title,
+                    'sections', '[]'::jsonb, 'scenes', '[]'::jsonb, 'media', '[]'::jsonb
+                )
+            """)
+    # 모델의 id 는 VARCHAR 다. asyncpg 는 VARCHAR 로 보낸 값을 UUID 컬럼에 넣지 못한다.
+    if isinstance(columns['id']['type'], sa.Uuid):
+        _alter_project_id(inspector, sa.String(), sa.UUID(), 'text')
+    # 제목은 본문에 있다. 앱은 title 컬럼을 채우지 않는다.
+    if 'title' in columns and not columns['title']['nullable']:
+        op.alter_column('projects', 'title', existing_type=sa.String(), nullable=True)
+    if not inspector.has_table('files'):
+        op.create_table('files',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('project_id', sa.String(), nullable=False),
+        sa.Column('delete_date', sa.Date(), nullable=True),
+        sa.Column('bucket', sa.String(), nullable=False),
+        sa.Column('object_name', sa.String(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('files')
+    inspector = sa.inspect(op.get_bind())
+    columns = {column['name']: column for column in inspector.get_columns('projects')}
+    if not isinstance(columns['id']['type'], sa.Uuid):
+        _alter_project_id(inspector, sa.UUID(), sa.String(), 'uuid')
+    if 'title' in columns:
+        op.execute("UPDATE projects SET title = coalesce(title, body->>'title', '') WHERE title IS NULL")
+        op.alter_column('projects', 'title', existing_type=sa.String(), nullable=False)
+    op.drop_column('projects', 'body')
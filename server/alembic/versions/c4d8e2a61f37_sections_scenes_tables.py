@@ -0,0 +1,228 @@
+"""sections, intervals, scenes tables
+
+Revision ID: c4d8e2a61f37
+Revises: 5b2e8f1c9a04
+Create Date: 2026-10-18 11:20:05.318842
+
+"""
+from typing import Iterator, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2a61f37'
+down_revision: Union[str, Sequence[str], None] = '5b2e8f1c9a04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 한 번에 옮기는 프로젝트 수. 본문이 큰 프로젝트도 메모리에 이만큼만 올린다.
+BATCH_SIZE = 200
+
+# server/common/order_key.py 와 같은 키. 마이그레이션이 앱 코드에 묶이지 않도록 여기 따로 둔다.
+_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def _keys() -> Iterator[str]:
+    key: Optional[str] = None
+    while True:
+        if key is None:
+            key = _DIGITS[len(_DIGITS) // 2]
+        else:
+            for i, ch in enumerate(key):
+                digit = _DIGITS.index(ch)
+                if digit < len(_DIGITS) - 1:
+                    key = key[:i] + _DIGITS[digit + 1]
+                    break
+            else:
+                key = key + _DIGITS[len(_DIGITS) // 2]
+        yield key
+
+
+projects = sa.table(
+    'projects',
+    sa.column('id', sa.String()),
+    sa.column('body', postgresql.JSONB()),
+)
+sections = sa.table(
+    'sections',
+    sa.column('id', sa.String()),
+    sa.column('project_id', sa.String()),
+    sa.column('position', sa.String()),
+    sa.column('type', sa.String()),
+    sa.column('duration', sa.Float()),
+    sa.column('file_id', sa.String()),
+    sa.column('data', postgresql.JSONB()),
+)
+intervals = sa.table(
+    'intervals',
+    sa.column('section_id', sa.String()),
+    sa.column('id', sa.String()),
+    sa.column('position', sa.String()),
+    sa.column('words', postgresql.JSONB()),
+    sa.column('audio', postgresql.JSONB()),
+)
+scenes = sa.table(
+    'scenes',
+    sa.column('id', sa.String()),
+    sa.column('project_id', sa.String()),
+    sa.column('position', sa.String()),
+    sa.column('media_id', sa.String()),
+    sa.column('interval_count', sa.Integer()),
+    sa.column('media', postgresql.JSONB()),
+)
+
+
+def _backfill() -> None:
+    """projects.body 의 sections/scenes 배열을 BATCH_SIZE 개 프로젝트씩 행으로 옮긴다."""
+    bind = op.get_bind()
+    after = None
+    while True:
+        query = sa.select(projects.c.id, projects.c.body).order_by(projects.c.id).limit(BATCH_SIZE)
+        if after is not None:
+            query = query.where(projects.c.id > after)
+        batch = bind.execute(query).all()
+        if not batch:
+            break
+
+        section_rows, interval_rows, scene_rows = [], [], []
+        for project_id, body in batch:
+            body = body or {}
+            for section, position in zip(body.get('sections') or [], _keys()):
+                data = {
+                    key: value for key, value in section.items()
+                    if key not in ('id', 'type', 'duration', 'file_id', 'intervals')
+                }
+                section_rows.append({
+                    'id': section['id'],
+                    'project_id': project_id,
+                    'position': position,
+                    'type': section.get('type', 'blank'),
+                    'duration': section.get('duration') or 0.0,
+                    'file_id': section.get('file_id'),
+                    'data': data,
+                })
+                for interval, interval_position in zip(section.get('intervals') or [], _keys()):
+                    interval_rows.append({
+                        'section_id': section['id'],
+                        'id': interval['id'],
+                        'position': interval_position,
+                        'words': interval.get('words') or [],
+                        'audio': interval.get('audio'),
+                    })
+            for scene, position in zip(body.get('scenes') or [], _keys()):
+                scene_rows.append({
+                    'id': scene['scene_id'],
+                    'project_id': project_id,
+                    'position': position,
+                    'media_id': scene.get('media_id'),
+                    'interval_count': scene.get('interval_count') or 0,
+                    'media': scene.get('media'),
+                })
+
+        if section_rows:
+            bind.execute(sa.insert(sections), section_rows)
+        if interval_rows:
+            bind.execute(sa.insert(intervals), interval_rows)
+        if scene_rows:
+            bind.execute(sa.insert(scenes), scene_rows)
+        bind.execute(
+            sa.update(projects)
+            .where(projects.c.id.in_([project_id for project_id, _ in batch]))
+            .values(body=projects.c.body.op('-')('sections').op('-')('scenes'))
+        )
+        after = batch[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    # 0fddbbc00627 의 scenes (media_id 가 project_media 를 가리키는 예전 씬)는 지금 씬과 필드가 달라 옮기지 않는다.
+    # 데이터를 잃지 않도록 이름만 바꿔 두고, downgrade 때 되돌린다.
+    if inspector.has_table('scenes'):
+        op.rename_table('scenes', 'scenes_legacy')
+        op.execute('ALTER INDEX scenes_pkey RENAME TO scenes_legacy_pkey')
+    # FK 는 projects.id 와 타입이 같아야 한다. (마이그레이션으로 만든 DB 는 UUID, 모델로 만든 DB 는 VARCHAR)
+    project_id_type = next(column['type'] for column in inspector.get_columns('projects') if column['name'] == 'id')
+
+    op.create_table('sections',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('project_id', project_id_type, nullable=False),
+    sa.Column('position', sa.String(collation='C'), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('duration', sa.Float(), nullable=False),
+    sa.Column('file_id', sa.String(), nullable=True),
+    sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id', 'position', name='uq_sections_project_position', deferrable=True, initially='DEFERRED')
+    )
+    op.create_index(op.f('ix_sections_file_id'), 'sections', ['file_id'], unique=False)
+    op.create_table('intervals',
+    sa.Column('section_id', sa.String(), nullable=False),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('position', sa.String(collation='C'), nullable=False),
+    sa.Column('words', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('audio', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.ForeignKeyConstraint(['section_id'], ['sections.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('section_id', 'id'),
+    sa.UniqueConstraint('section_id', 'position', name='uq_intervals_section_position', deferrable=True, initially='DEFERRED')
+    )
+    op.create_table('scenes',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('project_id', project_id_type, nullable=False),
+    sa.Column('position', sa.String(collation='C'), nullable=False),
+    sa.Column('media_id', sa.String(), nullable=True),
+    sa.Column('interval_count', sa.Integer(), nullable=False),
+    sa.Column('media', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id', 'position', name='uq_scenes_project_position', deferrable=True, initially='DEFERRED')
+    )
+    _backfill()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 행을 순서대로 다시 본문 배열로 합친다.
+    op.execute("""
+        UPDATE projects p SET body = coalesce(p.body, '{}'::jsonb) || jsonb_build_object(
+            'sections', coalesce((
+                SELECT jsonb_agg(
+                    s.data
+                    || jsonb_build_object('id', s.id, 'type', s.type, 'duration', s.duration)
+                    || CASE WHEN s.type = 'speech' THEN jsonb_build_object(
+                        'file_id', s.file_id,
+                        'intervals', coalesce((
+                            SELECT jsonb_agg(
+                                jsonb_build_object('id', i.id, 'words', i.words, 'audio', i.audio)
+                                ORDER BY i.position
+                            )
+                            FROM intervals i WHERE i.section_id = s.id
+                        ), '[]'::jsonb)
+                    ) ELSE '{}'::jsonb END
+                    ORDER BY s.position
+                )
+                FROM sections s WHERE s.project_id = p.id
+            ), '[]'::jsonb),
+            'scenes', coalesce((
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'scene_id', c.id, 'project_id', c.project_id, 'media_id', c.media_id,
+                        'interval_count', c.interval_count, 'media', c.media
+                    )
+                    ORDER BY c.position
+                )
+                FROM scenes c WHERE c.project_id = p.id
+            ), '[]'::jsonb)
+        )
+    """)
+    op.drop_table('scenes')
+    op.drop_table('intervals')
+    op.drop_index(op.f('ix_sections_file_id'), table_name='sections')
+    op.drop_table('sections')
+    if sa.inspect(op.get_bind()).has_table('scenes_legacy'):
+        op.rename_table('scenes_legacy', 'scenes')
+        op.execute('ALTER INDEX scenes_legacy_pkey RENAME TO scenes_pkey')
@@ -0,0 +1,31 @@
+"""projects, sections version
+
+Revision ID: d9a3b7c2e5f1
+Revises: c4d8e2a61f37
+Create Date: 2026-10-18 14:02:41.127305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a3b7c2e5f1'
+down_revision: Union[str, Sequence[str], None] = 'c4d8e2a61f37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # server_default 가 있는 NOT NULL 컬럼이라 Postgres 11+ 에서는 테이블을 다시 쓰지 않는다.
+    op.add_column('projects', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('sections', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('sections', 'version')
+    op.drop_column('projects', 'version')
@@ -0,0 +1,34 @@
+"""projects updated_at
+
+Revision ID: e5c1f8a3d7b2
+Revises: d9a3b7c2e5f1
+Create Date: 2026-10-18 16:37:12.804521
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c1f8a3d7b2'
+down_revision: Union[str, Sequence[str], None] = 'd9a3b7c2e5f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존 프로젝트는 모두 마이그레이션한 시각으로 시작한다.
+    op.add_column(
+        'projects',
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.create_index('ix_projects_updated_at_id', 'projects', ['updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_projects_updated_at_id', table_name='projects')
+    op.drop_column('projects', 'updated_at')
@@ -0,0 +1,30 @@
+"""files size bigint
+
+Revision ID: f2a8c4e6b9d1
+Revises: e5c1f8a3d7b2
+Create Date: 2026-10-18 19:41:08.273915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8c4e6b9d1'
+down_revision: Union[str, Sequence[str], None] = 'e5c1f8a3d7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 멀티파트로 바로 올리는 파일은 2 GiB 를 넘을 수 있다.
+    op.alter_column('files', 'size', existing_type=sa.Integer(), type_=sa.BigInteger(), existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # 2 GiB 를 넘는 파일이 있으면 실패한다. 크기를 잘라서 잃지 않도록 그대로 둔다.
+    op.alter_column('files', 'size', existing_type=sa.BigInteger(), type_=sa.Integer(), existing_nullable=False)
@@ -1,13 +1,29 @@
+import logging
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from .settings import ApiSettings
 from .project_api import router as project_router
 from .media_api import router as media_router
 from .scene_api import router as scene_router
 from .section_api import router as section_router
+from .tts_api import router as tts_router
+from server.storage.storage_client import provision_buckets
+from .subtitle_api import router as subtitle_router
+from .storage_api import router as storage_router
 
 app = FastAPI()
 
+
+@app.on_event("startup")
+async def provision_storage() -> None:
+    # 버킷(로컬 저장소면 디렉터리)을 미리 준비해 두면 업로드 때 버킷 확인 요청이 필요 없다.
+    # 저장소가 아직 안 떠 있어도 앱은 뜨고, 처음 쓸 때 다시 시도한다.
+    try:
+        await run_in_threadpool(provision_buckets)
+    except Exception:
+        logging.getLogger(__name__).warning("bucket provisioning failed, will retry lazily", exc_info=True)
+
 # CORS 설정
 _settings = ApiSettings()
 _origins_raw = _settings.backend_cors_origins or ""
@@ -20,6 +36,8 @@ if _origins:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # 로컬 저장소로 part 를 올릴 때 브라우저가 ETag 를, 프로젝트 목록에서 다음 페이지 cursor 를 읽어야 한다.
+        expose_headers=["ETag", "X-Next-Cursor"],
     )
 
 
@@ -27,3 +45,6 @@ app.include_router(project_router)
 app.include_router(media_router)
 app.include_router(scene_router)
 app.include_router(section_router)
+app.include_router(tts_router)
+app.include_router(subtitle_router)
+app.include_router(storage_router)
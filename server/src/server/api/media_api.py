@@ -1,26 +1,125 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from uuid import UUID
-from server.database import get_db
-from server.service.project_media import create_file_by_media_stream, get_all_media, get_all_url_map
-from server.api.schemas import MediaResponse
+from server.database import get_db, get_sync_db
+from server.common.exception import ServiceError
+from server.service.project_media import (
+    create_file_by_media_stream,
+    create_media_by_body_stream,
+    get_all_media,
+    get_all_url_map,
+    parse_sha256,
+)
+from server.service.project_types import Media
+from server.service.media_upload import (
+    abort_upload_session,
+    complete_upload_session,
+    create_upload_session,
+    get_upload_session,
+    part_urls,
+)
+from server.api.schemas import (
+    CompleteMediaUploadRequest,
+    MediaResponse,
+    MediaUploadRequest,
+    MediaUploadResponse,
+    UploadPartUrl,
+    UploadPartUrlsRequest,
+)
 
 router = APIRouter()
 
+# 저장소 입출력과 DB 쓰기가 섞인 라우트는 sync 로 두고 FastAPI 스레드풀에서 돌린다.
 @router.post("/projects/{project_id}/media/upload")
-async def upload_media_api(project_id: str, file: UploadFile = File(...), db: Session = Depends(get_db)):
+def upload_media_api(project_id: str, file: UploadFile = File(...), db: Session = Depends(get_sync_db)):
     try:
         media = create_file_by_media_stream(db, project_id, file.file, content_type=file.content_type, name=file.filename)
         return {"media_id": media.id}
     except Exception as e:
         raise HTTPException(400, f"Failed to upload media: {str(e)}")
 
+# multipart/form 을 거치지 않고 요청 본문을 그대로 저장소로 흘려보낸다.
+# sha256 을 주고 같은 내용이 이미 있으면 본문을 읽지 않고 등록한다.
+@router.put("/projects/{project_id}/media/upload")
+async def upload_media_body_api(
+    project_id: str, name: str, request: Request, sha256: Optional[str] = None, db: Session = Depends(get_sync_db)
+):
+    content_type = request.headers.get("content-type", "application/octet-stream")
+    content_length = request.headers.get("content-length")
+    try:
+        media = await create_media_by_body_stream(
+            db,
+            project_id,
+            request.stream(),
+            content_type=content_type,
+            name=name,
+            sha256=parse_sha256(sha256),
+            size=int(content_length) if content_length and content_length.isdigit() else None,
+        )
+    except ServiceError as e:
+        raise HTTPException(e.status_code, str(e))
+    if not media:
+        raise HTTPException(404, "Project not found")
+    return {"media_id": media.id}
+
+# 브라우저가 presigned URL 로 저장소에 직접 올린다. API 서버는 파일 내용을 받지 않는다.
+# (브라우저가 part 응답의 ETag 를 읽을 수 있도록 버킷 CORS 에 ExposeHeaders: ETag 가 필요하다.)
+@router.post("/projects/{project_id}/media/uploads", response_model=MediaUploadResponse)
+def create_media_upload_api(project_id: str, request: MediaUploadRequest, db: Session = Depends(get_sync_db)):
+    try:
+        session = create_upload_session(
+            db, project_id, name=request.name, content_type=request.content_type, size=request.size,
+            sha256=request.sha256,
+        )
+        if isinstance(session, Media):
+            return MediaUploadResponse(media_id=session.id)
+        urls = part_urls(session)
+    except ServiceError as e:
+        raise HTTPException(e.status_code, str(e))
+    return MediaUploadResponse(
+        upload_id=session.id,
+        part_size=session.part_size,
+        part_count=session.part_count,
+        parts=[UploadPartUrl(part_number=n, url=url) for n, url in urls.items()],
+    )
+
+@router.post("/projects/{project_id}/media/uploads/{upload_id}/part-urls", response_model=list[UploadPartUrl])
+async def refresh_media_upload_urls_api(project_id: str, upload_id: str, request: UploadPartUrlsRequest):
+    """URL 이 만료된 part 의 URL 을 다시 받는다."""
+    try:
+        urls = part_urls(get_upload_session(project_id, upload_id), request.part_numbers)
+    except ServiceError as e:
+        raise HTTPException(e.status_code, str(e))
+    return [UploadPartUrl(part_number=n, url=url) for n, url in urls.items()]
+
+@router.post("/projects/{project_id}/media/uploads/{upload_id}/complete")
+def complete_media_upload_api(
+    project_id: str, upload_id: str, request: CompleteMediaUploadRequest, db: Session = Depends(get_sync_db)
+):
+    try:
+        media = complete_upload_session(
+            db, project_id, upload_id, [(part.part_number, part.etag) for part in request.parts]
+        )
+    except ServiceError as e:
+        raise HTTPException(e.status_code, str(e))
+    return {"media_id": media.id}
+
+@router.delete("/projects/{project_id}/media/uploads/{upload_id}")
+async def abort_media_upload_api(project_id: str, upload_id: str):
+    try:
+        abort_upload_session(project_id, upload_id)
+    except ServiceError as e:
+        raise HTTPException(e.status_code, str(e))
+    return {"success": True}
+
 @router.get("/projects/{project_id}/media", response_model=list[MediaResponse])
-async def get_project_media_api(project_id: str, db: Session = Depends(get_db)):
-    media_list = get_all_media(db, project_id)
+async def get_project_media_api(project_id: str, db: AsyncSession = Depends(get_db)):
+    media_list = await db.run_sync(get_all_media, project_id)
     return [MediaResponse(**m.dict()) for m in media_list] if media_list else []
 
 @router.get("/projects/{project_id}/media/url-map", response_model=dict)
-async def get_project_media_url_map_api(project_id: str, db: Session = Depends(get_db)):
-    url_map = get_all_url_map(db, project_id)
+async def get_project_media_url_map_api(project_id: str, db: AsyncSession = Depends(get_db)):
+    url_map = await get_all_url_map(db, project_id)
     return url_map or {}
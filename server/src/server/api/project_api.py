@@ -1,41 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
+from typing import Optional
+from server.common.exception import ConflictError, InvalidInputError
 from server.database import get_db
-from server.service.project import create_project, get_all_projects, get_project, delete_project, update_project_title
-from server.api.schemas import ProjectResponse
+from server.service.project import create_project, get_project, get_project_page, delete_project, update_project_title
+from server.api.schemas import ProjectResponse, ProjectSummaryResponse
 
 router = APIRouter()
 
 @router.post("/projects", response_model=ProjectResponse)
-async def create_project_api(title: str, db: Session = Depends(get_db)):
+async def create_project_api(title: str, db: AsyncSession = Depends(get_db)):
     project = await create_project(db, title)
     if not project:
         raise HTTPException(400, "Failed to create project")
     return ProjectResponse(id=project.id, title=project.title)
 
-@router.get("/projects", response_model=list[ProjectResponse])
-async def get_projects_api(db: Session = Depends(get_db)):
-    projects = await get_all_projects(db)
-    return [ProjectResponse(id=p.id, title=p.title) for p in projects]
+# 최근에 고친 순서. 다음 페이지가 있으면 X-Next-Cursor 헤더의 값을 cursor 로 넘긴다.
+@router.get("/projects", response_model=list[ProjectSummaryResponse])
+async def get_projects_api(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        projects, next_cursor = await get_project_page(db, limit, cursor)
+    except InvalidInputError as e:
+        raise HTTPException(400, str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return [ProjectSummaryResponse(id=p.id, title=p.title, updated_at=p.updated_at) for p in projects]
 
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
-async def get_project_api(project_id: str, db: Session = Depends(get_db)):
+async def get_project_api(project_id: str, db: AsyncSession = Depends(get_db)):
     project = await get_project(db, project_id)
     if not project:
         raise HTTPException(404, "Project not found")
     return ProjectResponse(id=project.id, title=project.title)
 
 @router.delete("/projects/{project_id}")
-async def delete_project_api(project_id: str, db: Session = Depends(get_db)):
+async def delete_project_api(project_id: str, db: AsyncSession = Depends(get_db)):
     result = await delete_project(db, project_id)
     if not result:
         raise HTTPException(404, "Project not found")
     return {"success": True, "deleted_id": project_id}
 
 @router.patch("/projects/{project_id}/title", response_model=ProjectResponse)
-async def update_project_title_api(project_id: str, title: str, db: Session = Depends(get_db)):
-    project = await update_project_title(db, project_id, title)
+async def update_project_title_api(project_id: str, title: str, db: AsyncSession = Depends(get_db)):
+    try:
+        project = await update_project_title(db, project_id, title)
+    except ConflictError as e:
+        raise HTTPException(409, str(e))
     if not project:
         raise HTTPException(404, "Project not found")
     return ProjectResponse(id=project.id, title=project.title)
@@ -1,6 +1,7 @@
 from uuid import UUID
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from datetime import datetime
 from enum import Enum
 
 class SectionType(str, Enum):
@@ -21,6 +22,7 @@ class SectionResponse(BaseModel):
     id: str
     duration: float
     type: SectionType
+    version: Optional[int] = None
 
 class SpeechSectionResponse(SectionResponse):
     type: SectionType = SectionType.speech
@@ -37,6 +39,34 @@ class MediaResponse(BaseModel):
     size: int
     fileId: str = Field(..., alias="file_id")
 
+class MediaUploadRequest(BaseModel):
+    name: str
+    content_type: str
+    size: int
+    sha256: Optional[str] = None # 내용 해시 (hex). 같은 내용이 이미 있으면 올리지 않는다.
+
+class UploadPartUrl(BaseModel):
+    part_number: int
+    url: str
+
+class MediaUploadResponse(BaseModel):
+    # 같은 내용이 이미 있어 바로 등록했으면 media_id 만 있고 올릴 part 는 없다.
+    upload_id: Optional[str] = None
+    part_size: int = 0
+    part_count: int = 0
+    parts: List[UploadPartUrl] = []
+    media_id: Optional[str] = None
+
+class UploadPartUrlsRequest(BaseModel):
+    part_numbers: List[int]
+
+class UploadedPart(BaseModel):
+    part_number: int
+    etag: str
+
+class CompleteMediaUploadRequest(BaseModel):
+    parts: List[UploadedPart]
+
 class SceneResponse(BaseModel):
     sceneId: str = Field(..., alias="scene_id")
     projectId: str = Field(..., alias="project_id")
@@ -44,6 +74,11 @@ class SceneResponse(BaseModel):
     intervalCount: int = Field(..., alias="interval_count")
     media: Optional[MediaResponse] = None
 
+class ProjectSummaryResponse(BaseModel):
+    id: str
+    title: Optional[str] = None
+    updatedAt: datetime = Field(..., alias="updated_at")
+
 class ProjectResponse(BaseModel):
     id: str
     title: str
@@ -1,59 +1,76 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from server.common.exception import ConflictError
 from server.database import get_db
 from server.service.project_section import (
     create_section, create_section_next_to, create_section_prev_to, delete_section, update_duration, update_speech_section, swap_section
 )
+from server.service.project_types import SpeechSection
 from server.api.schemas import SectionResponse
 
 router = APIRouter()
 
 @router.post("/projects/{project_id}/sections")
-async def create_section_api(project_id: str, db: Session = Depends(get_db)):
-    section = await create_section(db, project_id)
+async def create_section_api(project_id: str, db: AsyncSession = Depends(get_db)):
+    try:
+        section = await create_section(db, project_id)
+    except ConflictError as e:
+        raise HTTPException(409, str(e))
     if not section:
         raise HTTPException(400, "Failed to create section")
     return SectionResponse(**section.dict())
 
 @router.post("/projects/{project_id}/sections/next-to/{next_section_id}")
-async def create_section_next_to_api(project_id: str, next_section_id: str, db: Session = Depends(get_db)):
-    section = await create_section_next_to(db, project_id, next_section_id)
+async def create_section_next_to_api(project_id: str, next_section_id: str, db: AsyncSession = Depends(get_db)):
+    try:
+        section = await create_section_next_to(db, project_id, next_section_id)
+    except ConflictError as e:
+        raise HTTPException(409, str(e))
     if not section:
         raise HTTPException(400, "Failed to create section next to")
     return SectionResponse(**section.dict())
 
 @router.post("/projects/{project_id}/sections/prev-to/{prev_section_id}")
-async def create_section_prev_to_api(project_id: str, prev_section_id: str, db: Session = Depends(get_db)):
-    section = await create_section_prev_to(db, project_id, prev_section_id)
+async def create_section_prev_to_api(project_id: str, prev_section_id: str, db: AsyncSession = Depends(get_db)):
+    try:
+        section = await create_section_prev_to(db, project_id, prev_section_id)
+    except ConflictError as e:
+        raise HTTPException(409, str(e))
     if not section:
         raise HTTPException(400, "Failed to create section prev to")
     return SectionResponse(**section.dict())
 
 @router.delete("/projects/{project_id}/sections/{section_id}")
-async def delete_section_api(project_id: str, section_id: str, db: Session = Depends(get_db)):
+async def delete_section_api(project_id: str, section_id: str, db: AsyncSession = Depends(get_db)):
     result = await delete_section(db, project_id, section_id)
     if not result:
         raise HTTPException(404, "Section not found")
     return {"success": True, "deleted_id": section_id}
 
 @router.patch("/projects/{project_id}/sections/{section_id}/duration")
-async def update_duration_api(project_id: str, section_id: str, new_duration: float, db: Session = Depends(get_db)):
+async def update_duration_api(project_id: str, section_id: str, new_duration: float, db: AsyncSession = Depends(get_db)):
     result = await update_duration(db, project_id, section_id, new_duration)
     if not result:
         raise HTTPException(400, "Failed to update duration")
     return {"success": True}
 
 @router.patch("/projects/{project_id}/sections/{section_id}/speech")
-async def update_speech_section_api(project_id: str, section_id: str, section: dict, db: Session = Depends(get_db)):
-    # section dict를 SpeechSection 모델로 변환 필요
-    result = await update_speech_section(db, project_id, section)
+async def update_speech_section_api(project_id: str, section_id: str, section: dict, db: AsyncSession = Depends(get_db)):
+    # version 을 같이 보내면 그 사이 다른 요청이 섹션을 바꿨을 때 409 를 받는다. 다시 읽어서 보내야 한다.
+    try:
+        result = await update_speech_section(db, project_id, SpeechSection.model_validate({**section, "id": section_id}))
+    except ConflictError as e:
+        raise HTTPException(409, str(e))
     if not result:
         raise HTTPException(400, "Failed to update speech section")
-    return {"success": True}
+    return {"success": True, "version": result.version}
 
 @router.post("/projects/{project_id}/sections/swap")
-async def swap_section_api(project_id: str, id_1: str, id_2: str, db: Session = Depends(get_db)):
-    project = await swap_section(db, project_id, id_1, id_2)
-    if not project:
+async def swap_section_api(project_id: str, id_1: str, id_2: str, db: AsyncSession = Depends(get_db)):
+    try:
+        result = await swap_section(db, project_id, id_1, id_2)
+    except ConflictError as e:
+        raise HTTPException(409, str(e))
+    if not result:
         raise HTTPException(400, "Failed to swap sections")
     return {"success": True}
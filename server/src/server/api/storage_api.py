@@ -0,0 +1,71 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
+from server.common.exception import ServiceError
+from server.storage.backends import get_backend
+from server.storage.backends.local import LocalStorageBackend
+from server.storage.disk_cache import get_disk_cache
+
+router = APIRouter()
+
+
+def _local_backend() -> LocalStorageBackend:
+    # S3 를 쓸 때는 URL 이 저장소를 직접 가리키므로 이 경로는 없는 것으로 한다.
+    backend = get_backend()
+    if not isinstance(backend, LocalStorageBackend):
+        raise HTTPException(404, "Not found")
+    return backend
+
+
+@router.get("/storage/stats")
+async def get_storage_stats_api():
+    # 이 프로세스의 디스크 캐시 통계. (캐시 디렉터리는 노드 단위로 공유하지만 hit/miss 는 프로세스마다 센다.)
+    cache = get_disk_cache()
+    return {"backend": get_backend().name, "cache": cache.stats() if cache is not None else None}
+
+
+# 로컬 저장소가 내준 서명 URL. FileResponse 가 Range 요청을 처리하고,
+# 서버가 지원하면 (http.response.pathsend) 파일을 커널에서 바로 보낸다.
+@router.get("/storage/{bucket}/{object_name:path}")
+def get_storage_object_api(
+    bucket: str,
+    object_name: str,
+    expires: int,
+    signature: str,
+    content_type: str = "application/octet-stream",
+    filename: str = "",
+):
+    backend = _local_backend()
+    if not backend.verify(
+        signature, "GET", bucket, object_name, expires, content_type=content_type, filename=filename
+    ):
+        raise HTTPException(403, "Invalid or expired signature")
+    try:
+        path = backend.local_path(bucket, object_name)
+    except ServiceError:
+        path = None
+    if path is None:
+        raise HTTPException(404, "Object not found")
+    return FileResponse(path, media_type=content_type, filename=filename or None)
+
+
+# 브라우저 multipart 업로드의 part 하나. S3 의 upload_part 처럼 ETag 헤더로 part 의 MD5 를 돌려준다.
+@router.put("/storage/{bucket}/{object_name:path}")
+async def put_storage_part_api(
+    bucket: str,
+    object_name: str,
+    request: Request,
+    expires: int,
+    signature: str,
+    upload_id: str = Query(alias="uploadId"),
+    part_number: int = Query(alias="partNumber"),
+):
+    backend = _local_backend()
+    if not backend.verify(
+        signature, "PUT", bucket, object_name, expires, uploadId=upload_id, partNumber=str(part_number)
+    ):
+        raise HTTPException(403, "Invalid or expired signature")
+    try:
+        etag = await backend.write_part(bucket, object_name, upload_id, part_number, request.stream())
+    except ServiceError as e:
+        raise HTTPException(e.status_code, str(e))
+    return Response(status_code=200, headers={"ETag": etag})
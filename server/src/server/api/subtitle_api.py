@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from server.database import get_db
+from server.service.project_caption import get_project_captions
+from server.subtitle import FORMATS
+
+router = APIRouter()
+
+@router.get("/projects/{project_id}/captions.{fmt}")
+async def get_project_captions_api(project_id: str, fmt: str, db: AsyncSession = Depends(get_db)):
+    if fmt not in FORMATS:
+        raise HTTPException(404, "Unsupported caption format")
+    captions = await get_project_captions(db, project_id, fmt)
+    if captions is None:
+        raise HTTPException(404, "Project not found")
+    _, media_type = FORMATS[fmt]
+    return StreamingResponse(
+        captions,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{project_id}.{fmt}"'},
+    )
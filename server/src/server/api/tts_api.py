@@ -1,3 +1,116 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from server.audio import mp3
+from server.common.exception import ConflictError
+from server.database import get_db, get_sync_db
+from server.service.project import get_project
+from server.service.project_hls import get_project_playlist, max_silence_segment_frames
+from server.service.project_audio import export_project_audio, get_project_audio_plan, iter_project_audio
+from server.service.project_types import SpeechSection
+from server.tts.cache import get_tts_cache
+from server.tts.rate_limit import get_rate_limiter
+from server.worker.actors import enqueue_section_audio
+from server.worker.jobs import get_job
+
+router = APIRouter()
+
+@router.post("/projects/{project_id}/sections/{section_id}/audio-generation", status_code=202)
+async def generate_section_audio_api(project_id: str, section_id: str, db: AsyncSession = Depends(get_db)):
+    project = await get_project(db, project_id)
+    if not project or not any(s.id == section_id and isinstance(s, SpeechSection) for s in project.sections):
+        raise HTTPException(404, "Speech section not found")
+    # Redis 클라이언트가 sync 라서 이벤트 루프를 막지 않게 스레드에서 부른다.
+    job = await run_in_threadpool(enqueue_section_audio, project_id, section_id)
+    return {"job_id": job.id, "status": job.status}
+
+@router.post("/projects/{project_id}/audio-generation", status_code=202)
+async def generate_project_audio_api(project_id: str, db: AsyncSession = Depends(get_db)):
+    project = await get_project(db, project_id)
+    if not project:
+        raise HTTPException(404, "Project not found")
+    section_ids = [section.id for section in project.sections if isinstance(section, SpeechSection)]
+    jobs = await run_in_threadpool(lambda: [enqueue_section_audio(project_id, section_id) for section_id in section_ids])
+    return [{"section_id": job.section_id, "job_id": job.id, "status": job.status} for job in jobs]
+
+@router.get("/projects/{project_id}/audio.mp3")
+async def get_project_audio_api(project_id: str, db: AsyncSession = Depends(get_db)):
+    try:
+        plan = await get_project_audio_plan(db, project_id)
+    except ConflictError as e:
+        raise HTTPException(409, str(e))
+    if not plan:
+        raise HTTPException(404, "Project not found")
+    return StreamingResponse(
+        iter_project_audio(plan),
+        media_type="audio/mpeg",
+        headers={"Content-Disposition": f'attachment; filename="{project_id}.mp3"'},
+    )
+
+@router.get("/projects/{project_id}/audio.m3u8")
+async def get_project_playlist_api(project_id: str, request: Request, db: AsyncSession = Depends(get_db)):
+    def silence_url(header: mp3.FrameHeader, frame_count: int) -> str:
+        return str(request.url_for(
+            "get_silence_segment_api",
+            sample_rate=header.sample_rate,
+            channels=header.channels,
+            frame_count=frame_count,
+        ))
+
+    try:
+        playlist = await get_project_playlist(db, project_id, silence_url)
+    except ConflictError as e:
+        raise HTTPException(409, str(e))
+    if playlist is None:
+        raise HTTPException(404, "Project not found")
+    return Response(
+        content=playlist,
+        media_type="application/vnd.apple.mpegurl",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+@router.get("/audio/silence/{sample_rate}/{channels}/{frame_count}.mp3")
+async def get_silence_segment_api(sample_rate: int, channels: int, frame_count: int):
+    try:
+        header = mp3.header_for(sample_rate, channels)
+    except ValueError:
+        raise HTTPException(400, "Unsupported sample rate")
+    if channels not in (1, 2) or not 0 < frame_count <= max_silence_segment_frames(header):
+        raise HTTPException(400, "Invalid silence segment")
+    # 같은 URL 이면 내용이 항상 같으므로 오래 캐시해도 된다.
+    return Response(
+        content=mp3.silence(frame_count * header.duration, header),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+@router.post("/projects/{project_id}/audio-export")
+async def export_project_audio_api(project_id: str, db: Session = Depends(get_sync_db)):
+    try:
+        file = await run_in_threadpool(export_project_audio, db, project_id)
+    except ConflictError as e:
+        raise HTTPException(409, str(e))
+    if not file:
+        raise HTTPException(404, "Project not found")
+    return {"file_id": file.id, "size": file.size}
+
+@router.get("/tts/jobs/{job_id}")
+async def get_tts_job_api(job_id: str):
+    job = await run_in_threadpool(get_job, job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job.model_dump()
+
+@router.get("/tts/stats")
+async def get_tts_stats_api():
+    return {
+        "cache": await run_in_threadpool(get_tts_cache().stats),
+        "rate_limit": await run_in_threadpool(get_rate_limiter().stats),
+    }
+
+
 # import io
 # from json import load
 # from uuid import uuid4
@@ -0,0 +1,434 @@
+"""MPEG audio(MP3) 프레임 단위 처리.
+
+디코딩 없이 프레임 헤더만 읽어서 길이를 재고, ID3/Xing 같은 파일 단위 헤더를
+떼어낸 뒤 프레임을 이어 붙이는 데 쓴다.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+# (version, layer) 별 비트레이트 표 (kbps). index 0 은 free, 15 는 bad.
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# version bits -> (version, 샘플레이트 표). 2.5 는 비트레이트 표를 2 와 같이 쓴다.
+_SAMPLE_RATES = {
+    0b11: (1, (44100, 48000, 32000)),
+    0b10: (2, (22050, 24000, 16000)),
+    0b00: (2.5, (11025, 12000, 8000)),
+}
+
+_LAYERS = {0b11: 1, 0b10: 2, 0b01: 3}
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    version: float  # 1, 2, 2.5
+    layer: int  # 1, 2, 3
+    has_crc: bool
+    bitrate: int  # kbps
+    sample_rate: int
+    padding: bool
+    channel_mode: int  # 3 = mono
+    raw: bytes  # 헤더 4바이트
+
+    @property
+    def channels(self) -> int:
+        return 1 if self.channel_mode == 3 else 2
+
+    @property
+    def samples_per_frame(self) -> int:
+        if self.layer == 1:
+            return 384
+        if self.layer == 3 and self.version != 1:
+            return 576
+        return 1152
+
+    @property
+    def frame_length(self) -> int:
+        if self.layer == 1:
+            return (12 * self.bitrate * 1000 // self.sample_rate + self.padding) * 4
+        return self.samples_per_frame // 8 * self.bitrate * 1000 // self.sample_rate + self.padding
+
+    @property
+    def duration(self) -> float:
+        return self.samples_per_frame / self.sample_rate
+
+    @property
+    def side_info_length(self) -> int:
+        if self.layer != 3:
+            return 0
+        if self.version == 1:
+            return 17 if self.channels == 1 else 32
+        return 9 if self.channels == 1 else 17
+
+
+def build_header(
+    *,
+    version: float = 2,
+    layer: int = 3,
+    bitrate: int = 32,
+    sample_rate: int = 24000,
+    channel_mode: int = 3,
+    padding: bool = False,
+) -> FrameHeader:
+    """주어진 설정의 프레임 헤더를 만든다. (CRC 없음)"""
+
+    version_bits = next(bits for bits, (v, _) in _SAMPLE_RATES.items() if v == version)
+    sample_rate_index = _SAMPLE_RATES[version_bits][1].index(sample_rate)
+    layer_bits = next(bits for bits, l in _LAYERS.items() if l == layer)
+    bitrate_index = _BITRATES[(1 if version == 1 else 2, layer)].index(bitrate)
+
+    raw = bytes((
+        0xFF,
+        0xE0 | (version_bits << 3) | (layer_bits << 1) | 1,
+        (bitrate_index << 4) | (sample_rate_index << 2) | (int(padding) << 1),
+        channel_mode << 6,
+    ))
+    return parse_header(raw)
+
+
+def header_for(sample_rate: int, channels: int, *, bitrate: int = 32) -> FrameHeader:
+    """주어진 샘플레이트/채널 수의 Layer III 프레임 헤더."""
+
+    version = next((v for v, rates in _SAMPLE_RATES.values() if sample_rate in rates), None)
+    if version is None:
+        raise ValueError(f"unsupported sample rate: {sample_rate}")
+    return build_header(
+        version=version,
+        bitrate=bitrate,
+        sample_rate=sample_rate,
+        channel_mode=3 if channels == 1 else 0,
+    )
+
+
+def frames_for(seconds: float, header: FrameHeader) -> int:
+    """seconds 에 가장 가까운 프레임 수."""
+
+    return max(0, round(seconds / header.duration))
+
+
+def silent_frame(header: FrameHeader) -> bytes:
+    """소리가 없는 프레임 하나. 사이드 정보와 메인 데이터가 모두 0 이면 무음으로 디코딩된다."""
+
+    return header.raw + bytes(header.frame_length - 4)
+
+
+def silence(seconds: float, header: FrameHeader) -> bytes:
+    """seconds 에 가장 가까운 길이의 무음 프레임들."""
+
+    return silent_frame(header) * frames_for(seconds, header)
+
+
+def iter_silence(frame_count: int, header: FrameHeader, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """무음 프레임 frame_count 개를 chunk_size 정도씩 나눠서 돌려준다."""
+
+    frame = silent_frame(header)
+    per_chunk = max(1, chunk_size // len(frame))
+    chunk = frame * per_chunk
+    full, rest = divmod(frame_count, per_chunk)
+    for _ in range(full):
+        yield chunk
+    if rest:
+        yield frame * rest
+
+
+def parse_header(data: bytes, offset: int = 0) -> FrameHeader | None:
+    """offset 위치의 4바이트를 프레임 헤더로 읽는다. 유효하지 않으면 None."""
+
+    if offset + 4 > len(data):
+        return None
+    b0, b1, b2, b3 = data[offset], data[offset + 1], data[offset + 2], data[offset + 3]
+    if b0 != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0b11
+    layer_bits = (b1 >> 1) & 0b11
+    bitrate_index = b2 >> 4
+    sample_rate_index = (b2 >> 2) & 0b11
+    if version_bits not in _SAMPLE_RATES or layer_bits not in _LAYERS:
+        return None
+    if bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    version, sample_rates = _SAMPLE_RATES[version_bits]
+    layer = _LAYERS[layer_bits]
+    bitrate = _BITRATES[(1 if version == 1 else 2, layer)][bitrate_index]
+
+    return FrameHeader(
+        version=version,
+        layer=layer,
+        has_crc=not (b1 & 1),
+        bitrate=bitrate,
+        sample_rate=sample_rates[sample_rate_index],
+        padding=bool((b2 >> 1) & 1),
+        channel_mode=b3 >> 6,
+        raw=bytes(data[offset:offset + 4]),
+    )
+
+
+def id3v2_length(data: bytes) -> int:
+    """앞에 붙은 ID3v2 태그 길이. 없으면 0."""
+
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for b in data[6:10]:
+        size = (size << 7) | (b & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _audio_end(data: bytes) -> int:
+    # 끝에 붙은 ID3v1 태그(128바이트)는 제외한다.
+    if len(data) >= 128 and data[-128:-125] == b"TAG":
+        return len(data) - 128
+    return len(data)
+
+
+def is_info_frame(data: bytes, offset: int, header: FrameHeader) -> bool:
+    """Xing/Info/VBRI 태그를 담은 (소리가 없는) 첫 프레임인지."""
+
+    tag_offset = offset + 4 + (2 if header.has_crc else 0) + header.side_info_length
+    if data[tag_offset:tag_offset + 4] in (b"Xing", b"Info"):
+        return True
+    return data[offset + 36:offset + 40] == b"VBRI"
+
+
+def _encoder_delay_padding(data: bytes, offset: int, header: FrameHeader) -> tuple[int, int]:
+    """Xing/Info 프레임 뒤의 LAME 태그에서 인코더 delay/padding(샘플 수)을 읽는다. 없으면 (0, 0)."""
+
+    tag_offset = offset + 4 + (2 if header.has_crc else 0) + header.side_info_length
+    if data[tag_offset:tag_offset + 4] not in (b"Xing", b"Info"):
+        return 0, 0
+
+    flags = int.from_bytes(data[tag_offset + 4:tag_offset + 8], "big")
+    lame_offset = tag_offset + 8
+    lame_offset += 4 if flags & 0x1 else 0  # frames
+    lame_offset += 4 if flags & 0x2 else 0  # bytes
+    lame_offset += 100 if flags & 0x4 else 0  # TOC
+    lame_offset += 4 if flags & 0x8 else 0  # quality
+
+    encoder = data[lame_offset:lame_offset + 4]
+    if len(encoder) < 4 or not encoder.isalnum():
+        return 0, 0
+    b0, b1, b2 = data[lame_offset + 21:lame_offset + 24]
+    return (b0 << 4) | (b1 >> 4), ((b1 & 0x0F) << 8) | b2
+
+
+def iter_frames(data: bytes) -> Iterator[tuple[int, FrameHeader]]:
+    """소리가 담긴 프레임의 (offset, header) 를 순서대로 돌려준다.
+
+    ID3 태그와 Xing/Info/VBRI 프레임은 건너뛰고, 프레임 사이에 쓰레기 바이트가 있으면
+    다음 동기 워드까지 다시 찾는다.
+    """
+
+    offset = id3v2_length(data)
+    end = _audio_end(data)
+    first = True
+
+    while offset + 4 <= end:
+        header = parse_header(data, offset)
+        if header is None or offset + header.frame_length > end:
+            offset += 1
+            continue
+
+        # 우연히 0xFFE 로 시작하는 바이트를 헤더로 오인하지 않도록 다음 프레임도 확인한다.
+        next_offset = offset + header.frame_length
+        if next_offset + 4 <= end and parse_header(data, next_offset) is None:
+            offset += 1
+            continue
+
+        if not (first and is_info_frame(data, offset, header)):
+            yield offset, header
+        first = False
+        offset = next_offset
+
+
+def strip_headers(data: bytes) -> bytes:
+    """파일 단위 헤더를 떼고 소리가 담긴 프레임만 남긴다."""
+
+    view = memoryview(data)
+    return b"".join(view[offset:offset + header.frame_length] for offset, header in iter_frames(data))
+
+
+@dataclass(frozen=True)
+class Mp3Info:
+    """디코딩 없이 알 수 있는 MP3 정보.
+
+    - duration: 프레임 수 * 프레임 길이 (인코더 delay/padding 포함)
+    - data_size: 소리가 담긴 프레임들의 바이트 수 (파일 단위 헤더 제외)
+    - encoder_delay / encoder_padding: LAME 태그에 적힌 앞뒤 여분 샘플 수
+    """
+
+    duration: float
+    frame_count: int
+    sample_rate: int
+    channels: int
+    data_size: int
+    encoder_delay: int
+    encoder_padding: int
+
+
+def analyze(data: bytes) -> Mp3Info:
+    frame_count = 0
+    duration = 0.0
+    data_size = 0
+    first: FrameHeader | None = None
+    for _, header in iter_frames(data):
+        first = first or header
+        frame_count += 1
+        duration += header.duration
+        data_size += header.frame_length
+
+    encoder_delay, encoder_padding = 0, 0
+    offset = id3v2_length(data)
+    header = parse_header(data, offset)
+    if header is not None and is_info_frame(data, offset, header):
+        encoder_delay, encoder_padding = _encoder_delay_padding(data, offset, header)
+
+    return Mp3Info(
+        duration=duration,
+        frame_count=frame_count,
+        sample_rate=first.sample_rate if first else 0,
+        channels=first.channels if first else 0,
+        data_size=data_size,
+        encoder_delay=encoder_delay,
+        encoder_padding=encoder_padding,
+    )
+
+
+def iter_stream_frames(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """조각으로 들어오는 MP3 에서 소리가 담긴 프레임만 골라 조각 단위로 돌려준다.
+
+    strip_headers 와 같은 일을 하지만 파일 전체를 메모리에 올리지 않는다.
+    버퍼에는 들어온 조각 하나와 아직 끝나지 않은 프레임 하나 정도만 남는다.
+    """
+
+    buf = bytearray()
+    pos = 0
+    skip = None  # 앞의 ID3v2 태그 중 아직 버리지 못한 바이트 수
+    first = True
+
+    def take(final: bool) -> bytes:
+        nonlocal pos, first
+        out = bytearray()
+        while pos + 4 <= len(buf):
+            header = parse_header(buf, pos)
+            if header is None:
+                next_sync = buf.find(b"\xff", pos + 1)
+                pos = len(buf) if next_sync < 0 else next_sync
+                continue
+
+            next_offset = pos + header.frame_length
+            if next_offset + (0 if final else 4) > len(buf):
+                if final:
+                    # 끝에서 잘린 프레임이나 ID3v1 태그
+                    pos = len(buf)
+                break
+            # 다음 프레임이나 끝의 ID3v1 태그가 이어져야 진짜 프레임으로 본다.
+            if (
+                next_offset + 4 <= len(buf)
+                and parse_header(buf, next_offset) is None
+                and buf[next_offset:next_offset + 3] != b"TAG"
+            ):
+                pos += 1
+                continue
+
+            if not (first and is_info_frame(buf, pos, header)):
+                out += buf[pos:next_offset]
+            first = False
+            pos = next_offset
+        return bytes(out)
+
+    for chunk in chunks:
+        buf += chunk
+        if skip is None:
+            if len(buf) < 10:
+                continue
+            skip = id3v2_length(buf)
+        if skip:
+            dropped = min(skip, len(buf))
+            del buf[:dropped]
+            skip -= dropped
+            if skip:
+                continue
+
+        out = take(final=False)
+        del buf[:pos]
+        pos = 0
+        if out:
+            yield out
+
+    if skip is None:
+        skip = id3v2_length(buf)
+        del buf[:skip]
+    out = take(final=True)
+    if out:
+        yield out
+
+
+def _crc16(data: bytes) -> int:
+    # LAME 태그 CRC (CRC-16, 다항식 0x8005 반사형)
+    crc = 0
+    for b in data:
+        crc ^= b
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def build_info_frame(
+    header: FrameHeader,
+    *,
+    frame_count: int,
+    data_size: int,
+    encoder_delay: int = 0,
+    encoder_padding: int = 0,
+) -> bytes:
+    """이어 붙인 스트림 앞에 둘 Xing 프레임.
+
+    전체 프레임 수와 바이트 수를 적어서 플레이어가 길이를 바로 알 수 있게 하고,
+    LAME 태그에 앞뒤 여분 샘플 수를 적는다. frame_count/data_size 에 이 프레임은 포함하지 않는다.
+    """
+
+    frame = bytearray(silent_frame(header))
+    offset = 4 + (2 if header.has_crc else 0) + header.side_info_length
+
+    xing = b"Xing" + (0x3).to_bytes(4, "big")  # frames, bytes
+    xing += (frame_count + 1).to_bytes(4, "big")
+    xing += (data_size + len(frame)).to_bytes(4, "big")
+
+    lame = bytearray(36)
+    lame[0:9] = b"LAME3.100"
+    lame[21] = (encoder_delay >> 4) & 0xFF
+    lame[22] = ((encoder_delay & 0x0F) << 4) | ((encoder_padding >> 8) & 0x0F)
+    lame[23] = encoder_padding & 0xFF
+    lame[28:32] = (data_size + len(frame)).to_bytes(4, "big")  # music length
+
+    tag = xing + lame
+    if offset + len(tag) > len(frame):
+        raise ValueError("frame is too small for a Xing header")
+    frame[offset:offset + len(tag)] = tag
+
+    crc_offset = offset + len(tag) - 2
+    frame[crc_offset:crc_offset + 2] = _crc16(frame[:crc_offset]).to_bytes(2, "big")
+    return bytes(frame)
+
+
+def duration_seconds(data: bytes) -> float:
+    return sum(header.duration for _, header in iter_frames(data))
+
+
+def concat(parts: Iterable[bytes]) -> bytes:
+    """같은 설정으로 인코딩된 MP3 들을 프레임 단위로 이어 붙인다."""
+
+    return b"".join(strip_headers(part) for part in parts)
@@ -20,6 +20,11 @@ class ConflictError(ServiceError):
     code = "conflict"
 
 
+class RateLimitedError(ServiceError):
+    status_code = 429
+    code = "rate_limited"
+
+
 class InvalidInputError(ServiceError):
     status_code = 400
     code = "invalid_input" 
\ No newline at end of file
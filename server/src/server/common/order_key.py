@@ -0,0 +1,68 @@
+"""목록 순서를 정하는 문자열 키 (fractional indexing).
+
+키는 DIGITS 로 된 문자열이고 바이트 순서(Postgres 에서는 COLLATE "C")로 비교한다.
+두 키 사이에는 항상 새 키를 만들 수 있으므로, 원소를 끼워 넣거나 옮길 때 그 원소 한 행만 쓰면 된다.
+키는 가장 작은 숫자('0')로 끝나지 않는다. 그래야 어떤 키 앞에도 키를 만들 수 있다.
+"""
+from typing import Iterator, Optional
+
+# ASCII 순서대로
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_MID = DIGITS[len(DIGITS) // 2]
+
+
+def _after(a: str) -> str:
+    # 맨 끝에 붙일 때 키가 거의 늘지 않도록, 올릴 수 있는 첫 자리만 올린다.
+    for i, ch in enumerate(a):
+        digit = DIGITS.index(ch)
+        if digit < len(DIGITS) - 1:
+            return a[:i] + DIGITS[digit + 1]
+    return a + _MID
+
+
+def _before(b: str) -> str:
+    for i, ch in enumerate(b):
+        digit = DIGITS.index(ch)
+        if digit > 1:
+            return b[:i] + DIGITS[digit - 1]
+        if digit == 1:
+            return b[:i] + DIGITS[0] + _MID
+    raise ValueError(f"invalid order key: {b!r}")
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    # a < b (b 가 None 이면 무한대). a 는 빈 문자열일 수 있다.
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else DIGITS[0]) == b[n]:
+            n += 1
+        if n:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def key_between(a: Optional[str], b: Optional[str]) -> str:
+    """a 와 b 사이의 키. a 가 None 이면 맨 앞, b 가 None 이면 맨 뒤."""
+    if a is None and b is None:
+        return _MID
+    if b is None:
+        return _after(a)
+    if a is None:
+        return _before(b)
+    if a >= b:
+        raise ValueError(f"order keys out of order: {a!r} >= {b!r}")
+    return _midpoint(a, b)
+
+
+def iter_keys(after: Optional[str] = None) -> Iterator[str]:
+    """after 뒤로 이어지는 키들. 목록을 통째로 쓸 때 쓴다."""
+    key = after
+    while True:
+        key = key_between(key, None)
+        yield key
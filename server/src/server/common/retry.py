@@ -0,0 +1,46 @@
+"""낙관적 동시성 충돌(ConflictError) 재시도.
+
+순서 키가 겹치거나 맞바꾸는 사이 위치가 바뀌는 것처럼, 다시 읽고 다시 쓰면 풀리는 충돌에만 쓴다.
+클라이언트가 보고 있던 버전을 조건으로 건 쓰기는 다시 해도 같은 결과라서 재시도하지 않고 409 로 돌려준다.
+"""
+import asyncio
+import inspect
+import random
+from typing import Awaitable, Callable, TypeVar, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from .exception import ConflictError
+
+T = TypeVar("T")
+
+DEFAULT_ATTEMPTS = 3
+# 첫 재시도 전 대기 (초). 재시도마다 두 배로 늘리고, 같이 충돌한 요청끼리 다시 부딪히지 않게 흔든다.
+BASE_DELAY = 0.02
+
+
+async def retry_on_conflict(
+    db: Union[Session, AsyncSession],
+    fn: Callable[[], Union[T, Awaitable[T]]],
+    attempts: int = DEFAULT_ATTEMPTS,
+) -> T:
+    """fn 을 실행하고, ConflictError 가 나면 세션을 rollback 한 뒤 최대 attempts 번까지 다시 실행한다.
+
+    fn 은 매번 DB 에서 다시 읽어야 한다. 마지막 시도에서도 충돌하면 ConflictError 를 그대로 올린다.
+    API 의 AsyncSession 과 워커의 sync Session 을 둘 다 받는다.
+    """
+    for attempt in range(attempts):
+        try:
+            result = fn()
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        except ConflictError:
+            rollback = db.rollback()
+            if inspect.isawaitable(rollback):
+                await rollback
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(BASE_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5))
+    raise AssertionError("unreachable")
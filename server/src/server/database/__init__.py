@@ -1 +1 @@
-from .session import get_db
\ No newline at end of file
+from .session import get_db, get_sync_db
@@ -1,3 +1,7 @@
 from .base import Base
 from .models import ProjectModel
-from .models import FileModel
\ No newline at end of file
+from .models import FileModel
+from .models import FileContentModel
+from .models import SectionModel
+from .models import IntervalModel
+from .models import SceneModel
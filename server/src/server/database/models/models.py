@@ -1,6 +1,6 @@
 from datetime import date
 
-from sqlalchemy import Date, ForeignKey, Integer, String, Column
+from sqlalchemy import BigInteger, Date, DateTime, Float, ForeignKey, Index, Integer, String, Column, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import JSONB
 from .base import Base
 
@@ -9,11 +9,86 @@ class ProjectModel(Base):
     __tablename__ = "projects"
 
     id = Column(String, primary_key=True)
-    body = Column(JSONB, nullable=True)
+    body = Column(JSONB, nullable=True) # 제목, media 등. 섹션과 씬은 각자 테이블에 있다.
+    version = Column(Integer, nullable=False, default=1, server_default="1") # 본문을 바꿀 때마다 1씩 는다.
+    # 마지막으로 고친 시각. 본문을 UPDATE 하면 바뀌고, 섹션/씬을 고치면 저장소가 커밋한 뒤 따로 바꾼다.
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    # ORM 으로 읽고 고친 행은 UPDATE ... WHERE version = (읽은 값) 으로 쓴다. 그 사이 누가 바꿨으면 StaleDataError.
+    __mapper_args__ = {"version_id_col": version}
+
+    __table_args__ = (
+        # 목록을 최근에 고친 순서로 keyset pagination 한다.
+        Index("ix_projects_updated_at_id", "updated_at", "id"),
+    )
+
+
+# 순서 키(common/order_key.py)는 바이트 순서로 비교해야 하므로 "C" collation 을 쓴다.
+# 같은 키가 생기면(동시에 같은 자리에 끼워 넣은 경우) 커밋할 때 unique 제약으로 걸러낸다.
+# 두 행의 키를 맞바꿀 수 있도록 제약 검사는 커밋 때 한다.
+OrderKey = String(collation="C")
+
+
+class SectionModel(Base):
+    """프로젝트의 섹션 하나. 구간(intervals)은 IntervalModel 에 있다."""
+    __tablename__ = "sections"
+    __table_args__ = (
+        UniqueConstraint("project_id", "position", name="uq_sections_project_position", deferrable=True, initially="DEFERRED"),
+    )
+
+    id = Column(String, primary_key=True)
+    project_id = Column(String, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    position = Column(OrderKey, nullable=False) # 프로젝트 안에서의 순서 키
+    type = Column(String, nullable=False)
+    duration = Column(Float, nullable=False, default=0.0)
+    file_id = Column(String, nullable=True, index=True) # 섹션 MP3
+    data = Column(JSONB, nullable=False, default=dict) # 나머지 필드 (is_generated, voice_name, audio, delay)
+    version = Column(Integer, nullable=False, default=1, server_default="1") # 내용을 바꿀 때마다 1씩 는다.
+
+
+class IntervalModel(Base):
+    __tablename__ = "intervals"
+    __table_args__ = (
+        UniqueConstraint("section_id", "position", name="uq_intervals_section_position", deferrable=True, initially="DEFERRED"),
+    )
+
+    section_id = Column(String, ForeignKey("sections.id", ondelete="CASCADE"), primary_key=True)
+    id = Column(String, primary_key=True)
+    position = Column(OrderKey, nullable=False) # 섹션 안에서의 순서 키
+    words = Column(JSONB, nullable=False)
+    audio = Column(JSONB, nullable=True)
+
+
+class SceneModel(Base):
+    __tablename__ = "scenes"
+    __table_args__ = (
+        UniqueConstraint("project_id", "position", name="uq_scenes_project_position", deferrable=True, initially="DEFERRED"),
+    )
+
+    id = Column(String, primary_key=True) # Scene.scene_id
+    project_id = Column(String, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    position = Column(OrderKey, nullable=False)
+    media_id = Column(String, nullable=True)
+    interval_count = Column(Integer, nullable=False, default=0)
+    media = Column(JSONB, nullable=True)
+
+
+class FileContentModel(Base):
+    """내용(SHA-256)이 같은 업로드는 오브젝트 하나를 같이 쓴다. 이 오브젝트를 가리키는 files 행 수를 센다."""
+    __tablename__ = "file_contents"
+
+    content_hash = Column(String(64), primary_key=True) # SHA-256 hex
+    bucket = Column(String, nullable=False)
+    object_name = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0) # 이 내용을 가리키는 files 행 수
 
 
 class FileModel(Base):
     __tablename__ = "files"
+    __table_args__ = (
+        Index("ix_files_delete_date_id", "delete_date", "id"), # 만료 파일 정리 (keyset pagination)
+    )
 
     id = Column(String, primary_key=True)
     project_id = Column(String, ForeignKey("projects.id"), nullable=False) # 연관된 프로젝트 ID
@@ -24,6 +99,7 @@ class FileModel(Base):
     object_name = Column(String, nullable=False) # 저장소 내 파일 위치
 
     name = Column(String, nullable=False) # 실제 파일 이를
-    size = Column(Integer, nullable=False) # 파일 크기 (바이트 단위)
+    size = Column(BigInteger, nullable=False) # 파일 크기 (바이트 단위)
     content_type = Column(String, nullable=True) # MIME 타입
+    content_hash = Column(String(64), ForeignKey("file_contents.content_hash"), nullable=True, index=True) # 중복 제거된 내용
     
\ No newline at end of file
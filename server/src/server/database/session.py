@@ -1,21 +1,57 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from server.database.settings import DatabaseSettings
 
 settings = DatabaseSettings()
 
-DATABASE_URL = (
-    f"postgresql+psycopg2://{settings.database_user}:{settings.database_password}"
+_CREDENTIALS = (
+    f"{settings.database_user}:{settings.database_password}"
     f"@{settings.database_host}:{settings.database_port}/{settings.database_name}"
 )
+DATABASE_URL = f"postgresql+psycopg2://{_CREDENTIALS}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{_CREDENTIALS}"
 
-engine = create_engine(DATABASE_URL, future=True)
+# 두 엔진이 커넥션 수를 각자 잡는다. 프로세스가 여는 커넥션은 최대 두 풀의 합이다.
+_POOL_OPTIONS = dict(
+    pool_timeout=settings.database_pool_timeout,
+    pool_recycle=settings.database_pool_recycle,
+    pool_pre_ping=settings.database_pool_pre_ping,
+)
+
+# 워커, 마이그레이션, 저장소 입출력과 섞인 작업(스레드풀에서 도는 sync 라우트)용
+engine = create_engine(
+    DATABASE_URL,
+    future=True,
+    pool_size=settings.database_sync_pool_size,
+    max_overflow=settings.database_sync_max_overflow,
+    **_POOL_OPTIONS,
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False)
 
-def get_db():
-    db = SessionLocal()
+# API 라우트용. 쿼리를 기다리는 동안 이벤트 루프가 다른 요청을 처리한다.
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    connect_args={
+        "statement_cache_size": settings.database_statement_cache_size,
+        "prepared_statement_cache_size": settings.database_statement_cache_size,
+    },
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
+    **_POOL_OPTIONS,
+)
+# 커밋한 뒤 속성을 읽을 때 다시 조회(암묵적 IO)하지 않도록 expire 하지 않는다.
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_sync_db():
+    """DB 와 저장소 입출력을 같이 하는 sync 라우트용. FastAPI 가 스레드풀에서 돌린다."""
+    db: Session = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
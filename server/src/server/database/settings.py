@@ -4,8 +4,29 @@ from pydantic import Field
 from ..config import EnvBaseSettings
 
 class DatabaseSettings(EnvBaseSettings):
+    """DB 접속과 커넥션 풀 설정. 프로세스마다 API(asyncpg)와 워커(psycopg2) 엔진이 풀을 하나씩 가진다.
+
+    - database_pool_size: asyncpg 엔진이 붙잡아 두는 커넥션 수
+    - database_max_overflow: asyncpg 풀이 다 찼을 때 잠깐 더 여는 커넥션 수
+    - database_sync_pool_size: psycopg2 엔진이 붙잡아 두는 커넥션 수.
+      API 에서는 몇 안 되는 sync 라우트만, 워커에서는 스레드 수만큼 쓰므로 작게 둔다.
+    - database_sync_max_overflow: psycopg2 풀이 다 찼을 때 잠깐 더 여는 커넥션 수
+    - database_pool_timeout: (두 풀 공통) 풀에서 커넥션을 기다리는 최대 시간 (초)
+    - database_pool_recycle: 이보다 오래된 커넥션은 버리고 새로 연다 (초). -1 이면 재사용한다.
+    - database_pool_pre_ping: 커넥션을 꺼낼 때 살아 있는지 확인한다. DB 재시작 뒤 첫 요청이 실패하지 않는다.
+    - database_statement_cache_size: asyncpg 가 커넥션마다 캐시하는 prepared statement 수.
+      pgbouncer 의 transaction 모드 뒤에서는 0 으로 꺼야 한다.
+    """
     database_host: str = Field(alias="DATABASE_HOST")
     database_port: int = Field(alias="DATABASE_PORT")
     database_name: str = Field(alias="DATABASE_NAME")
     database_user: str = Field(alias="DATABASE_USER")
-    database_password: str = Field(alias="DATABASE_PASSWORD")
\ No newline at end of file
+    database_password: str = Field(alias="DATABASE_PASSWORD")
+    database_pool_size: int = 20
+    database_max_overflow: int = 10
+    database_sync_pool_size: int = 5
+    database_sync_max_overflow: int = 5
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = 1800
+    database_pool_pre_ping: bool = True
+    database_statement_cache_size: int = 100
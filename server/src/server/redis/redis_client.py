@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from typing import Optional
 
 import redis
@@ -16,7 +17,9 @@ from .redis_settings import RedisSettings
 # - host: 127.0.0.1
 # - port: 6379
 
-def _get_client() -> redis.Redis:
+@lru_cache
+def get_client() -> redis.Redis:
+    """프로세스 전체에서 공유하는 Redis 클라이언트 (내부 커넥션 풀 재사용)."""
     settings = RedisSettings()
     return redis.Redis(
         host=settings.redis_host,
@@ -33,7 +36,7 @@ def _section_key(section_id: str) -> str:
 def save_section(section: Section) -> None:
     """Section 을 Redis 에 JSON 형태로 저장한다."""
 
-    client = _get_client()
+    client = get_client()
 
     # Pydantic BaseModel -> dict -> JSON
     raw = section.model_dump()
@@ -43,7 +46,7 @@ def save_section(section: Section) -> None:
 def load_section(section_id: str) -> Optional[Section]:
     """Redis 에서 Section 하나를 읽어온다. 없으면 None."""
 
-    client = _get_client()
+    client = get_client()
     data = client.get(_section_key(section_id))
     if data is None:
         return None
@@ -72,7 +75,7 @@ def load_section(section_id: str) -> Optional[Section]:
 def save_video_script(script: VideoScript) -> None:
     """VideoScript 를 Redis 에 JSON 형태로 저장한다."""
 
-    client = _get_client()
+    client = get_client()
 
     script_id = script.id
     if not script_id:
@@ -87,7 +90,7 @@ def save_video_script(script: VideoScript) -> None:
 def load_video_script(script_id: str) -> Optional[VideoScript]:
     """Redis 에서 VideoScript 하나를 읽어온다. 없으면 None."""
 
-    client = _get_client()
+    client = get_client()
     data = client.get(f"videoscript:{script_id}")
     if data is None:
         return None
@@ -96,14 +99,14 @@ def load_video_script(script_id: str) -> Optional[VideoScript]:
     return VideoScript(**raw)
 
 def register_media_to_project(projectId, media: UploadedFile):
-    client = _get_client()
+    client = get_client()
     media_dict = media.model_dump()
     # media_id별로 저장
     client.set(f"project:{projectId}:media:{media.id}", json.dumps(media_dict, ensure_ascii=False))
     return True
 
 def get_media(projectId: str, media_id: str) -> UploadedFile | None:
-    client = _get_client()
+    client = get_client()
     # media_id에 쌍따옴표가 포함되어 있으면 제거
     clean_media_id = media_id.strip('"')
     media_json = client.get(f"project:{projectId}:media:{clean_media_id}")
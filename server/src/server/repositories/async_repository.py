@@ -0,0 +1,26 @@
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+R = TypeVar("R")
+
+
+class AsyncRepository(Generic[R]):
+    """sync 저장소를 AsyncSession 위에서 쓴다.
+
+        await AsyncRepository(db, SectionRepository).add(project_id, section)
+
+    메서드는 AsyncSession.run_sync 로 실행된다. 쿼리는 asyncpg 로 나가고, 결과를 기다리는 동안
+    이벤트 루프는 다른 요청을 처리한다. SQL 은 sync 저장소에만 있어서 워커(sync Session)와 같이 쓴다.
+    돌려받은 ORM 객체의 lazy 속성은 밖에서 읽으면 안 된다. 필요한 값은 저장소 안에서 채워서 돌려준다.
+    """
+
+    def __init__(self, db: AsyncSession, repository: Callable[[Session], R]):
+        self.db = db
+        self.repository = repository
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        async def call(*args, **kwargs):
+            return await self.db.run_sync(lambda session: getattr(self.repository(session), name)(*args, **kwargs))
+
+        return call
@@ -1,4 +1,21 @@
-from server.database.models import ProjectModel, FileModel
+from server.common.exception import ConflictError
+from server.common.order_key import iter_keys, key_between
+from server.database.models import (
+    FileContentModel,
+    FileModel,
+    IntervalModel,
+    ProjectModel,
+    SceneModel,
+    SectionModel,
+)
+from sqlalchemy import and_, case, delete, func, literal, literal_column, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
+from server.service.project_types import BlankSection, Media, Project, Scene, Section, SectionType, SpeechSection
+from pydantic import BaseModel, TypeAdapter
+from datetime import datetime, timedelta
+from typing import Optional, Union
 from sqlalchemy.orm import Session
 
 
@@ -12,6 +29,21 @@ class ProjectRepository:
     def get_all(self):
         return self.db.query(ProjectModel).all()
 
+    def get_summary_page(self, limit: int, after: tuple[datetime, str] | None = None):
+        """최근에 고친 순서로 (id, title, updated_at) 를 limit 개 가져온다. 제목만 본문에서 꺼내고 나머지는 읽지 않는다.
+
+        after 에 직전 페이지의 마지막 (updated_at, id) 를 주면 그 다음부터 읽는다. (keyset pagination)
+        """
+        query = select(ProjectModel.id, ProjectModel.body["title"].astext.label("title"), ProjectModel.updated_at)
+        if after is not None:
+            query = query.where(tuple_(ProjectModel.updated_at, ProjectModel.id) < tuple_(*after))
+        return self.db.execute(
+            query.order_by(ProjectModel.updated_at.desc(), ProjectModel.id.desc()).limit(limit)
+        ).all()
+
+    def exists(self, project_id: str) -> bool:
+        return self.db.query(select(ProjectModel.id).where(ProjectModel.id == project_id).exists()).scalar()
+
     def create(self, id: str, body=None):
         project = ProjectModel(id=id, body=body)
         self.db.add(project)
@@ -19,25 +51,486 @@ class ProjectRepository:
         self.db.refresh(project)
         return project
 
-    def update(self, project_id: str, **kwargs):
+    def update(self, project_id: str, expected_version: int | None = None, **kwargs):
+        """읽은 뒤 고쳐 쓴다. 쓰는 UPDATE 는 읽은 version 을 조건으로 걸므로, 그 사이 바뀌었으면 ConflictError.
+
+        expected_version 을 주면 (클라이언트가 보고 있던 버전) 그 버전일 때만 쓴다.
+        """
         project = self.get(project_id)
         if not project:
             return None
+        if expected_version is not None and project.version != expected_version:
+            self.db.rollback()
+            raise ConflictError("project was modified")
         for key, value in kwargs.items():
             setattr(project, key, value)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except StaleDataError:
+            self.db.rollback()
+            raise ConflictError("project was modified")
         self.db.refresh(project)
         return project
 
+    def append_media(self, project_id: str, media: dict) -> bool:
+        """본문 media 끝에 하나를 붙이고 version 을 올린다. 프로젝트가 없으면 False.
+
+        읽고 고쳐 쓰지 않고 UPDATE 한 번으로 붙여서, 같은 프로젝트에 동시에 올린 파일끼리 충돌하지 않는다.
+        """
+        result = self.db.execute(
+            update(ProjectModel)
+            .where(ProjectModel.id == project_id)
+            .values(
+                body=ProjectModel.body.op("||")(func.jsonb_build_object(
+                    "media", func.coalesce(ProjectModel.body["media"], literal([], JSONB)).op("||")(literal([media], JSONB)),
+                )),
+                version=ProjectModel.version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount > 0
+
     def delete(self, project_id: str):
-        project = self.get(project_id)
-        if not project:
+        # 버전을 보지 않는다. 지우는 쪽이 이긴다.
+        result = self.db.execute(delete(ProjectModel).where(ProjectModel.id == project_id))
+        self.db.commit()
+        return result.rowcount > 0
+
+
+_SECTION = TypeAdapter(Union[SpeechSection, BlankSection, Section])
+
+
+def _section_row(section: Section) -> dict:
+    """섹션을 sections 행으로 나눈다. 구간은 따로 쓴다."""
+    return {
+        "id": section.id,
+        "type": section.type.value,
+        "duration": section.duration,
+        "file_id": getattr(section, "file_id", None),
+        "data": section.model_dump(mode="json", exclude={"id", "type", "duration", "file_id", "intervals", "version"}),
+    }
+
+
+def _section_dict(row: SectionModel, intervals: list[IntervalModel]) -> dict:
+    section = {"id": row.id, "type": row.type, "duration": row.duration, "version": row.version, **row.data}
+    if row.type == SectionType.speech.value:
+        section["file_id"] = row.file_id
+        section["intervals"] = [
+            {"id": interval.id, "words": interval.words, "audio": interval.audio} for interval in intervals
+        ]
+    return section
+
+
+def _scene_row(scene: Scene) -> dict:
+    return {
+        "id": scene.scene_id,
+        "media_id": scene.media_id,
+        "interval_count": scene.interval_count,
+        "media": scene.media.model_dump(mode="json") if scene.media else None,
+    }
+
+
+def _scene_dict(row: SceneModel) -> dict:
+    return {
+        "scene_id": row.id,
+        "project_id": row.project_id,
+        "media_id": row.media_id,
+        "interval_count": row.interval_count,
+        "media": row.media,
+    }
+
+
+# deadlock_detected, serialization_failure. 한쪽을 취소시킨 것이라 다시 하면 풀린다.
+_TRANSIENT_SQLSTATES = {"40P01", "40001"}
+
+# 이 시간 안에 이미 바뀐 updated_at 은 다시 쓰지 않는다. 잇따른 편집의 갱신을 한 번으로 합친다.
+_TOUCH_INTERVAL = timedelta(seconds=1)
+
+
+class _OrderedRepository:
+    """프로젝트 안에서 순서 키(position)로 정렬되는 행들.
+
+    끼워 넣기는 앞뒤 키를 인덱스로 찾아 그 사이 키로 한 행을 쓰고, 맞바꾸기는 두 행의 키만 바꾼다.
+    다른 행은 건드리지 않으므로 서로 다른 원소를 고치는 요청끼리 기다리지 않는다.
+    """
+
+    model = None
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _commit(self) -> None:
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # 같은 자리에 동시에 끼워 넣어 순서 키가 겹쳤다.
+            self.db.rollback()
+            raise ConflictError("concurrent edit on the same position")
+        except DBAPIError as e:
+            # 겹친 키를 커밋하면서(deferred unique 검사) 서로를 기다리면 Postgres 가 한쪽을 교착으로 끊는다.
+            if getattr(e.orig, "pgcode", None) not in _TRANSIENT_SQLSTATES:
+                raise
+            self.db.rollback()
+            raise ConflictError("concurrent edit on the same position")
+
+    def _touch(self, project_id: str) -> None:
+        """편집을 커밋한 뒤 프로젝트의 updated_at 을 따로 짧은 트랜잭션으로 바꾼다.
+
+        편집 트랜잭션은 프로젝트 행을 잠그지 않으므로, 같은 프로젝트의 다른 섹션/씬을 고치는 요청끼리 기다리지 않는다.
+        _TOUCH_INTERVAL 안에 이미 바뀌었으면 행을 쓰지도 잠그지도 않으므로, 목록 순서는 그만큼 늦게 반영될 수 있다.
+        """
+        self.db.execute(
+            update(ProjectModel)
+            .where(ProjectModel.id == project_id, ProjectModel.updated_at < func.now() - _TOUCH_INTERVAL)
+            .values(updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def _position(self, project_id: str, row_id: str) -> str | None:
+        model = self.model
+        return self.db.execute(
+            select(model.position).where(model.project_id == project_id, model.id == row_id)
+        ).scalar_one_or_none()
+
+    def _new_position(self, project_id: str, before: str | None = None, after: str | None = None) -> str | None:
+        """before 앞, after 뒤, 둘 다 없으면 맨 끝에 들어갈 키. 기준 행이 없으면 None."""
+        model = self.model
+        in_project = model.project_id == project_id
+        if after is not None:
+            a = self._position(project_id, after)
+            if a is None:
+                return None
+            b = self.db.execute(select(func.min(model.position)).where(in_project, model.position > a)).scalar()
+            return key_between(a, b)
+        if before is not None:
+            b = self._position(project_id, before)
+            if b is None:
+                return None
+            a = self.db.execute(select(func.max(model.position)).where(in_project, model.position < b)).scalar()
+            return key_between(a, b)
+        return key_between(self.db.execute(select(func.max(model.position)).where(in_project)).scalar(), None)
+
+    def delete(self, project_id: str, row_id: str) -> bool:
+        model = self.model
+        result = self.db.execute(delete(model).where(model.project_id == project_id, model.id == row_id))
+        self.db.commit()
+        if result.rowcount:
+            self._touch(project_id)
+        return result.rowcount > 0
+
+    def swap(self, project_id: str, id_1: str, id_2: str) -> bool:
+        model = self.model
+        rows = dict(self.db.execute(
+            select(model.id, model.position).where(model.project_id == project_id, model.id.in_([id_1, id_2]))
+        ).all())
+        if len(rows) != 2:
             return False
-        self.db.delete(project)
+        # 읽은 위치 그대로일 때만 바꾼다. 그 사이 한쪽이 옮겨졌으면 ConflictError.
+        result = self.db.execute(
+            update(model)
+            .where(
+                model.project_id == project_id,
+                or_(*(and_(model.id == row_id, model.position == position) for row_id, position in rows.items())),
+            )
+            .values(position=case((model.id == id_1, rows[id_2]), else_=rows[id_1]))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 2:
+            self.db.rollback()
+            raise ConflictError("position was modified")
+        self._commit()
+        self._touch(project_id)
+        return True
+
+
+class SectionRepository(_OrderedRepository):
+    model = SectionModel
+
+    def get_many(self, project_ids: list[str]) -> dict[str, list[dict]]:
+        """프로젝트마다 순서대로 정렬한 섹션들 (구간 포함, Section 으로 검증하기 전의 dict)."""
+        sections: dict[str, list[dict]] = {project_id: [] for project_id in project_ids}
+        if not project_ids:
+            return sections
+        rows = self.db.execute(
+            select(SectionModel)
+            .where(SectionModel.project_id.in_(project_ids))
+            .order_by(SectionModel.project_id, SectionModel.position)
+        ).scalars().all()
+        intervals: dict[str, list[IntervalModel]] = {row.id: [] for row in rows}
+        if rows:
+            for interval in self.db.execute(
+                select(IntervalModel)
+                .join(SectionModel, SectionModel.id == IntervalModel.section_id)
+                .where(SectionModel.project_id.in_(project_ids))
+                .order_by(IntervalModel.section_id, IntervalModel.position)
+            ).scalars():
+                intervals[interval.section_id].append(interval)
+        for row in rows:
+            sections[row.project_id].append(_section_dict(row, intervals[row.id]))
+        return sections
+
+    def get(self, project_id: str, section_id: str) -> Section | None:
+        """섹션 하나만 읽는다. 프로젝트 전체를 읽지 않는다."""
+        row = self.db.execute(
+            select(SectionModel).where(SectionModel.project_id == project_id, SectionModel.id == section_id)
+        ).scalar_one_or_none()
+        if row is None:
+            return None
+        intervals = self.db.execute(
+            select(IntervalModel).where(IntervalModel.section_id == row.id).order_by(IntervalModel.position)
+        ).scalars().all()
+        return _SECTION.validate_python(_section_dict(row, list(intervals)))
+
+    def _write_intervals(self, section: Section) -> None:
+        self.db.execute(delete(IntervalModel).where(IntervalModel.section_id == section.id))
+        intervals = getattr(section, "intervals", None) or []
+        if intervals:
+            self.db.execute(insert(IntervalModel), [
+                {
+                    "section_id": section.id,
+                    "id": interval.id,
+                    "position": position,
+                    "words": [word.model_dump(mode="json") for word in interval.words],
+                    "audio": interval.audio.model_dump(mode="json") if interval.audio else None,
+                }
+                for interval, position in zip(intervals, iter_keys())
+            ])
+
+    def add(self, project_id: str, section: Section, before: str | None = None, after: str | None = None) -> bool:
+        """섹션을 before 앞이나 after 뒤(없으면 맨 끝)에 넣는다. 기준 섹션이 없으면 False."""
+        position = self._new_position(project_id, before=before, after=after)
+        if position is None:
+            return False
+        try:
+            self.db.execute(insert(SectionModel).values(project_id=project_id, position=position, **_section_row(section)))
+        except IntegrityError:
+            # 프로젝트가 없다.
+            self.db.rollback()
+            return False
+        self._write_intervals(section)
+        self._commit()
+        self._touch(project_id)
+        return True
+
+    def add_all(self, project_id: str, sections: list[Section]) -> None:
+        """커밋하지 않는다. 프로젝트를 만들 때 같은 트랜잭션에서 쓴다."""
+        for section, position in zip(sections, iter_keys()):
+            self.db.execute(insert(SectionModel).values(project_id=project_id, position=position, **_section_row(section)))
+            self._write_intervals(section)
+
+    def update(self, project_id: str, section_id: str, **values) -> bool:
+        """섹션 행의 컬럼(duration 등)만 바꾸고 버전을 올린다."""
+        result = self.db.execute(
+            update(SectionModel)
+            .where(SectionModel.project_id == project_id, SectionModel.id == section_id)
+            .values(**values, version=SectionModel.version + 1)
+            .execution_options(synchronize_session=False)
+        )
         self.db.commit()
+        if result.rowcount:
+            self._touch(project_id)
+        return result.rowcount > 0
+
+    def replace(self, project_id: str, section: Section) -> bool:
+        """섹션 내용과 구간을 통째로 바꾼다. 순서는 그대로다.
+
+        section.version 이 있으면 그 버전일 때만 바꾸고 (compare-and-swap), 쓴 뒤 새 버전을 넣어 준다.
+
+        Raises:
+            ConflictError: 읽은 뒤 다른 요청이 섹션을 바꿨을 때
+        """
+        row = _section_row(section)
+        del row["id"]
+        conditions = [SectionModel.project_id == project_id, SectionModel.id == section.id]
+        if section.version is not None:
+            conditions.append(SectionModel.version == section.version)
+        version = self.db.execute(
+            update(SectionModel)
+            .where(*conditions)
+            .values(**row, version=SectionModel.version + 1)
+            .returning(SectionModel.version)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        if version is None:
+            self.db.rollback()
+            if section.version is not None and self._position(project_id, section.id) is not None:
+                raise ConflictError("section was modified")
+            return False
+        self._write_intervals(section)
+        self.db.commit()
+        self._touch(project_id)
+        section.version = version
         return True
 
 
+class SceneRepository(_OrderedRepository):
+    model = SceneModel
+
+    def get_many(self, project_ids: list[str]) -> dict[str, list[dict]]:
+        scenes: dict[str, list[dict]] = {project_id: [] for project_id in project_ids}
+        if not project_ids:
+            return scenes
+        for row in self.db.execute(
+            select(SceneModel)
+            .where(SceneModel.project_id.in_(project_ids))
+            .order_by(SceneModel.project_id, SceneModel.position)
+        ).scalars():
+            scenes[row.project_id].append(_scene_dict(row))
+        return scenes
+
+    def get_scenes(self, project_id: str) -> list[Scene]:
+        return [Scene.model_validate(scene) for scene in self.get_many([project_id])[project_id]]
+
+    def add(self, project_id: str, scene: Scene, before: str | None = None, after: str | None = None) -> bool:
+        position = self._new_position(project_id, before=before, after=after)
+        if position is None:
+            return False
+        try:
+            self.db.execute(insert(SceneModel).values(project_id=project_id, position=position, **_scene_row(scene)))
+        except IntegrityError:
+            # 프로젝트가 없다.
+            self.db.rollback()
+            return False
+        self._commit()
+        self._touch(project_id)
+        return True
+
+    def add_all(self, project_id: str, scenes: list[Scene]) -> None:
+        """커밋하지 않는다."""
+        if scenes:
+            self.db.execute(insert(SceneModel), [
+                {"project_id": project_id, "position": position, **_scene_row(scene)}
+                for scene, position in zip(scenes, iter_keys())
+            ])
+
+    def update(self, project_id: str, scene_id: str, **values) -> bool:
+        result = self.db.execute(
+            update(SceneModel)
+            .where(SceneModel.project_id == project_id, SceneModel.id == scene_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        if result.rowcount:
+            self._touch(project_id)
+        return result.rowcount > 0
+
+
+class ProjectRecord(BaseModel):
+    id: str
+    body: Project
+    version: int
+
+
+class ProjectSummary(BaseModel):
+    """목록에 보여 줄 값만 담는다."""
+    id: str
+    title: Optional[str]
+    updated_at: datetime
+
+
+class ProjectModelRepository:
+    """ProjectRepository 와 같지만 Project 모델로 주고받는다.
+
+    projects.body 에는 제목과 media 만 두고, 섹션(구간 포함)과 씬은 각자 테이블에서 읽어 Project 로 합친다.
+    """
+
+    def __init__(self, db: Session):
+        self.repo = ProjectRepository(db)
+        self.sections = SectionRepository(db)
+        self.scenes = SceneRepository(db)
+
+    def _to_records(self, projects: list[ProjectModel]) -> list[ProjectRecord]:
+        ids = [project.id for project in projects]
+        sections = self.sections.get_many(ids)
+        scenes = self.scenes.get_many(ids)
+        return [
+            ProjectRecord(
+                id=project.id,
+                body=Project.model_validate({**project.body, "sections": sections[project.id], "scenes": scenes[project.id]}),
+                version=project.version,
+            )
+            for project in projects
+        ]
+
+    @staticmethod
+    def _body(body: Project) -> dict:
+        return body.model_dump(mode="json", exclude={"sections", "scenes"})
+
+    def get(self, project_id: str) -> ProjectRecord | None:
+        project = self.repo.get(project_id)
+        if project is None:
+            return None
+        return self._to_records([project])[0]
+
+    def get_summary_page(self, limit: int, after: tuple[datetime, str] | None = None) -> list[ProjectSummary]:
+        return [
+            ProjectSummary(id=row.id, title=row.title, updated_at=row.updated_at)
+            for row in self.repo.get_summary_page(limit, after)
+        ]
+
+    def get_all(self) -> list[ProjectRecord]:
+        return self._to_records(self.repo.get_all())
+
+    def create(self, id: str, body: Project) -> ProjectRecord:
+        db = self.repo.db
+        db.add(ProjectModel(id=id, body=self._body(body)))
+        db.flush()
+        self.sections.add_all(id, body.sections)
+        self.scenes.add_all(id, body.scenes)
+        db.commit()
+        return self.get(id)
+
+    def exists(self, project_id: str) -> bool:
+        return self.repo.exists(project_id)
+
+    def update(self, project_id: str, body: Project, expected_version: int | None = None) -> ProjectRecord | None:
+        """프로젝트 전체를 바꾼다. 섹션과 씬은 지우고 다시 쓰므로, 한 원소만 바꿀 때는 SectionRepository 등을 쓴다.
+
+        Raises:
+            ConflictError: expected_version 과 버전이 다르거나, 읽은 뒤 다른 요청이 본문을 바꿨을 때
+        """
+        db = self.repo.db
+        project = self.repo.get(project_id)
+        if project is None:
+            return None
+        if expected_version is not None and project.version != expected_version:
+            db.rollback()
+            raise ConflictError("project was modified")
+        try:
+            project.body = self._body(body)
+            db.flush()
+            db.execute(delete(SectionModel).where(SectionModel.project_id == project_id))
+            db.execute(delete(SceneModel).where(SceneModel.project_id == project_id))
+            self.sections.add_all(project_id, body.sections)
+            self.scenes.add_all(project_id, body.scenes)
+            db.commit()
+        except StaleDataError:
+            db.rollback()
+            raise ConflictError("project was modified")
+        return self.get(project_id)
+
+    def set_title(self, project_id: str, title: str) -> ProjectSummary | None:
+        """제목만 바꾼다. 본문에는 제목과 media 만 있어서 섹션과 씬은 읽지도 쓰지도 않는다.
+
+        Raises:
+            ConflictError: 읽은 뒤 다른 요청이 본문을 바꿨을 때
+        """
+        project = self.repo.get(project_id)
+        if project is None:
+            return None
+        project = self.repo.update(project_id, body={**project.body, "title": title})
+        return ProjectSummary(id=project.id, title=project.body["title"], updated_at=project.updated_at)
+
+    def add_media(self, project_id: str, media: Media) -> bool:
+        return self.repo.append_media(project_id, media.model_dump(mode="json"))
+
+    def delete(self, project_id: str) -> bool:
+        return self.repo.delete(project_id)
+
+
 class FileRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -45,6 +538,12 @@ class FileRepository:
     def get(self, file_id: str):
         return self.db.query(FileModel).filter(FileModel.id == file_id).first()
 
+    def get_many(self, file_ids: list[str]) -> dict[str, FileModel]:
+        if not file_ids:
+            return {}
+        files = self.db.query(FileModel).filter(FileModel.id.in_(file_ids)).all()
+        return {file.id: file for file in files}
+
     def get_all(self):
         return self.db.query(FileModel).all()
 
@@ -56,16 +555,20 @@ class FileRepository:
         object_name: str,
         size: int,
         name: str,
+        content_type: str | None = None,
         delete_date=None,
+        content_hash: str | None = None,
     ):
         file = FileModel(
             id=id,
             project_id=project_id,
-            bucket_name=bucket_name,
+            bucket=bucket_name,
             object_name=object_name,
             size=size,
             name=name,
+            content_type=content_type,
             delete_date=delete_date,
+            content_hash=content_hash,
         )
         self.db.add(file)
         self.db.commit()
@@ -89,3 +592,108 @@ class FileRepository:
         self.db.delete(file)
         self.db.commit()
         return True
+
+    def get_expired_page(self, cutoff, after=None, limit: int = 1000):
+        """delete_date 가 cutoff 이전인 파일을 (delete_date, id) 순으로 limit 개 가져온다.
+
+        after 에 직전 페이지의 마지막 (delete_date, id) 를 주면 그 다음부터 읽는다. (keyset pagination)
+        """
+        query = self.db.query(FileModel).filter(FileModel.delete_date <= cutoff)
+        if after is not None:
+            query = query.filter(tuple_(FileModel.delete_date, FileModel.id) > tuple_(*after))
+        return query.order_by(FileModel.delete_date, FileModel.id).limit(limit).all()
+
+    def get_referenced_ids(self, files) -> set[str]:
+        """아직 섹션 오디오(sections.file_id)나 프로젝트 본문(JSONB) 어딘가에서 id 로 쓰이고 있는 파일들."""
+        if not files:
+            return set()
+        in_body = select(ProjectModel.id).where(
+            ProjectModel.id == FileModel.project_id,
+            func.jsonb_path_exists(
+                ProjectModel.body,
+                literal_column("'$.** ? (@ == $id)'::jsonpath"),
+                func.jsonb_build_object("id", FileModel.id),
+            ),
+        ).exists()
+        in_sections = select(SectionModel.id).where(SectionModel.file_id == FileModel.id).exists()
+        rows = self.db.execute(
+            select(FileModel.id).where(FileModel.id.in_([file.id for file in files]), or_(in_sections, in_body))
+        ).all()
+        return {row.id for row in rows}
+
+    def delete_many(self, file_ids: list[str], commit: bool = True) -> int:
+        if not file_ids:
+            return 0
+        result = self.db.execute(delete(FileModel).where(FileModel.id.in_(file_ids)))
+        if commit:
+            self.db.commit()
+        return result.rowcount
+
+
+class FileContentRepository:
+    """내용 인덱스(SHA-256 -> 오브젝트)와 참조 수.
+
+    acquire/release 는 커밋하지 않는다. files 행을 만들거나 지우는 것과 같은 트랜잭션에서 커밋해야
+    참조 수가 실제 행 수와 어긋나지 않는다.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def acquire(self, content_hash: str, bucket: str, object_name: str, size: int) -> tuple[str, str, bool]:
+        """내용을 참조한다. 처음 보는 내용이면 주어진 오브젝트로 등록한다.
+
+        Returns:
+            (bucket, object_name, created) - 이미 있던 내용이면 기존 오브젝트 위치와 False
+        """
+        stmt = (
+            insert(FileContentModel)
+            .values(content_hash=content_hash, bucket=bucket, object_name=object_name, size=size, ref_count=1)
+            .on_conflict_do_update(
+                index_elements=[FileContentModel.content_hash],
+                set_={"ref_count": FileContentModel.ref_count + 1},
+            )
+            .returning(FileContentModel.bucket, FileContentModel.object_name)
+        )
+        row = self.db.execute(stmt).one()
+        return row.bucket, row.object_name, (row.bucket, row.object_name) == (bucket, object_name)
+
+    def acquire_existing(self, content_hash: str, size: int | None = None) -> tuple[str, str, int] | None:
+        """이미 있는 내용만 참조한다. (bucket, object_name, size), 없거나 크기가 다르면 None.
+
+        행을 잠그고 참조 수를 올리므로, 같은 때 release 가 마지막 참조를 지우고 있으면 그쪽이 끝난 뒤 None 이 된다.
+        """
+        conditions = [FileContentModel.content_hash == content_hash, FileContentModel.ref_count > 0]
+        if size is not None:
+            conditions.append(FileContentModel.size == size)
+        row = self.db.execute(
+            update(FileContentModel)
+            .where(*conditions)
+            .values(ref_count=FileContentModel.ref_count + 1)
+            .returning(FileContentModel.bucket, FileContentModel.object_name, FileContentModel.size)
+            .execution_options(synchronize_session=False)
+        ).one_or_none()
+        return (row.bucket, row.object_name, row.size) if row is not None else None
+
+    def release(self, content_hashes: list[str]) -> list[tuple[str, str]]:
+        """참조를 하나씩 줄이고, 더 이상 참조되지 않는 내용의 (bucket, object_name) 을 돌려준다.
+
+        같은 해시가 여러 번 들어오면 그만큼 줄인다.
+        """
+        counts: dict[str, int] = {}
+        for content_hash in content_hashes:
+            counts[content_hash] = counts.get(content_hash, 0) + 1
+        for content_hash, count in counts.items():
+            self.db.execute(
+                update(FileContentModel)
+                .where(FileContentModel.content_hash == content_hash)
+                .values(ref_count=FileContentModel.ref_count - count)
+            )
+        if not counts:
+            return []
+        rows = self.db.execute(
+            delete(FileContentModel)
+            .where(FileContentModel.content_hash.in_(list(counts)), FileContentModel.ref_count <= 0)
+            .returning(FileContentModel.bucket, FileContentModel.object_name)
+        ).all()
+        return [(row.bucket, row.object_name) for row in rows]
@@ -1,7 +1,10 @@
+from collections import defaultdict
 from typing import BinaryIO
+import uuid
 from server.database.models.models import FileModel
-from server.repositories.repository import FileRepository
-from server.storage.storage_client import UploadedFile, generate_media_signed_url, upload_audio_bytes, upload_media_stream
+from server.repositories.repository import FileContentRepository, FileRepository
+from server.storage.signed_urls import generate_signed_url, generate_signed_urls
+from server.storage.storage_client import UploadedFile, delete_objects, upload_audio_bytes, upload_media_stream
 from sqlalchemy.orm import Session
 
 
@@ -39,27 +42,56 @@ def create_audio_file_by_bytes(
     fileRepo = FileRepository(db)
 
     file = fileRepo.create(
+        id=str(uuid.uuid4()),
         project_id=project_id,
         bucket_name=result.bucket,
         object_name=result.object_name,
         size=result.size,
         name=result.name,
+        content_type=result.content_type,
     )
 
     return file
 
+def to_uploaded_file(file: FileModel) -> UploadedFile:
+    return UploadedFile(
+        bucket=file.bucket,
+        object_name=file.object_name,
+        name=file.name,
+        content_type=file.content_type or "application/octet-stream",
+        size=file.size,
+    )
+
 # 파일 ID로 파일 url 조회
 def get_file_url_by_id(db: Session, file_id: str, expired_seconds: int = 3600) -> str:
     fileRepo = FileRepository(db)
     file = fileRepo.get(file_id)
     if not file:
         return None
-    
-    return generate_media_signed_url(media=UploadedFile(
-        id=file.id,
-        bucket=file.bucket,
-        object_name=file.object_name,
-        name=file.name,
-        content_type=file.content_type,
-        size=file.size,
-    ), expires_seconds=expired_seconds)
\ No newline at end of file
+
+    return generate_signed_url(to_uploaded_file(file), expires_seconds=expired_seconds)
+
+# 이미 읽어 온 파일들의 url 을 파일 ID 별로 만든다. DB 는 보지 않고 서명과 Redis 캐시만 쓴다.
+# 블로킹 호출이므로 이벤트 루프에서는 스레드로 넘겨서 부른다.
+def sign_file_urls(files: list[FileModel], expired_seconds: int = 3600) -> dict[str, str]:
+    urls = generate_signed_urls([to_uploaded_file(file) for file in files], expires_seconds=expired_seconds)
+    return {file.id: url for file, url in zip(files, urls)}
+
+# files 행을 지우고 더 이상 아무도 쓰지 않는 오브젝트를 지운다.
+# 내용이 같은 업로드끼리 공유하는 오브젝트는 마지막 참조가 없어질 때만 지운다.
+def delete_files(db: Session, files: list[FileModel]) -> dict[str, list[str]]:
+    unreferenced: dict[str, list[str]] = defaultdict(list)
+    for file in files:
+        if not file.content_hash:
+            unreferenced[file.bucket].append(file.object_name)
+
+    FileRepository(db).delete_many([file.id for file in files], commit=False)
+    released = FileContentRepository(db).release([file.content_hash for file in files if file.content_hash])
+    for bucket, object_name in released:
+        unreferenced[bucket].append(object_name)
+    db.commit()
+
+    # 행을 지운 트랜잭션이 커밋된 뒤에 오브젝트를 지운다.
+    for bucket, object_names in unreferenced.items():
+        delete_objects(bucket, object_names)
+    return dict(unreferenced)
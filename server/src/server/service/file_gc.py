@@ -0,0 +1,81 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Optional
+import logging
+import time
+from sqlalchemy.orm import Session
+from server.repositories import FileRepository
+from .file import delete_files
+
+logger = logging.getLogger(__name__)
+
+# 보고서에 남기는 오브젝트 이름 수
+_SAMPLE_SIZE = 20
+
+
+@dataclass
+class GcReport:
+    dry_run: bool
+    cutoff: date
+    batches: int = 0
+    scanned: int = 0
+    skipped_referenced: int = 0
+    deleted_files: int = 0
+    deleted_objects: int = 0
+    released_bytes: int = 0
+    sample: list[str] = field(default_factory=list)
+
+
+def collect_expired_files(
+    db: Session,
+    *,
+    dry_run: bool = False,
+    batch_size: int = 1000,
+    pause_seconds: float = 0.2,
+    grace_days: int = 1,
+    max_batches: Optional[int] = None,
+) -> GcReport:
+    """delete_date 가 지났고 어느 프로젝트에서도 쓰지 않는 파일을 배치로 지운다.
+
+    (delete_date, id) 인덱스를 keyset pagination 으로 훑고, 배치마다 행은 한 트랜잭션으로 지우고
+    오브젝트는 delete_objects(1000개씩)로 지운다. 배치 사이에는 pause_seconds 만큼 쉰다.
+    dry_run 이면 아무것도 지우지 않고 지울 대상만 보고한다.
+    """
+    cutoff = date.today() - timedelta(days=grace_days)
+    report = GcReport(dry_run=dry_run, cutoff=cutoff)
+    file_repo = FileRepository(db)
+    after = None
+
+    while max_batches is None or report.batches < max_batches:
+        files = file_repo.get_expired_page(cutoff, after=after, limit=batch_size)
+        if not files:
+            break
+        after = (files[-1].delete_date, files[-1].id)
+        report.batches += 1
+        report.scanned += len(files)
+
+        referenced = file_repo.get_referenced_ids(files)
+        report.skipped_referenced += len(referenced)
+        expired = [file for file in files if file.id not in referenced]
+
+        if expired:
+            report.deleted_files += len(expired)
+            report.released_bytes += sum(file.size for file in expired)
+            if dry_run:
+                # 내용을 공유하는 파일은 실제로는 마지막 참조일 때만 오브젝트가 지워진다.
+                report.deleted_objects += len(expired)
+                names = [file.object_name for file in expired]
+            else:
+                deleted = delete_files(db, expired)
+                names = [name for object_names in deleted.values() for name in object_names]
+                report.deleted_objects += len(names)
+            report.sample.extend(names[:_SAMPLE_SIZE - len(report.sample)])
+
+        # 세션이 지운/읽은 행을 계속 들고 있지 않도록 비운다.
+        db.expunge_all()
+        logger.info("file gc batch %d: scanned %d, deleted %d", report.batches, len(files), len(expired))
+        if len(files) < batch_size:
+            break
+        time.sleep(pause_seconds)
+
+    return report
@@ -0,0 +1,174 @@
+import json
+import math
+import time
+import uuid
+from typing import Optional, Union
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from server.common.exception import InvalidInputError, NotFoundError
+from server.redis.redis_client import get_client
+from server.repositories import ProjectModelRepository
+from server.storage.storage_client import (
+    abort_multipart_upload,
+    complete_multipart_upload,
+    create_multipart_upload,
+    delete_objects,
+    generate_upload_part_urls,
+    get_settings,
+    head_object,
+    object_sha256,
+)
+from .project_media import parse_sha256, register_existing_content, register_media
+from .project_types import Media
+
+# S3 multipart 제한
+MAX_PARTS = 10000
+MIN_PART_SIZE = 5 * 1024 * 1024
+MAX_OBJECT_SIZE = 5 * 1024 ** 4
+
+
+class UploadSession(BaseModel):
+    """브라우저가 저장소로 직접 올리는 업로드 하나. 끝나거나 취소될 때까지 Redis 에 둔다."""
+    id: str
+    project_id: str
+    bucket: str
+    object_name: str
+    upload_id: str
+    name: str
+    content_type: str
+    size: int
+    part_size: int
+    part_count: int
+    created_at: float
+    sha256: Optional[str] = None  # 클라이언트가 계산한 내용 해시. 마칠 때 서버가 다시 계산해 맞춰 본다.
+
+
+def _session_key(session_id: str) -> str:
+    return f"media:upload:{session_id}"
+
+
+def _save(session: UploadSession) -> None:
+    get_client().set(
+        _session_key(session.id),
+        session.model_dump_json(),
+        ex=get_settings().upload_session_ttl_seconds,
+    )
+
+
+def get_upload_session(project_id: str, session_id: str) -> UploadSession:
+    data = get_client().get(_session_key(session_id))
+    if data is None:
+        raise NotFoundError("upload session not found")
+    session = UploadSession.model_validate(json.loads(data))
+    if session.project_id != project_id:
+        raise NotFoundError("upload session not found")
+    return session
+
+
+def choose_part_size(size: int) -> int:
+    """기본 part 크기로 시작하되 part 가 MAX_PARTS 개를 넘지 않도록 키운다."""
+    part_size = max(MIN_PART_SIZE, get_settings().upload_part_size)
+    return max(part_size, math.ceil(size / MAX_PARTS))
+
+
+def part_urls(session: UploadSession, part_numbers: Optional[list[int]] = None) -> dict[int, str]:
+    if part_numbers is None:
+        part_numbers = list(range(1, session.part_count + 1))
+    if any(not 1 <= n <= session.part_count for n in part_numbers):
+        raise InvalidInputError("invalid part number")
+    return generate_upload_part_urls(
+        session.bucket,
+        session.object_name,
+        session.upload_id,
+        part_numbers,
+        expires_seconds=get_settings().upload_url_expires_seconds,
+    )
+
+
+def create_upload_session(
+    db: Session, project_id: str, *, name: str, content_type: str, size: int, sha256: Optional[str] = None
+) -> Union[UploadSession, Media]:
+    """multipart 업로드를 시작한다. 파일 내용은 API 서버를 거치지 않는다.
+
+    sha256 을 주고 같은 내용이 이미 있으면 업로드를 만들지 않고 등록한 Media 를 돌려준다.
+    """
+    if not 0 < size <= MAX_OBJECT_SIZE:
+        raise InvalidInputError("invalid file size")
+    sha256 = parse_sha256(sha256)
+    if not ProjectModelRepository(db).exists(project_id):
+        raise NotFoundError("project not found")
+    if sha256 is not None:
+        media = register_existing_content(db, project_id, sha256, size=size, name=name, content_type=content_type)
+        if media is not None:
+            return media
+
+    settings = get_settings()
+    bucket = settings.media_bucket
+    object_name = uuid.uuid4().hex
+    part_size = choose_part_size(size)
+
+    session = UploadSession(
+        id=uuid.uuid4().hex,
+        project_id=project_id,
+        bucket=bucket,
+        object_name=object_name,
+        upload_id=create_multipart_upload(bucket, object_name, content_type),
+        name=name,
+        content_type=content_type,
+        size=size,
+        part_size=part_size,
+        part_count=math.ceil(size / part_size),
+        created_at=time.time(),
+        sha256=sha256,
+    )
+    _save(session)
+    return session
+
+
+def complete_upload_session(
+    db: Session, project_id: str, session_id: str, parts: list[tuple[int, str]]
+) -> Media:
+    """브라우저가 모든 part 를 올린 뒤 부른다. 업로드를 마치고 파일과 Media 를 등록한다."""
+    session = get_upload_session(project_id, session_id)
+    if sorted(number for number, _ in parts) != list(range(1, session.part_count + 1)):
+        raise InvalidInputError("all parts must be uploaded exactly once")
+
+    try:
+        size = complete_multipart_upload(session.bucket, session.object_name, session.upload_id, parts)
+    except NotFoundError:
+        # 이전 요청이 업로드는 마쳤지만 등록하다 실패했다. 올라간 오브젝트로 다시 등록한다.
+        info = head_object(session.bucket, session.object_name)
+        if info is None:
+            raise
+        size = info.size
+
+    if session.sha256 is not None and object_sha256(session.bucket, session.object_name) != session.sha256:
+        # 믿을 수 없는 해시로 내용 인덱스에 올리지 않는다. 다시 올려야 한다.
+        delete_objects(session.bucket, [session.object_name])
+        get_client().delete(_session_key(session.id))
+        raise InvalidInputError("sha256 does not match the uploaded content")
+
+    # 세션은 등록한 뒤에 지운다. 등록이 실패해도 세션이 남아 있으니 다시 요청하면 된다.
+    media = register_media(
+        db,
+        project_id,
+        bucket=session.bucket,
+        object_name=session.object_name,
+        size=size,
+        name=session.name,
+        content_type=session.content_type,
+        content_hash=session.sha256,
+    )
+    if media is None:
+        # 그 사이 프로젝트가 지워졌다. 가리킬 곳이 없는 오브젝트를 남기지 않는다.
+        delete_objects(session.bucket, [session.object_name])
+        get_client().delete(_session_key(session.id))
+        raise NotFoundError("project not found")
+    get_client().delete(_session_key(session.id))
+    return media
+
+
+def abort_upload_session(project_id: str, session_id: str) -> None:
+    session = get_upload_session(project_id, session_id)
+    abort_multipart_upload(session.bucket, session.object_name, session.upload_id)
+    get_client().delete(_session_key(session.id))
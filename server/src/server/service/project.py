@@ -1,11 +1,16 @@
-from server.repositories import ProjectModelRepository
-from sqlalchemy.orm import Session
+from server.common.exception import InvalidInputError
+from server.common.retry import retry_on_conflict
+from server.repositories import AsyncRepository, ProjectModelRepository, ProjectSummary
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+import base64
+import json
 import uuid
 from typing import List, Optional
 from .project_types import Project
 
-async def create_project(db: Session, title: str) :
-    project_repo = ProjectModelRepository(db)
+async def create_project(db: AsyncSession, title: str) :
+    project_repo = AsyncRepository(db, ProjectModelRepository)
 
     project_id = str(uuid.uuid4())
 
@@ -17,37 +22,49 @@ async def create_project(db: Session, title: str) :
         media=[],
     )
 
-    project = project_repo.create(id=project_id, body=body)
+    project = await project_repo.create(id=project_id, body=body)
 
     return project
 
 
-async def get_project(db: Session, project_id: str) -> Optional[Project]:
-    project_repo = ProjectModelRepository(db)
-    project_model = project_repo.get(project_id)
+async def get_project(db: AsyncSession, project_id: str) -> Optional[Project]:
+    project_repo = AsyncRepository(db, ProjectModelRepository)
+    project_model = await project_repo.get(project_id)
     if not project_model:
         return None
     return project_model.body
 
 
-async def get_all_projects(db: Session) -> List[Project]:
-    project_repo = ProjectModelRepository(db)
-    project_models = project_repo.get_all()
-    return [project_model.body for project_model in project_models]
+def _encode_cursor(project: ProjectSummary) -> str:
+    payload = json.dumps([project.updated_at.isoformat(), project.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
 
 
-async def delete_project(db: Session, project_id: str) -> bool:
-    project_repo = ProjectModelRepository(db)
-    return project_repo.delete(project_id)
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        updated_at, project_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(updated_at), str(project_id)
+    except (ValueError, TypeError):
+        raise InvalidInputError("invalid cursor")
 
 
-async def update_project_title(db: Session, project_id: str, title: str) -> Optional[Project]:
-    project_repo = ProjectModelRepository(db)
-    project_model = project_repo.get(project_id)
-    if not project_model:
-        return None
-    project_model.body.title = title
-    
-    updated_project = project_repo.update(project_id, body=project_model.body)
+async def get_project_page(
+    db: AsyncSession, limit: int, cursor: Optional[str] = None
+) -> tuple[List[ProjectSummary], Optional[str]]:
+    """최근에 고친 순서로 프로젝트 요약을 limit 개 돌려준다. 다음 페이지가 있으면 그 cursor 도 준다."""
+    after = _decode_cursor(cursor) if cursor else None
+    projects = await AsyncRepository(db, ProjectModelRepository).get_summary_page(limit + 1, after)
+    if len(projects) <= limit:
+        return projects, None
+    projects = projects[:limit]
+    return projects, _encode_cursor(projects[-1])
+
+
+async def delete_project(db: AsyncSession, project_id: str) -> bool:
+    project_repo = AsyncRepository(db, ProjectModelRepository)
+    return await project_repo.delete(project_id)
+
 
-    return updated_project.body
+async def update_project_title(db: AsyncSession, project_id: str, title: str) -> Optional[ProjectSummary]:
+    project_repo = AsyncRepository(db, ProjectModelRepository)
+    return await retry_on_conflict(db, lambda: project_repo.set_title(project_id, title))
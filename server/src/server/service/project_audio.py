@@ -0,0 +1,133 @@
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from server.audio import mp3
+from server.common.exception import ConflictError
+from server.database.models.models import FileModel
+from server.repositories import AsyncRepository, FileRepository, ProjectModelRepository
+from server.storage.storage_client import iter_object_chunks, upload_stream
+from .project_timeline import audio_format, iter_section_timings
+from .project_types import Project
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(frozen=True)
+class AudioSegment:
+    """이어 붙일 조각. 무음 프레임 몇 개이거나, 섹션 MP3 오브젝트 하나."""
+    silence_frames: int = 0
+    bucket: Optional[str] = None
+    object_name: Optional[str] = None
+
+
+@dataclass
+class ProjectAudioPlan:
+    """프로젝트 MP3 를 만들기 위한 계획. 저장된 메타데이터만으로 전체 프레임 수와 크기를 미리 안다."""
+    header: mp3.FrameHeader
+    segments: list[AudioSegment] = field(default_factory=list)
+    frame_count: int = 0
+    data_size: int = 0
+    encoder_delay: int = 0
+    encoder_padding: int = 0
+
+    @property
+    def duration(self) -> float:
+        return self.frame_count * self.header.duration
+
+
+def plan_project_audio(db: Session, project: Project) -> ProjectAudioPlan:
+    """섹션 순서대로 무음/섹션 오디오 조각을 정한다.
+
+    빈 섹션은 duration 만큼, 발화 섹션은 delay 만큼 무음 프레임을 넣는다.
+    섹션 MP3 들은 같은 샘플레이트/채널로 합성됐어야 프레임 단위로 이어 붙일 수 있다.
+    """
+    header = audio_format(project)
+    silent_size = header.frame_length
+    timings = list(iter_section_timings(project, header))
+    files = FileRepository(db).get_many([t.section.file_id for t in timings if t.has_audio])
+
+    plan = ProjectAudioPlan(header=header)
+    last_padding = 0
+    for timing in timings:
+        if timing.silence_frames:
+            plan.segments.append(AudioSegment(silence_frames=timing.silence_frames))
+            plan.frame_count += timing.silence_frames
+            plan.data_size += timing.silence_frames * silent_size
+            last_padding = 0
+
+        if not timing.has_audio:
+            continue
+        section = timing.section
+        file = files.get(section.file_id)
+        if file is None:
+            raise ConflictError(f"audio file of section {section.id} not found")
+
+        audio = section.audio
+        if audio is not None and audio.sample_rate and (
+            audio.sample_rate != header.sample_rate or audio.channels != header.channels
+        ):
+            raise ConflictError(f"section {section.id} audio format does not match the project audio")
+
+        if not plan.frame_count:
+            plan.encoder_delay = audio.encoder_delay if audio else 0
+        # 메타데이터가 없던 때 만든 섹션은 길이와 파일 크기로 계산한다.
+        plan.frame_count += audio.frame_count if audio else mp3.frames_for(section.duration, header)
+        plan.data_size += audio.data_size if audio else file.size
+        last_padding = audio.encoder_padding if audio else 0
+        plan.segments.append(AudioSegment(bucket=file.bucket, object_name=file.object_name))
+
+    plan.encoder_padding = last_padding
+    return plan
+
+
+def iter_project_audio(plan: ProjectAudioPlan, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Xing 프레임 하나 + 조각들의 프레임을 순서대로 흘려보낸다.
+
+    섹션 MP3 는 조각 단위로 읽으면서 파일 단위 헤더를 떼어내므로 메모리 사용량은
+    프로젝트 길이와 상관없이 chunk_size 수준이다.
+    """
+    yield mp3.build_info_frame(
+        plan.header,
+        frame_count=plan.frame_count,
+        data_size=plan.data_size,
+        encoder_delay=plan.encoder_delay,
+        encoder_padding=plan.encoder_padding,
+    )
+    for segment in plan.segments:
+        if segment.silence_frames:
+            yield from mp3.iter_silence(segment.silence_frames, plan.header, chunk_size)
+        else:
+            yield from mp3.iter_stream_frames(iter_object_chunks(segment.bucket, segment.object_name, chunk_size))
+
+
+async def get_project_audio_plan(db: AsyncSession, project_id: str) -> Optional[ProjectAudioPlan]:
+    project_model = await AsyncRepository(db, ProjectModelRepository).get(project_id)
+    if not project_model:
+        return None
+    return await db.run_sync(plan_project_audio, project_model.body)
+
+
+def export_project_audio(db: Session, project_id: str) -> Optional[FileModel]:
+    """프로젝트 MP3 를 만들어 multipart 로 바로 올리고 파일로 등록한다."""
+    project_model = ProjectModelRepository(db).get(project_id)
+    if not project_model:
+        return None
+    plan = plan_project_audio(db, project_model.body)
+
+    result = upload_stream(
+        iter_project_audio(plan),
+        f"projects/{project_id}/{uuid.uuid4().hex}.mp3",
+        content_type="audio/mpeg",
+        name=f"{project_id}.mp3",
+    )
+    return FileRepository(db).create(
+        id=str(uuid.uuid4()),
+        project_id=project_id,
+        bucket_name=result.bucket,
+        object_name=result.object_name,
+        size=result.size,
+        name=result.name,
+        content_type=result.content_type,
+    )
@@ -0,0 +1,29 @@
+import hashlib
+from typing import Iterator, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from server.repositories import AsyncRepository, ProjectModelRepository
+from server.subtitle import FORMATS, get_settings, get_subtitle_cache, iter_cues
+from .project_types import Project
+
+
+def caption_cache_key(project: Project, fmt: str) -> str:
+    """자막 결과를 결정하는 값(섹션 내용, 형식, 줄 제한)의 해시. 프로젝트가 바뀌면 키도 바뀐다."""
+    settings = get_settings()
+    digest = hashlib.sha256()
+    digest.update(f"{fmt}:{settings.subtitle_max_line_chars}:{settings.subtitle_max_lines}:".encode())
+    digest.update(project.model_dump_json(include={"sections"}).encode("utf-8"))
+    return f"{project.id}:{digest.hexdigest()}"
+
+
+def iter_project_captions(project: Project, fmt: str) -> Iterator[str]:
+    settings = get_settings()
+    writer, _ = FORMATS[fmt]
+    cues = iter_cues(project, settings.subtitle_max_line_chars, settings.subtitle_max_lines)
+    return get_subtitle_cache().stream(caption_cache_key(project, fmt), writer(cues))
+
+
+async def get_project_captions(db: AsyncSession, project_id: str, fmt: str) -> Optional[Iterator[str]]:
+    project_model = await AsyncRepository(db, ProjectModelRepository).get(project_id)
+    if not project_model:
+        return None
+    return iter_project_captions(project_model.body, fmt)
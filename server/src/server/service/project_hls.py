@@ -0,0 +1,89 @@
+import asyncio
+import math
+from typing import Callable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from server.audio import mp3
+from server.common.exception import ConflictError
+from server.repositories import AsyncRepository, FileRepository, ProjectModelRepository
+from .file import sign_file_urls
+from .project_timeline import audio_format, iter_section_timings
+from .project_types import Project
+
+# 무음 세그먼트 하나의 최대 길이 (초). 긴 빈 섹션은 여러 세그먼트로 나눈다.
+SILENCE_SEGMENT_SECONDS = 10.0
+
+
+def max_silence_segment_frames(header: mp3.FrameHeader) -> int:
+    return mp3.frames_for(SILENCE_SEGMENT_SECONDS, header)
+
+
+def playlist_file_ids(project: Project) -> list[str]:
+    """재생 목록이 가리키는 섹션 오디오 파일 ID 들."""
+    return [timing.section.file_id for timing in iter_section_timings(project) if timing.has_audio]
+
+
+def build_project_playlist(
+    project: Project,
+    urls: dict[str, str],
+    silence_url: Callable[[mp3.FrameHeader, int], str],
+) -> str:
+    """프로젝트 오디오를 HLS(m3u8) 재생 목록으로 만든다.
+
+    발화 섹션은 이미 올라가 있는 섹션 MP3 를 presigned URL(urls, 파일 ID 별)로 그대로 가리키고,
+    빈 섹션과 delay 는 silence_url(header, 프레임 수) 가 주는 무음 세그먼트로 채운다.
+    서버에서 오디오를 복사하거나 다시 인코딩하지 않고, 섹션 하나를 고치면 그 섹션의 항목만 바뀐다.
+
+    Raises:
+        ConflictError: 섹션 오디오 파일이 없을 때. 건너뛰면 뒤 세그먼트가 앞당겨져 자막/타임라인과 어긋난다.
+    """
+    header = audio_format(project)
+    timings = list(iter_section_timings(project, header))
+    silence_max = max_silence_segment_frames(header)
+
+    segments: list[tuple[float, str]] = []
+    for timing in timings:
+        remaining = timing.silence_frames
+        while remaining > 0:
+            frames = min(remaining, silence_max)
+            segments.append((frames * header.duration, silence_url(header, frames)))
+            remaining -= frames
+
+        if not timing.has_audio:
+            continue
+        url = urls.get(timing.section.file_id)
+        if url is None:
+            raise ConflictError(f"audio file of section {timing.section.id} not found")
+        segments.append((timing.end - timing.speech_start, url))
+
+    target = max((math.ceil(duration) for duration, _ in segments), default=1)
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{max(1, target)}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+    ]
+    for i, (duration, url) in enumerate(segments):
+        # 세그먼트마다 따로 인코딩된 MP3 라서 타임스탬프가 이어지지 않는다.
+        if i:
+            lines.append("#EXT-X-DISCONTINUITY")
+        lines.append(f"#EXTINF:{duration:.6f},")
+        lines.append(url)
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+async def get_project_playlist(
+    db: AsyncSession,
+    project_id: str,
+    silence_url: Callable[[mp3.FrameHeader, int], str],
+    expires_seconds: int = 3600,
+) -> Optional[str]:
+    project_model = await AsyncRepository(db, ProjectModelRepository).get(project_id)
+    if not project_model:
+        return None
+    project: Project = project_model.body
+    # 행은 run_sync 로 읽고, 서명과 Redis 캐시는 스레드에서 한다.
+    files = await AsyncRepository(db, FileRepository).get_many(playlist_file_ids(project))
+    urls = await asyncio.to_thread(sign_file_urls, list(files.values()), expires_seconds)
+    return build_project_playlist(project, urls, silence_url)
@@ -1,11 +1,28 @@
-from server.repositories import FileRepository, ProjectModelRepository
-from server.service.file import get_file_url_by_id
+from server.repositories import AsyncRepository, FileContentRepository, FileRepository, ProjectModelRepository
+from server.service.file import sign_file_urls
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import BinaryIO, Optional
+from typing import AsyncIterable, BinaryIO, Optional
+from datetime import date
+import asyncio
+import re
 import uuid
-from server.storage.storage_client import upload_media_stream
+from server.common.exception import InvalidInputError
+from server.storage.storage_client import delete_objects, upload_media_stream, upload_media_stream_async
 from .project_types import Media, Project
 
+_SHA256 = re.compile(r"[0-9a-f]{64}")
+
+
+def parse_sha256(value: Optional[str]) -> Optional[str]:
+    """클라이언트가 계산해 보낸 내용 해시 (hex). 없으면 None."""
+    if value is None:
+        return None
+    value = value.lower()
+    if not _SHA256.fullmatch(value):
+        raise InvalidInputError("invalid sha256")
+    return value
+
 def create_file_by_media_stream(
     db: Session,
     project_id: str,
@@ -22,36 +39,177 @@ def create_file_by_media_stream(
         name=name,
     )
 
+    # 2. DB 에 파일 정보 저장, Project 에 media 할당
+    return register_media(
+        db,
+        project_id,
+        bucket=uploaded.bucket,
+        object_name=uploaded.object_name,
+        size=uploaded.size,
+        name=uploaded.name,
+        content_type=uploaded.content_type,
+        content_hash=uploaded.sha256,
+        delete_date=delete_date,
+    )
+
+async def create_media_by_body_stream(
+    db: Session,
+    project_id: str,
+    chunks: AsyncIterable[bytes],
+    *,
+    content_type: str,
+    name: str,
+    sha256: Optional[str] = None,
+    size: Optional[int] = None,
+) -> Optional[Media]:
+    """요청 본문을 받는 대로 part 단위로 올린다. 디스크에 임시 파일을 만들지 않는다.
+
+    sha256 을 주고 같은 내용이 이미 있으면 본문을 읽지 않고 그 오브젝트로 등록한다.
+    (Expect: 100-continue 로 보낸 클라이언트는 본문을 보내지 않는다.)
+    올린 내용의 해시는 서버가 스트림에서 다시 계산한 값을 쓴다.
+    """
+    if not await asyncio.to_thread(ProjectModelRepository(db).exists, project_id):
+        return None
+    if sha256 is not None:
+        media = await asyncio.to_thread(
+            register_existing_content, db, project_id, sha256, size=size, name=name, content_type=content_type
+        )
+        if media is not None:
+            return media
+
+    uploaded = await upload_media_stream_async(chunks, content_type=content_type, name=name)
+    return await asyncio.to_thread(
+        register_media,
+        db,
+        project_id,
+        bucket=uploaded.bucket,
+        object_name=uploaded.object_name,
+        size=uploaded.size,
+        name=uploaded.name,
+        content_type=uploaded.content_type,
+        content_hash=uploaded.sha256,
+    )
+
+def register_media(
+    db: Session,
+    project_id: str,
+    *,
+    bucket: str,
+    object_name: str,
+    size: int,
+    name: str,
+    content_type: str,
+    content_hash: Optional[str] = None,
+    delete_date=None,
+) -> Optional[Media]:
+    """이미 저장소에 올라간 오브젝트를 파일로 등록하고 프로젝트 media 에 추가한다.
+
+    content_hash 가 있으면 같은 내용의 오브젝트를 찾아 그것을 가리키게 하고, 방금 올린 오브젝트는 지운다.
+    """
+    project_repo = ProjectModelRepository(db)
+    if not project_repo.exists(project_id):
+        return None
+
+    # 1. 같은 내용이 이미 있으면 그 오브젝트를 쓴다. (참조 수는 파일 행과 같이 커밋된다.)
+    duplicate = None
+    if content_hash:
+        uploaded_at = (bucket, object_name)
+        bucket, object_name, created = FileContentRepository(db).acquire(content_hash, bucket, object_name, size)
+        if not created:
+            duplicate = uploaded_at
+
+    media = _attach_file(
+        db,
+        project_id,
+        bucket=bucket,
+        object_name=object_name,
+        size=size,
+        name=name,
+        content_type=content_type,
+        content_hash=content_hash,
+        delete_date=delete_date,
+    )
+    if duplicate:
+        delete_objects(duplicate[0], [duplicate[1]])
+    return media
+
+def register_existing_content(
+    db: Session,
+    project_id: str,
+    content_hash: str,
+    *,
+    size: Optional[int],
+    name: str,
+    content_type: str,
+) -> Optional[Media]:
+    """같은 내용이 이미 저장소에 있으면 올리지 않고 그 오브젝트를 가리키는 Media 를 만든다. 없으면 None.
+
+    클라이언트가 보낸 해시만 보고 내용은 받지 않는다. 이 서버는 사용자를 구분하지 않아서
+    해시로 얻을 수 있는 오브젝트는 이미 프로젝트 media URL 로 누구나 읽을 수 있다.
+    인덱스에 들어가는 해시는 모두 서버가 내용에서 계산하거나 검증한 값이다.
+    """
+    if not ProjectModelRepository(db).exists(project_id):
+        return None
+    location = FileContentRepository(db).acquire_existing(content_hash, size)
+    if location is None:
+        db.rollback()
+        return None
+    bucket, object_name, size = location
+    return _attach_file(
+        db,
+        project_id,
+        bucket=bucket,
+        object_name=object_name,
+        size=size,
+        name=name,
+        content_type=content_type,
+        content_hash=content_hash,
+    )
+
+def _attach_file(
+    db: Session,
+    project_id: str,
+    *,
+    bucket: str,
+    object_name: str,
+    size: int,
+    name: str,
+    content_type: str,
+    content_hash: Optional[str] = None,
+    delete_date=None,
+) -> Optional[Media]:
+    """files 행을 만들고 프로젝트 media 에 추가한다. 참조 수는 files 행과 같이 커밋된다. 프로젝트가 없으면 None."""
+    project_repo = ProjectModelRepository(db)
+
     # 2. DB에 파일 정보 저장
     file_id = str(uuid.uuid4())
     file_repo = FileRepository(db)
     file = file_repo.create(
         id=file_id,
         project_id=project_id,
-        bucket_name=uploaded.bucket,
-        object_name=uploaded.object_name,
-        size=uploaded.size,
-        name=uploaded.name,
+        bucket_name=bucket,
+        object_name=object_name,
+        size=size,
+        name=name,
+        content_type=content_type,
         delete_date=delete_date,
+        content_hash=content_hash,
     )
 
     # 3. Project에 media 할당
     media_id = str(uuid.uuid4())
-    project_repo = ProjectModelRepository(db)
-    project_model = project_repo.get(project_id)
-    if not project_model:
-        return None
-    project_body: Project = project_model.body
     media = Media(
         id=media_id,
         name=file.name,
-        content_type=file.content_type or uploaded.content_type,
+        content_type=file.content_type or content_type,
         size=file.size,
         file_id=file_id,
     )
 
-    project_body.media.append(media)
-    project_repo.update(project_id, body=project_body)
+    if not project_repo.add_media(project_id, media):
+        # 프로젝트가 지워졌다. 아무도 가리키지 않는 파일은 GC 가 오브젝트와 같이 지우게 한다.
+        file_repo.update(file_id, delete_date=date.today())
+        return None
     return media
 
 def get_all_media(db: Session, project_id: str) -> Optional[list[Media]]:
@@ -63,18 +221,16 @@ def get_all_media(db: Session, project_id: str) -> Optional[list[Media]]:
     return project_body.media
 
 
-def get_all_url_map(db: Session, project_id: str) -> Optional[dict[str, str]]:
-    project_repo = ProjectModelRepository(db)
-    project_model = project_repo.get(project_id)
+async def get_all_url_map(db: AsyncSession, project_id: str) -> Optional[dict[str, str]]:
+    # 행은 run_sync 로 읽고, 서명과 Redis 캐시는 스레드에서 한다.
+    project_model = await AsyncRepository(db, ProjectModelRepository).get(project_id)
     if not project_model:
         return None
     project_body: Project = project_model.body
-    url_map: dict[str, str] = {}
-
-    for media in project_body.media:
-        file_id = media.file_id
-        url = get_file_url_by_id(db, file_id)
-        if url:
-            url_map[media.id] = url
-
-    return url_map
\ No newline at end of file
+    files = await AsyncRepository(db, FileRepository).get_many([media.file_id for media in project_body.media])
+    file_urls = await asyncio.to_thread(sign_file_urls, list(files.values()))
+    return {
+        media.id: file_urls[media.file_id]
+        for media in project_body.media
+        if media.file_id in file_urls
+    }
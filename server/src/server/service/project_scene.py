@@ -1,140 +1,47 @@
-from server.repositories import ProjectModelRepository
-from sqlalchemy.orm import Session
+from server.common.retry import retry_on_conflict
+from server.repositories import AsyncRepository, SceneRepository
+from sqlalchemy.ext.asyncio import AsyncSession
 import uuid
-from typing import List, Optional
+from typing import Optional
 from .project_types import Scene
 
-async def resize_scene(db: Session, project_id: str, scene_id: str, new_interval_count: int) -> bool:
-    project_repo = ProjectModelRepository(db)
-    project_model = project_repo.get(project_id)
-    if not project_model:
-        return False
-
-    project_body = project_model.body
-    for scene in project_body.scenes:
-        if scene.scene_id == scene_id:
-            scene.interval_count = new_interval_count
-            break
-    else:
-        return False
-
-    project_repo.update(project_id, body=project_body)
-
-    return True
-
-async def delete_scene(db: Session, project_id: str, scene_id: str) -> Optional[List[Scene]]:
-    project_repo = ProjectModelRepository(db)
-    project_model = project_repo.get(project_id)
-    if not project_model:
-        return None
-    
-    project_body = project_model.body
-    for index, scene in enumerate(project_body.scenes):
-        if scene.scene_id == scene_id:
-            del project_body.scenes[index]
-            project_repo.update(project_id, body=project_body)
-            return project_body.scenes
-
-    return None
-
-async def swap_scene(db: Session, project_id: str, id_1: str, id_2: str) -> Optional[List[Scene]]:
-    project_repo = ProjectModelRepository(db)
-    project_model = project_repo.get(project_id)
-    if not project_model:
-        return None
+# 씬은 scenes 테이블에 순서 키와 함께 한 행씩 있다. 끼워 넣기, 지우기, 맞바꾸기는 해당 행만 쓴다.
+# 같은 자리에 동시에 끼워 넣거나 맞바꾸다 충돌하면 다시 읽어서 몇 번 더 해 본다.
 
-    project_body = project_model.body
-    index_1, index_2 = -1, -1
-    for index, scene in enumerate(project_body.scenes):
-        if scene.scene_id == id_1:
-            index_1 = index
-        elif scene.scene_id == id_2:
-            index_2 = index
-
-    if index_1 == -1 or index_2 == -1:
-        return None
-
-    project_body.scenes[index_1], project_body.scenes[index_2] = (
-        project_body.scenes[index_2],
-        project_body.scenes[index_1],
-    )
-
-    project_repo.update(project_id, body=project_body)
-
-    return project_body.scenes
-
-async def create_scene(db: Session, project_id: str) -> Optional[Scene]:
-    project_repo = ProjectModelRepository(db)
-    project_model = project_repo.get(project_id)
-    if not project_model:
-        return None
-
-    scene_id = str(uuid.uuid4())
-    new_scene = Scene(
-        scene_id=scene_id,
+def _new_scene(project_id: str) -> Scene:
+    return Scene(
+        scene_id=str(uuid.uuid4()),
         project_id=project_id,
         media_id=None,
         interval_count=0,
         media=None,
     )
 
-    project_body = project_model.body
-    project_body.scenes.append(new_scene)
-
-    project_repo.update(project_id, body=project_body)
+async def resize_scene(db: AsyncSession, project_id: str, scene_id: str, new_interval_count: int) -> bool:
+    return await AsyncRepository(db, SceneRepository).update(project_id, scene_id, interval_count=new_interval_count)
 
-    return new_scene
-
-async def create_scene_next_to(db: Session, project_id: str, next_scene_id: str) -> Optional[Scene]:
-    project_repo = ProjectModelRepository(db)
-    project_model = project_repo.get(project_id)
-    if not project_model:
-        return None
+async def delete_scene(db: AsyncSession, project_id: str, scene_id: str) -> bool:
+    return await AsyncRepository(db, SceneRepository).delete(project_id, scene_id)
 
-    scene_id = str(uuid.uuid4())
-    new_scene = Scene(
-        scene_id=scene_id,
-        project_id=project_id,
-        media_id=None,
-        interval_count=0,
-        media=None,
-    )
+async def swap_scene(db: AsyncSession, project_id: str, id_1: str, id_2: str) -> bool:
+    if id_1 == id_2:
+        return False
+    return await retry_on_conflict(db, lambda: AsyncRepository(db, SceneRepository).swap(project_id, id_1, id_2))
 
-    project_body = project_model.body
-    for index, scene in enumerate(project_body.scenes):
-        if scene.scene_id == next_scene_id:
-            project_body.scenes.insert(index+1, new_scene)
-            break
-    else:
+async def create_scene(db: AsyncSession, project_id: str) -> Optional[Scene]:
+    new_scene = _new_scene(project_id)
+    if not await retry_on_conflict(db, lambda: AsyncRepository(db, SceneRepository).add(project_id, new_scene)):
         return None
-
-    project_repo.update(project_id, body=project_body)
-
     return new_scene
 
-async def create_scene_prev_to(db: Session, project_id: str, prev_scene_id: str) -> Optional[Scene]:
-    project_repo = ProjectModelRepository(db)
-    project_model = project_repo.get(project_id)
-    if not project_model:
+async def create_scene_next_to(db: AsyncSession, project_id: str, next_scene_id: str) -> Optional[Scene]:
+    new_scene = _new_scene(project_id)
+    if not await retry_on_conflict(db, lambda: AsyncRepository(db, SceneRepository).add(project_id, new_scene, after=next_scene_id)):
         return None
+    return new_scene
 
-    scene_id = str(uuid.uuid4())
-    new_scene = Scene(
-        scene_id=scene_id,
-        project_id=project_id,
-        media_id=None,
-        interval_count=0,
-        media=None,
-    )
-
-    project_body = project_model.body
-    for index, scene in enumerate(project_body.scenes):
-        if scene.scene_id == prev_scene_id:
-            project_body.scenes.insert(index, new_scene)
-            break
-    else:
+async def create_scene_prev_to(db: AsyncSession, project_id: str, prev_scene_id: str) -> Optional[Scene]:
+    new_scene = _new_scene(project_id)
+    if not await retry_on_conflict(db, lambda: AsyncRepository(db, SceneRepository).add(project_id, new_scene, before=prev_scene_id)):
         return None
-
-    project_repo.update(project_id, body=project_body)
-
     return new_scene
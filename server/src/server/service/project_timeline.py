@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from typing import Iterator, Union
+from server.audio import mp3
+from .project_types import Project, Section, SpeechSection, BlankSection, Word
+
+# 합성한 오디오가 하나도 없을 때 쓰는 형식 (Google TTS MP3 출력과 같다)
+DEFAULT_FORMAT = mp3.build_header(version=2, bitrate=32, sample_rate=24000, channel_mode=3)
+
+
+@dataclass(frozen=True)
+class SectionTiming:
+    """프로젝트 전체 오디오 안에서 섹션의 위치 (초).
+
+    - silence_frames: 섹션 앞(발화 섹션의 delay) 또는 섹션 전체(빈 섹션)를 채우는 무음 프레임 수
+    - speech_start: 발화가 시작하는 시각. 어절 시각은 여기에 Word.start 를 더한다.
+    """
+    section: Union[SpeechSection, BlankSection, Section]
+    start: float
+    duration: float
+    silence_frames: int
+    speech_start: float
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+    @property
+    def has_audio(self) -> bool:
+        section = self.section
+        return isinstance(section, SpeechSection) and section.is_generated and section.file_id is not None
+
+
+def audio_format(project: Project) -> mp3.FrameHeader:
+    """무음 프레임을 만들 때 쓸 헤더. 합성한 섹션과 같은 샘플레이트/채널이어야 이어 붙일 수 있다."""
+    for section in project.sections:
+        if isinstance(section, SpeechSection) and section.is_generated and section.audio and section.audio.sample_rate:
+            return mp3.header_for(section.audio.sample_rate, section.audio.channels)
+    return DEFAULT_FORMAT
+
+
+def iter_section_timings(project: Project, header: mp3.FrameHeader | None = None) -> Iterator[SectionTiming]:
+    """섹션마다 시작 시각과 길이를 계산한다.
+
+    합성할 때 저장해 둔 메타데이터만 쓰고, 저장소의 MP3 는 읽지 않는다.
+    무음은 프레임 단위로 맞추므로 이어 붙인 MP3 의 실제 시각과 같다.
+    오디오를 만들지 않은 발화 섹션은 길이 0 으로 본다.
+    """
+    header = header or audio_format(project)
+    start = 0.0
+    for section in project.sections:
+        if isinstance(section, SpeechSection):
+            if section.is_generated and section.file_id:
+                silence_frames = mp3.frames_for(section.delay, header)
+                speech = section.audio.duration if section.audio else section.duration
+            else:
+                silence_frames, speech = 0, 0.0
+        else:
+            silence_frames = mp3.frames_for(section.duration, header)
+            speech = 0.0
+
+        silence = silence_frames * header.duration
+        yield SectionTiming(
+            section=section,
+            start=start,
+            duration=silence + speech,
+            silence_frames=silence_frames,
+            speech_start=start + silence,
+        )
+        start += silence + speech
+
+
+def iter_word_timings(project: Project) -> Iterator[tuple[float, Word]]:
+    """(프로젝트 기준 시작 시각, 어절) 을 순서대로 돌려준다."""
+    for timing in iter_section_timings(project):
+        if not timing.has_audio:
+            continue
+        for interval in timing.section.intervals:
+            for word in interval.words:
+                yield timing.speech_start + word.start, word
+
+
+def project_duration(project: Project) -> float:
+    return sum(timing.duration for timing in iter_section_timings(project))
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Union
 from enum import Enum
 
 class SectionType(str, Enum):
@@ -12,19 +12,57 @@ class Word(BaseModel):
     is_caption_split: bool
     start: float
 
+class IntervalAudio(BaseModel):
+    """마지막으로 합성한 구간 오디오의 위치.
+
+    - fingerprint: 합성에 쓴 어절과 음성의 해시
+    - offset / duration: 섹션 오디오 안에서의 시작 시각과 길이 (초)
+    - byte_offset / byte_length: 섹션 MP3 안에서 이 구간 프레임의 위치
+    """
+    fingerprint: str
+    offset: float
+    duration: float
+    byte_offset: int
+    byte_length: int
+    frame_count: int = 0
+    encoder_delay: int = 0
+    encoder_padding: int = 0
+
 class Interval(BaseModel):
     id: str
     words: List[Word]
+    audio: Optional[IntervalAudio] = None
+
+class AudioInfo(BaseModel):
+    """합성할 때 계산해 둔 섹션 MP3 정보. 길이를 알려고 오브젝트를 다시 받을 필요가 없다.
+
+    - duration: 프레임 기준 길이 (초). Section.duration 과 같다.
+    - data_size: 프레임들의 바이트 수 (섹션 MP3 는 파일 단위 헤더 없이 프레임만 담는다)
+    - encoder_delay / encoder_padding: 앞뒤 여분 샘플 수
+    """
+    duration: float
+    frame_count: int
+    sample_rate: int
+    channels: int
+    data_size: int
+    encoder_delay: int = 0
+    encoder_padding: int = 0
 
 class Section(BaseModel):
     id: str
     duration: float
     type: SectionType 
+    # 읽을 때의 섹션 버전. 값이 있는 채로 저장하면 그 사이 다른 요청이 섹션을 바꿨을 때 ConflictError 가 난다.
+    version: Optional[int] = None
 
 class SpeechSection(Section):
     type: SectionType = SectionType.speech
     is_generated: bool
     intervals: List[Interval]
+    voice_name: Optional[str] = None
+    file_id: Optional[str] = None
+    audio: Optional[AudioInfo] = None
+    delay: float = 0.0  # 발화 앞에 넣을 무음 (초)
 
 class BlankSection(Section):
     type: SectionType = SectionType.blank
@@ -46,6 +84,6 @@ class Scene(BaseModel):
 class Project(BaseModel):
     id: str
     title: str
-    sections: List[Section]
+    sections: List[Union[SpeechSection, BlankSection, Section]]
     scenes: List[Scene]
     media: List[Media]
@@ -0,0 +1,165 @@
+from server.audio import mp3
+from server.common.exception import ConflictError
+from server.common.retry import retry_on_conflict
+from server.repositories import FileRepository, SectionRepository
+from server.service.file import create_audio_file_by_bytes
+from server.storage.storage_client import map_object
+from server.tts.tts import Word as TtsWord, get_settings as get_tts_settings, synthesize_words_to_mp3_async
+from sqlalchemy.orm import Session
+from contextlib import ExitStack
+from datetime import date
+from typing import Optional
+import asyncio
+import hashlib
+import json
+import uuid
+from .project_types import AudioInfo, Interval, IntervalAudio, SpeechSection
+
+
+def interval_fingerprint(interval: Interval, voice_name: str) -> str:
+    """구간 오디오를 결정하는 값(읽는 어절과 음성)의 해시."""
+    payload = json.dumps(
+        {"voice": voice_name, "words": [w.text for w in interval.words]},
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _open_section_audio(stack: ExitStack, db: Session, section: SpeechSection):
+    """이전 섹션 MP3 를 슬라이스할 수 있게 열어 stack 에 건다. 로컬 저장소면 mmap 이라 재사용하는 구간만 읽는다.
+
+    파일 행 조회와 저장소 읽기가 모두 blocking 이므로 통째로 스레드에서 부른다.
+    """
+    if not section.file_id:
+        return None
+    file = FileRepository(db).get(section.file_id)
+    if not file:
+        return None
+    return stack.enter_context(map_object(file.bucket, file.object_name))
+
+
+async def _synthesize_interval(interval: Interval, voice_name: str) -> tuple[bytes, list[float], mp3.Mp3Info]:
+    """구간 하나를 합성해서 (헤더 없는 MP3 프레임, 구간 안에서의 어절 시작 시각, MP3 정보) 를 돌려준다."""
+    if not interval.words:
+        return b"", [], mp3.analyze(b"")
+
+    words = [
+        TtsWord(text=w.text, displayed_text=w.displayed_text, is_caption_splitted=w.is_caption_split, start=0.0)
+        for w in interval.words
+    ]
+    result = await synthesize_words_to_mp3_async(words, voice_name)
+    # 길이와 인코더 delay/padding 은 원본(헤더 포함)에서 읽는다.
+    info = await asyncio.to_thread(mp3.analyze, result["audio_content"])
+    frames = await asyncio.to_thread(mp3.strip_headers, result["audio_content"])
+    return frames, [w.start for w in result["words"]], info
+
+
+async def generate_speech_section_audio(db: Session, project_id: str, section_id: str) -> Optional[SpeechSection]:
+    """섹션 오디오를 다시 만든다.
+
+    구간마다 fingerprint 를 비교해서 바뀐 구간만 합성하고, 나머지는 기존 섹션 MP3 에서
+    해당 프레임을 잘라 재사용한다. 구간들을 이어 붙인 뒤 Word.start 를 섹션 기준으로 다시 계산한다.
+    합성하는 동안 섹션이 바뀌었으면 새 내용으로 다시 만든다. 이미 합성한 구간은 재사용되므로 싸다.
+    """
+    return await retry_on_conflict(db, lambda: _generate_speech_section_audio(db, project_id, section_id))
+
+
+async def _generate_speech_section_audio(db: Session, project_id: str, section_id: str) -> Optional[SpeechSection]:
+    section = SectionRepository(db).get(project_id, section_id)
+    if not isinstance(section, SpeechSection):
+        return None
+
+    voice_name = section.voice_name or get_tts_settings().tts_voice_name
+    fingerprints = [interval_fingerprint(interval, voice_name) for interval in section.intervals]
+
+    reusable = [
+        section.is_generated and interval.audio is not None and interval.audio.fingerprint == fingerprint
+        for interval, fingerprint in zip(section.intervals, fingerprints)
+    ]
+    with ExitStack() as stack:
+        previous_audio = None
+        if any(reusable):
+            previous_audio = await asyncio.to_thread(_open_section_audio, stack, db, section)
+            if previous_audio is None:
+                reusable = [False] * len(section.intervals)
+
+        # 바뀐 구간만 동시에 합성한다.
+        changed = [i for i, reuse in enumerate(reusable) if not reuse]
+        synthesized = dict(zip(
+            changed,
+            await asyncio.gather(*(_synthesize_interval(section.intervals[i], voice_name) for i in changed)),
+        ))
+
+        parts: list[bytes] = []
+        offset = 0.0
+        byte_offset = 0
+        for i, (interval, fingerprint) in enumerate(zip(section.intervals, fingerprints)):
+            if reusable[i]:
+                old = interval.audio
+                frames = previous_audio[old.byte_offset:old.byte_offset + old.byte_length]
+                starts = [w.start - old.offset for w in interval.words]
+                duration = old.duration
+                frame_count, encoder_delay, encoder_padding = old.frame_count, old.encoder_delay, old.encoder_padding
+            else:
+                frames, starts, info = synthesized[i]
+                duration = info.duration
+                frame_count, encoder_delay, encoder_padding = info.frame_count, info.encoder_delay, info.encoder_padding
+
+            for word, start in zip(interval.words, starts):
+                word.start = offset + start
+            interval.audio = IntervalAudio(
+                fingerprint=fingerprint,
+                offset=offset,
+                duration=duration,
+                byte_offset=byte_offset,
+                byte_length=len(frames),
+                frame_count=frame_count,
+                encoder_delay=encoder_delay,
+                encoder_padding=encoder_padding,
+            )
+
+            parts.append(frames)
+            offset += duration
+            byte_offset += len(frames)
+
+        section_audio = b"".join(parts)
+
+    first_frame = next(mp3.iter_frames(section_audio), None)
+    voiced = [interval.audio for interval in section.intervals if interval.audio.frame_count]
+
+    # 섹션 오디오는 매번 새 오브젝트로 올리고, 섹션을 바꾼 뒤 이전 파일은 삭제 예정으로 표시한다.
+    file = await asyncio.to_thread(
+        create_audio_file_by_bytes,
+        section_audio,
+        object_name=f"tts/{section.id}/{uuid.uuid4().hex}.mp3",
+        db=db,
+        project_id=project_id,
+    )
+    previous_file_id = section.file_id
+
+    section.file_id = file.id
+    section.duration = offset
+    section.audio = AudioInfo(
+        duration=offset,
+        frame_count=sum(interval.audio.frame_count for interval in section.intervals),
+        sample_rate=first_frame[1].sample_rate if first_frame else 0,
+        channels=first_frame[1].channels if first_frame else 0,
+        data_size=len(section_audio),
+        encoder_delay=voiced[0].encoder_delay if voiced else 0,
+        encoder_padding=voiced[-1].encoder_padding if voiced else 0,
+    )
+    section.is_generated = True
+
+    # 이 섹션만, 읽은 버전 그대로일 때만 바꾼다. 합성하는 동안 바뀐 내용을 덮어쓰지 않는다.
+    try:
+        replaced = SectionRepository(db).replace(project_id, section)
+    except ConflictError:
+        FileRepository(db).update(file.id, delete_date=date.today())
+        raise
+    if not replaced:
+        # 그 사이 섹션이 지워졌다.
+        FileRepository(db).update(file.id, delete_date=date.today())
+        return None
+    if previous_file_id:
+        FileRepository(db).update(previous_file_id, delete_date=date.today())
+    return section
@@ -0,0 +1,30 @@
+from functools import lru_cache
+
+from ..settings import StorageSettings
+from .base import ObjectInfo, StorageBackend
+
+
+@lru_cache
+def get_backend() -> StorageBackend:
+    """STORAGE_BACKEND 설정("s3" | "local")에 맞는 저장소. 프로세스마다 하나."""
+
+    settings = StorageSettings()
+
+    if settings.storage_backend == "s3":
+        from .s3 import S3StorageBackend
+
+        return S3StorageBackend(settings)
+
+    if settings.storage_backend == "local":
+        from .local import LocalStorageBackend
+
+        if not settings.storage_signing_key:
+            raise ValueError("STORAGE_SIGNING_KEY is required for the local storage backend")
+        return LocalStorageBackend(
+            settings.storage_local_root,
+            signing_key=settings.storage_signing_key,
+            public_url=settings.storage_public_url,
+            buckets=(settings.media_bucket, settings.voice_bucket),
+        )
+
+    raise ValueError(f"unknown storage backend: {settings.storage_backend}")
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterable, Iterable, Iterator, Optional, Protocol
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    """오브젝트 크기와 ETag. ETag 는 내용이 바뀌면 달라진다."""
+    size: int
+    etag: str
+
+
+class StorageBackend(Protocol):
+    """storage_client 함수들 뒤에서 실제로 오브젝트를 저장하는 곳.
+
+    bucket 과 object_name 은 S3 와 같은 의미로 쓰고, 어떤 구현이든 FileModel 에 저장한 값 그대로 읽을 수 있어야 한다.
+    upload_stream 계열은 (크기, sha256) 을 돌려준다.
+    """
+
+    name: str
+
+    def provision_all(self) -> None: ...
+
+    def put_bytes(self, bucket: str, object_name: str, content: bytes, content_type: str) -> None: ...
+
+    def upload_stream(
+        self, chunks: Iterable[bytes], bucket: str, object_name: str, content_type: str
+    ) -> tuple[int, str]: ...
+
+    async def upload_stream_async(
+        self, chunks: AsyncIterable[bytes], bucket: str, object_name: str, content_type: str
+    ) -> tuple[int, str]: ...
+
+    def read_bytes(self, bucket: str, object_name: str) -> Optional[bytes]: ...
+
+    def iter_chunks(self, bucket: str, object_name: str, chunk_size: int) -> Iterator[bytes]: ...
+
+    def head(self, bucket: str, object_name: str) -> Optional[ObjectInfo]: ...
+
+    def local_path(self, bucket: str, object_name: str) -> Optional[Path]:
+        """오브젝트가 이 머신의 파일이면 그 경로. mmap 이나 sendfile 로 바로 읽을 수 있다."""
+        ...
+
+    def delete_objects(self, bucket: str, object_names: list[str]) -> None: ...
+
+    def signed_url(
+        self, bucket: str, object_name: str, *, content_type: str, filename: str, expires_seconds: int
+    ) -> str: ...
+
+    def create_multipart_upload(self, bucket: str, object_name: str, content_type: str) -> str: ...
+
+    def upload_part_urls(
+        self, bucket: str, object_name: str, upload_id: str, part_numbers: Iterable[int], expires_seconds: int
+    ) -> dict[int, str]: ...
+
+    def complete_multipart_upload(
+        self, bucket: str, object_name: str, upload_id: str, parts: list[tuple[int, str]]
+    ) -> int: ...
+
+    def abort_multipart_upload(self, bucket: str, object_name: str, upload_id: str) -> None: ...
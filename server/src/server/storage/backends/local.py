@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import AsyncIterable, BinaryIO, Iterable, Iterator, Optional
+from urllib.parse import quote, urlencode
+
+from server.common.exception import InvalidInputError, NotFoundError
+
+from .. import signing
+from .base import ObjectInfo
+
+# 루트 아래 예약 디렉터리. 버킷 이름은 "." 으로 시작할 수 없다.
+_TMP_DIR = ".tmp"
+_UPLOADS_DIR = ".uploads"
+_COPY_BUFFER = 1024 * 1024
+
+
+class LocalStorageBackend:
+    """로컬 디스크에 {root}/{bucket}/{object_name} 으로 저장한다.
+
+    - 쓰기는 같은 파일시스템의 임시 파일에 쓴 뒤 os.replace 로 바꾸므로, 읽는 쪽은 쓰다 만 파일을 보지 않는다.
+    - 다운로드/업로드 URL 은 API 서버(/storage/...)를 가리키고, signing_key 로 만든 HMAC 서명과 만료 시각을 붙인다.
+    - 브라우저 multipart 업로드는 part 를 .uploads/{upload_id}/ 에 따로 두었다가 완료할 때 이어 붙인다.
+    """
+
+    name = "local"
+
+    def __init__(self, root: str, *, signing_key: str, public_url: str = "", buckets: Iterable[str] = ()):
+        self.root = Path(root).resolve()
+        self.signing_key = signing_key
+        self.public_url = public_url.rstrip("/")
+        self.buckets = list(buckets)
+
+    def _bucket_dir(self, bucket: str) -> Path:
+        if not bucket or bucket.startswith(".") or "/" in bucket or "\\" in bucket:
+            raise InvalidInputError(f"invalid bucket: {bucket}")
+        return self.root / bucket
+
+    def path(self, bucket: str, object_name: str) -> Path:
+        bucket_dir = self._bucket_dir(bucket)
+        path = (bucket_dir / object_name).resolve()
+        if not path.is_relative_to(bucket_dir) or path == bucket_dir:
+            raise InvalidInputError(f"invalid object name: {object_name}")
+        return path
+
+    @contextmanager
+    def _atomic_write(self, path: Path) -> Iterator[BinaryIO]:
+        tmp_dir = self.root / _TMP_DIR
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                yield f
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def provision_all(self) -> None:
+        for bucket in self.buckets:
+            self._bucket_dir(bucket).mkdir(parents=True, exist_ok=True)
+
+    def put_bytes(self, bucket: str, object_name: str, content: bytes, content_type: str) -> None:
+        with self._atomic_write(self.path(bucket, object_name)) as f:
+            f.write(content)
+
+    def upload_stream(
+        self, chunks: Iterable[bytes], bucket: str, object_name: str, content_type: str
+    ) -> tuple[int, str]:
+        size = 0
+        digest = hashlib.sha256()
+        with self._atomic_write(self.path(bucket, object_name)) as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+                digest.update(chunk)
+        return size, digest.hexdigest()
+
+    async def upload_stream_async(
+        self, chunks: AsyncIterable[bytes], bucket: str, object_name: str, content_type: str
+    ) -> tuple[int, str]:
+        size = 0
+        digest = hashlib.sha256()
+        with self._atomic_write(self.path(bucket, object_name)) as f:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+                size += len(chunk)
+                digest.update(chunk)
+        return size, digest.hexdigest()
+
+    def read_bytes(self, bucket: str, object_name: str) -> Optional[bytes]:
+        try:
+            return self.path(bucket, object_name).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def iter_chunks(self, bucket: str, object_name: str, chunk_size: int) -> Iterator[bytes]:
+        with open(self.path(bucket, object_name), "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def head(self, bucket: str, object_name: str) -> Optional[ObjectInfo]:
+        try:
+            stat = self.path(bucket, object_name).stat()
+        except FileNotFoundError:
+            return None
+        # 파일은 통째로 바뀌기만 하므로 (mtime, 크기) 가 바뀌면 내용도 바뀐 것이다.
+        return ObjectInfo(size=stat.st_size, etag=f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+
+    def local_path(self, bucket: str, object_name: str) -> Optional[Path]:
+        path = self.path(bucket, object_name)
+        return path if path.is_file() else None
+
+    def delete_objects(self, bucket: str, object_names: list[str]) -> None:
+        for object_name in object_names:
+            self.path(bucket, object_name).unlink(missing_ok=True)
+
+    def _url(self, bucket: str, object_name: str, method: str, expires_seconds: int, **params: str) -> str:
+        expires = int(time.time()) + expires_seconds
+        signature = signing.sign(self.signing_key, method, bucket, object_name, expires, **params)
+        query = urlencode({**params, "expires": expires, "signature": signature})
+        return f"{self.public_url}/storage/{quote(bucket)}/{quote(object_name)}?{query}"
+
+    def verify(self, signature: str, method: str, bucket: str, object_name: str, expires: int, **params: str) -> bool:
+        return signing.verify(self.signing_key, signature, method, bucket, object_name, expires, **params)
+
+    def signed_url(
+        self, bucket: str, object_name: str, *, content_type: str, filename: str, expires_seconds: int
+    ) -> str:
+        return self._url(
+            bucket, object_name, "GET", expires_seconds, content_type=content_type, filename=filename
+        )
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        if not upload_id.isalnum():
+            raise NotFoundError("upload not found")
+        return self.root / _UPLOADS_DIR / upload_id
+
+    def _check_upload(self, bucket: str, object_name: str, upload_id: str) -> Path:
+        upload_dir = self._upload_dir(upload_id)
+        try:
+            meta = json.loads((upload_dir / "upload.json").read_text())
+        except FileNotFoundError:
+            raise NotFoundError("upload not found")
+        if meta != {"bucket": bucket, "object_name": object_name}:
+            raise NotFoundError("upload not found")
+        return upload_dir
+
+    def create_multipart_upload(self, bucket: str, object_name: str, content_type: str) -> str:
+        self.path(bucket, object_name)
+        upload_id = uuid.uuid4().hex
+        upload_dir = self._upload_dir(upload_id)
+        upload_dir.mkdir(parents=True)
+        (upload_dir / "upload.json").write_text(json.dumps({"bucket": bucket, "object_name": object_name}))
+        return upload_id
+
+    def upload_part_urls(
+        self, bucket: str, object_name: str, upload_id: str, part_numbers: Iterable[int], expires_seconds: int
+    ) -> dict[int, str]:
+        return {
+            part_number: self._url(
+                bucket, object_name, "PUT", expires_seconds, uploadId=upload_id, partNumber=str(part_number)
+            )
+            for part_number in part_numbers
+        }
+
+    async def write_part(
+        self, bucket: str, object_name: str, upload_id: str, part_number: int, chunks: AsyncIterable[bytes]
+    ) -> str:
+        """part 하나를 받아 저장하고 ETag(MD5) 를 돌려준다. 같은 번호로 다시 올리면 덮어쓴다."""
+        upload_dir = self._check_upload(bucket, object_name, upload_id)
+        digest = hashlib.md5()
+        with self._atomic_write(upload_dir / f"{part_number:05d}") as f:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()}"'
+        (upload_dir / f"{part_number:05d}.etag").write_text(etag)
+        return etag
+
+    def complete_multipart_upload(
+        self, bucket: str, object_name: str, upload_id: str, parts: list[tuple[int, str]]
+    ) -> int:
+        upload_dir = self._check_upload(bucket, object_name, upload_id)
+        part_paths = []
+        for number, etag in sorted(parts):
+            part = upload_dir / f"{number:05d}"
+            try:
+                stored = (upload_dir / f"{number:05d}.etag").read_text()
+            except FileNotFoundError:
+                raise InvalidInputError(f"part {number} was not uploaded")
+            if stored.strip('"') != etag.strip('"'):
+                raise InvalidInputError(f"part {number} etag mismatch")
+            part_paths.append(part)
+
+        size = 0
+        with self._atomic_write(self.path(bucket, object_name)) as out:
+            for part in part_paths:
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out, _COPY_BUFFER)
+                size += part.stat().st_size
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        return size
+
+    def abort_multipart_upload(self, bucket: str, object_name: str, upload_id: str) -> None:
+        try:
+            upload_dir = self._check_upload(bucket, object_name, upload_id)
+        except NotFoundError:
+            return
+        shutil.rmtree(upload_dir, ignore_errors=True)
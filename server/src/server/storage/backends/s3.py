@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import io
+import itertools
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from server.common.exception import InvalidInputError, NotFoundError
+
+from ..buckets import get_bucket_registry
+from ..settings import StorageSettings
+from .base import ObjectInfo
+
+
+def _iter_parts(chunks: Iterable[bytes], part_size: int) -> Iterator[bytes]:
+    """조각들을 part_size 크기의 part 로 다시 묶는다. 마지막 part 만 작을 수 있다."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _aiter_parts(chunks: AsyncIterable[bytes], part_size: int) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def _is_missing_key(error: ClientError) -> bool:
+    return error.response["Error"]["Code"] in ("NoSuchKey", "404")
+
+
+# multipart 업로드를 마칠 때 클라이언트가 보낸 part 목록이 잘못된 경우
+_INVALID_PART_CODES = ("InvalidPart", "InvalidPartOrder", "EntityTooSmall")
+
+
+class S3StorageBackend:
+    """boto3 로 S3 호환 저장소(MinIO 포함)에 올린다. 버킷은 BucketRegistry 가 한 번만 준비한다."""
+
+    name = "s3"
+
+    def __init__(self, settings: StorageSettings):
+        self.settings = settings
+        self.s3 = boto3.client(
+            "s3",
+            endpoint_url=settings.s3_endpoint_url,
+            aws_access_key_id=settings.aws_access_key_id,
+            aws_secret_access_key=settings.aws_secret_access_key,
+            region_name=settings.aws_default_region,
+        )
+        self.buckets = get_bucket_registry()
+
+    def provision_all(self) -> None:
+        self.buckets.provision_all(self.s3)
+
+    def put_bytes(self, bucket: str, object_name: str, content: bytes, content_type: str) -> None:
+        s3 = self.s3
+        self.buckets.call(s3, bucket, lambda: s3.put_object(
+            Bucket=bucket,
+            Key=object_name,
+            Body=io.BytesIO(content),
+            ContentLength=len(content),
+            ContentType=content_type,
+        ))
+
+    def _upload_part(self, bucket: str, object_name: str, upload_id: str, number: int, data: bytes) -> dict:
+        response = self.s3.upload_part(
+            Bucket=bucket,
+            Key=object_name,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=data,
+        )
+        return {"PartNumber": number, "ETag": response["ETag"]}
+
+    def _complete(self, bucket: str, object_name: str, upload_id: str, parts: list[dict]) -> None:
+        self.s3.complete_multipart_upload(
+            Bucket=bucket,
+            Key=object_name,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": sorted(parts, key=lambda part: part["PartNumber"])},
+        )
+
+    def upload_stream(
+        self, chunks: Iterable[bytes], bucket: str, object_name: str, content_type: str
+    ) -> tuple[int, str]:
+        """upload_stream_part_size 씩 묶어서 upload_concurrency 개의 part 를 동시에 올리면서 바이트 수를 센다.
+
+        메모리에는 올리는 중인 part 들과 채우는 중인 part 하나만 있다.
+        part 가 하나뿐이면 multipart 대신 put_object 한 번으로 끝낸다.
+        """
+        s3 = self.s3
+        settings = self.settings
+
+        parts = _iter_parts(chunks, settings.upload_stream_part_size)
+        first = next(parts, b"")
+        second = next(parts, None)
+        if second is None:
+            self.buckets.call(s3, bucket, lambda: s3.put_object(
+                Bucket=bucket, Key=object_name, Body=first, ContentType=content_type
+            ))
+            return len(first), hashlib.sha256(first).hexdigest()
+
+        upload_id = self.buckets.call(s3, bucket, lambda: s3.create_multipart_upload(
+            Bucket=bucket, Key=object_name, ContentType=content_type
+        ))["UploadId"]
+        concurrency = max(1, settings.upload_concurrency)
+        uploaded: list[dict] = []
+        in_flight: deque[Future] = deque()
+        size = 0
+        digest = hashlib.sha256()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            try:
+                for number, data in enumerate(itertools.chain((first, second), parts), start=1):
+                    # 동시에 올리는 part 수를 넘지 않도록 가장 먼저 보낸 part 를 기다린다.
+                    if len(in_flight) >= concurrency:
+                        uploaded.append(in_flight.popleft().result())
+                    size += len(data)
+                    digest.update(data)
+                    in_flight.append(pool.submit(self._upload_part, bucket, object_name, upload_id, number, data))
+                    # 다음 part 를 읽는 동안 이 part 를 붙잡고 있지 않는다.
+                    del data
+                while in_flight:
+                    uploaded.append(in_flight.popleft().result())
+                self._complete(bucket, object_name, upload_id, uploaded)
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                s3.abort_multipart_upload(Bucket=bucket, Key=object_name, UploadId=upload_id)
+                raise
+
+        return size, digest.hexdigest()
+
+    async def upload_stream_async(
+        self, chunks: AsyncIterable[bytes], bucket: str, object_name: str, content_type: str
+    ) -> tuple[int, str]:
+        """upload_stream 의 비동기 버전. S3 호출은 스레드에서 하고, 본문은 이벤트 루프에서 읽는다."""
+        s3 = self.s3
+        settings = self.settings
+
+        parts = _aiter_parts(chunks, settings.upload_stream_part_size)
+        first = await anext(parts, b"")
+        second = await anext(parts, None)
+        if second is None:
+            await asyncio.to_thread(self.buckets.call, s3, bucket, lambda: s3.put_object(
+                Bucket=bucket, Key=object_name, Body=first, ContentType=content_type
+            ))
+            return len(first), hashlib.sha256(first).hexdigest()
+
+        upload = await asyncio.to_thread(self.buckets.call, s3, bucket, lambda: s3.create_multipart_upload(
+            Bucket=bucket, Key=object_name, ContentType=content_type
+        ))
+        upload_id = upload["UploadId"]
+        concurrency = max(1, settings.upload_concurrency)
+        uploaded: list[dict] = []
+        in_flight: deque[asyncio.Task] = deque()
+        size = 0
+        digest = hashlib.sha256()
+
+        async def numbered() -> AsyncIterator[tuple[int, bytes]]:
+            yield 1, first
+            yield 2, second
+            number = 3
+            async for data in parts:
+                yield number, data
+                number += 1
+
+        try:
+            async for number, data in numbered():
+                if len(in_flight) >= concurrency:
+                    uploaded.append(await in_flight.popleft())
+                size += len(data)
+                digest.update(data)
+                in_flight.append(asyncio.create_task(asyncio.to_thread(
+                    self._upload_part, bucket, object_name, upload_id, number, data
+                )))
+                del data
+            while in_flight:
+                uploaded.append(await in_flight.popleft())
+            await asyncio.to_thread(self._complete, bucket, object_name, upload_id, uploaded)
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            await asyncio.to_thread(s3.abort_multipart_upload, Bucket=bucket, Key=object_name, UploadId=upload_id)
+            raise
+
+        return size, digest.hexdigest()
+
+    def read_bytes(self, bucket: str, object_name: str) -> Optional[bytes]:
+        try:
+            response = self.s3.get_object(Bucket=bucket, Key=object_name)
+        except ClientError as e:
+            if _is_missing_key(e):
+                return None
+            raise
+        return response["Body"].read()
+
+    def iter_chunks(self, bucket: str, object_name: str, chunk_size: int) -> Iterator[bytes]:
+        response = self.s3.get_object(Bucket=bucket, Key=object_name)
+        body = response["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+    def head(self, bucket: str, object_name: str) -> Optional[ObjectInfo]:
+        try:
+            response = self.s3.head_object(Bucket=bucket, Key=object_name)
+        except ClientError as e:
+            if _is_missing_key(e):
+                return None
+            raise
+        return ObjectInfo(size=response["ContentLength"], etag=response["ETag"].strip('"'))
+
+    def local_path(self, bucket: str, object_name: str) -> Optional[Path]:
+        return None
+
+    def delete_objects(self, bucket: str, object_names: list[str]) -> None:
+        """delete_objects 한 번에 최대 1000개씩 지운다."""
+        for i in range(0, len(object_names), 1000):
+            batch = object_names[i:i + 1000]
+            self.s3.delete_objects(
+                Bucket=bucket,
+                Delete={
+                    "Objects": [{"Key": name} for name in batch],
+                    "Quiet": True,
+                },
+            )
+
+    def signed_url(
+        self, bucket: str, object_name: str, *, content_type: str, filename: str, expires_seconds: int
+    ) -> str:
+        return self.s3.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={
+                "Bucket": bucket,
+                "Key": object_name,
+                "ResponseContentType": content_type,
+                "ResponseContentDisposition": (
+                    f'attachment; filename="{filename}"'
+                ),
+            },
+            ExpiresIn=expires_seconds,
+        )
+
+    def create_multipart_upload(self, bucket: str, object_name: str, content_type: str) -> str:
+        s3 = self.s3
+        response = self.buckets.call(s3, bucket, lambda: s3.create_multipart_upload(
+            Bucket=bucket, Key=object_name, ContentType=content_type
+        ))
+        return response["UploadId"]
+
+    def upload_part_urls(
+        self, bucket: str, object_name: str, upload_id: str, part_numbers: Iterable[int], expires_seconds: int
+    ) -> dict[int, str]:
+        """서명은 로컬에서 계산하므로 S3 요청은 없다."""
+        return {
+            part_number: self.s3.generate_presigned_url(
+                ClientMethod="upload_part",
+                Params={
+                    "Bucket": bucket,
+                    "Key": object_name,
+                    "UploadId": upload_id,
+                    "PartNumber": part_number,
+                },
+                ExpiresIn=expires_seconds,
+            )
+            for part_number in part_numbers
+        }
+
+    def complete_multipart_upload(
+        self, bucket: str, object_name: str, upload_id: str, parts: list[tuple[int, str]]
+    ) -> int:
+        """로컬 저장소와 같이 잘못된 part 는 InvalidInputError, 없는 업로드는 NotFoundError 로 바꾼다."""
+        try:
+            self.s3.complete_multipart_upload(
+                Bucket=bucket,
+                Key=object_name,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [{"PartNumber": number, "ETag": etag} for number, etag in sorted(parts)],
+                },
+            )
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if code == "NoSuchUpload":
+                raise NotFoundError("upload not found")
+            if code in _INVALID_PART_CODES:
+                raise InvalidInputError(f"invalid parts: {code}")
+            raise
+        return self.s3.head_object(Bucket=bucket, Key=object_name)["ContentLength"]
+
+    def abort_multipart_upload(self, bucket: str, object_name: str, upload_id: str) -> None:
+        try:
+            self.s3.abort_multipart_upload(Bucket=bucket, Key=object_name, UploadId=upload_id)
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "NoSuchUpload":
+                raise
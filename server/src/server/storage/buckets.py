@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import threading
+from functools import lru_cache
+from typing import Callable, TypeVar
+
+from botocore.exceptions import ClientError
+
+from .settings import StorageSettings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def is_missing_bucket(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in ("NoSuchBucket", "404")
+
+
+class BucketRegistry:
+    """버킷을 프로세스마다 한 번만 확인/생성하고 기억한다.
+
+    업로드마다 head_bucket 을 부르지 않고, 이미 확인한 버킷은 그대로 쓴다.
+    쓰는 도중 NoSuchBucket 이 나면 (누가 지웠거나 저장소를 초기화한 경우) 그 버킷만 잊고 다시 만든다.
+    만들 때 lifecycle(끝나지 않은 multipart 정리)과 CORS(브라우저 직접 업로드/재생) 규칙을 같이 건다.
+    """
+
+    def __init__(self, settings: StorageSettings):
+        self.settings = settings
+        self._ready: set[str] = set()
+        self._lock = threading.Lock()
+
+    def ensure(self, s3, bucket: str) -> None:
+        if bucket in self._ready:
+            return
+        with self._lock:
+            if bucket in self._ready:
+                return
+            self._provision(s3, bucket)
+            self._ready.add(bucket)
+
+    def invalidate(self, bucket: str) -> None:
+        with self._lock:
+            self._ready.discard(bucket)
+
+    def call(self, s3, bucket: str, fn: Callable[[], T]) -> T:
+        """fn 을 부르고, 버킷이 없어서 실패하면 버킷을 다시 만든 뒤 한 번 더 부른다."""
+        self.ensure(s3, bucket)
+        try:
+            return fn()
+        except ClientError as e:
+            if not is_missing_bucket(e):
+                raise
+            logger.warning("bucket %s disappeared, provisioning again", bucket)
+            self.invalidate(bucket)
+            self.ensure(s3, bucket)
+            return fn()
+
+    def provision_all(self, s3) -> None:
+        for bucket in (self.settings.media_bucket, self.settings.voice_bucket):
+            self.ensure(s3, bucket)
+
+    def _provision(self, s3, bucket: str) -> None:
+        try:
+            s3.head_bucket(Bucket=bucket)
+        except ClientError as e:
+            if not is_missing_bucket(e):
+                raise
+            try:
+                s3.create_bucket(Bucket=bucket)
+            except ClientError as e:
+                if e.response["Error"]["Code"] != "BucketAlreadyOwnedByYou":
+                    raise
+        self._apply_rules(s3, bucket)
+
+    def _apply_rules(self, s3, bucket: str) -> None:
+        # 규칙을 지원하지 않는 S3 호환 저장소도 있으므로 실패해도 버킷은 쓴다.
+        # put 은 설정 전체를 바꾸므로, 운영자가 건 다른 규칙을 지우지 않도록 읽어서 우리 ID 의 규칙만 바꾼다.
+        settings = self.settings
+        try:
+            rules = _merge_rule(
+                _get_rules(s3.get_bucket_lifecycle_configuration, bucket, "Rules", "NoSuchLifecycleConfiguration"),
+                {
+                    "ID": _LIFECYCLE_RULE_ID,
+                    "Status": "Enabled",
+                    "Filter": {"Prefix": ""},
+                    "AbortIncompleteMultipartUpload": {
+                        "DaysAfterInitiation": settings.storage_abort_incomplete_upload_days,
+                    },
+                },
+            )
+            if rules is not None:
+                s3.put_bucket_lifecycle_configuration(Bucket=bucket, LifecycleConfiguration={"Rules": rules})
+        except ClientError:
+            logger.warning("failed to apply lifecycle rules to bucket %s", bucket, exc_info=True)
+
+        origins = [o.strip() for o in (settings.storage_cors_origins or "").split(",") if o.strip()]
+        if not origins:
+            return
+        try:
+            rules = _merge_rule(
+                _get_rules(s3.get_bucket_cors, bucket, "CORSRules", "NoSuchCORSConfiguration"),
+                {
+                    "ID": _CORS_RULE_ID,
+                    "AllowedOrigins": origins,
+                    "AllowedMethods": ["GET", "HEAD", "PUT"],
+                    "AllowedHeaders": ["*"],
+                    "ExposeHeaders": ["ETag"],
+                    "MaxAgeSeconds": 3600,
+                },
+            )
+            if rules is not None:
+                s3.put_bucket_cors(Bucket=bucket, CORSConfiguration={"CORSRules": rules})
+        except ClientError:
+            logger.warning("failed to apply CORS rules to bucket %s", bucket, exc_info=True)
+
+
+_LIFECYCLE_RULE_ID = "abort-incomplete-multipart-uploads"
+_CORS_RULE_ID = "auto-video-browser-access"
+
+
+def _get_rules(get, bucket: str, key: str, missing_code: str) -> list[dict]:
+    try:
+        return get(Bucket=bucket).get(key, [])
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") == missing_code:
+            return []
+        raise
+
+
+def _merge_rule(rules: list[dict], rule: dict) -> list[dict] | None:
+    """같은 ID 의 규칙을 rule 로 바꾸거나 덧붙인다. 이미 같으면 None (다시 쓸 필요 없음)."""
+    if rule in rules:
+        return None
+    return [r for r in rules if r.get("ID") != rule["ID"]] + [rule]
+
+
+@lru_cache
+def get_bucket_registry() -> BucketRegistry:
+    return BucketRegistry(StorageSettings())
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from .backends import StorageBackend
+from .settings import StorageSettings
+
+logger = logging.getLogger(__name__)
+
+_TMP_DIR = ".tmp"
+# 한도를 넘으면 이 비율까지 줄인다. 채울 때마다 디렉터리를 훑지 않게 여유를 둔다.
+_LOW_WATER = 0.9
+
+
+class DiskCache:
+    """오브젝트 저장소 앞의 노드 로컬 read-through 캐시.
+
+    - 키는 (bucket, object_name, ETag) 라서 오브젝트가 바뀌면 새 항목으로 받는다.
+      ETag 를 묻는 head 요청 결과는 etag_ttl_seconds 동안 메모리에 둔다. (이 저장소의 오브젝트 이름은 쓸 때마다 새로 만든다.)
+    - 채울 때는 임시 파일에 받은 뒤 os.replace 로 넣으므로 반쯤 받은 파일을 읽는 일이 없다.
+      같은 프로세스 안에서 같은 키를 동시에 요청하면 한 번만 받는다.
+    - 읽는 쪽은 열린 파일을 받는다. 그 사이 다른 프로세스가 지워도 (unlink) 이미 연 파일은 끝까지 읽을 수 있다.
+    - 전체 크기가 max_bytes 를 넘으면 mtime 이 오래된 것부터 지운다. hit 때마다 mtime 을 갱신하므로
+      같은 디렉터리를 쓰는 여러 프로세스(API, 워커)가 하나의 LRU 를 공유한다.
+    """
+
+    def __init__(self, root: str, max_bytes: int, etag_ttl_seconds: int):
+        self.root = Path(root).resolve()
+        self.max_bytes = max_bytes
+        self.etag_ttl_seconds = etag_ttl_seconds
+        self._lock = threading.Lock()
+        self._fill_locks: dict[str, threading.Lock] = {}
+        self._etags: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+        self._size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.filled_bytes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def _etag(self, backend: StorageBackend, bucket: str, object_name: str) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._etags.get((bucket, object_name))
+            if cached is not None and cached[0] > now:
+                self._etags.move_to_end((bucket, object_name))
+                return cached[1]
+
+        info = backend.head(bucket, object_name)
+        if info is None:
+            return None
+        with self._lock:
+            self._etags[(bucket, object_name)] = (now + self.etag_ttl_seconds, info.etag)
+            # ETag 메모는 최근 것만 남긴다.
+            while len(self._etags) > 10000:
+                self._etags.popitem(last=False)
+        return info.etag
+
+    def open(self, backend: StorageBackend, bucket: str, object_name: str) -> Optional[BinaryIO]:
+        """캐시된 파일을 열어서 돌려준다. 없으면 저장소에서 받아 채운다. 오브젝트가 없으면 None."""
+        etag = self._etag(backend, bucket, object_name)
+        if etag is None:
+            return None
+        key = hashlib.sha256("\0".join((bucket, object_name, etag)).encode("utf-8")).hexdigest()
+        path = self._path(key)
+
+        f = self._open_hit(path)
+        if f is not None:
+            return f
+
+        with self._lock:
+            fill_lock = self._fill_locks.setdefault(key, threading.Lock())
+        with fill_lock:
+            try:
+                # 기다리는 동안 다른 스레드가 채웠을 수 있다.
+                f = self._open_hit(path)
+                if f is not None:
+                    return f
+                with self._lock:
+                    self.misses += 1
+                size, f = self._fill(backend, bucket, object_name, path)
+            finally:
+                with self._lock:
+                    self._fill_locks.pop(key, None)
+
+        self._account(size)
+        return f
+
+    def _open_hit(self, path: Path) -> Optional[BinaryIO]:
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(f.fileno())
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return f
+
+    def _fill(self, backend: StorageBackend, bucket: str, object_name: str, path: Path) -> tuple[int, BinaryIO]:
+        tmp_dir = self.root / _TMP_DIR
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=tmp_dir)
+        size = 0
+        reader = None
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in backend.iter_chunks(bucket, object_name, 1024 * 1024):
+                    f.write(chunk)
+                    size += len(chunk)
+            # 바꾸기 전에 열어 두면 곧바로 다른 프로세스가 지워도 읽을 수 있다.
+            reader = open(tmp, "rb")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp, path)
+        except BaseException:
+            if reader is not None:
+                reader.close()
+            os.unlink(tmp)
+            raise
+        with self._lock:
+            self.filled_bytes += size
+        return size, reader
+
+    def _account(self, size: int) -> None:
+        with self._lock:
+            if self._size is not None:
+                self._size += size
+            over = self._size is None or self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def _scan(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for shard in self.root.iterdir():
+            if shard.name == _TMP_DIR or not shard.is_dir():
+                continue
+            for entry in os.scandir(shard):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        return entries
+
+    def _evict(self) -> None:
+        """디렉터리를 훑어 실제 크기를 다시 재고, 넘으면 오래 안 쓴 것부터 지운다.
+
+        다른 프로세스가 채운 파일도 여기서 같이 센다.
+        """
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * _LOW_WATER
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._size = total
+            self.evictions += evicted
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "filled_bytes": self.filled_bytes,
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+@lru_cache
+def get_disk_cache() -> Optional[DiskCache]:
+    """오브젝트가 원격에 있을 때만 쓴다. 로컬 저장소는 이미 디스크에 있으므로 None."""
+    settings = StorageSettings()
+    if settings.storage_backend == "local" or settings.storage_cache_max_bytes <= 0:
+        return None
+    return DiskCache(
+        settings.storage_cache_dir,
+        max_bytes=settings.storage_cache_max_bytes,
+        etag_ttl_seconds=settings.storage_cache_etag_ttl_seconds,
+    )
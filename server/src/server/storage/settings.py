@@ -3,10 +3,45 @@ from ..config import EnvBaseSettings
 
 
 class StorageSettings(EnvBaseSettings):
-    """BOTO3 기반 S3 호환 오브젝트 스토리지 설정."""
-    aws_access_key_id: str
-    aws_secret_access_key: str
-    aws_default_region: str
-    s3_endpoint_url: str
+    """오브젝트 스토리지 설정.
+
+    - storage_backend: "s3"(boto3, S3 호환 저장소) 또는 "local"(로컬 디스크). aws_* 와 s3_endpoint_url 은 s3 에서만 쓴다.
+    - storage_local_root: local 저장소의 루트 디렉터리. 버킷마다 하위 디렉터리가 생긴다.
+    - storage_public_url: local 저장소가 내주는 URL 앞에 붙일 API 서버 주소. 비우면 "/storage/..." 상대 경로를 준다.
+    - storage_signing_key: local 저장소 URL 서명에 쓰는 비밀 키
+    - storage_cache_dir: 원격 저장소에서 읽은 오브젝트를 두는 로컬 캐시 디렉터리
+    - storage_cache_max_bytes: 로컬 캐시의 최대 크기. 0 이면 캐시하지 않는다.
+    - storage_cache_etag_ttl_seconds: 캐시 키에 쓰는 ETag 를 저장소에 다시 묻지 않고 쓰는 시간
+    - storage_cors_origins: 브라우저가 버킷에 직접 접근할 origin (콤마로 구분). 버킷을 만들 때 CORS 규칙으로 건다.
+    - storage_abort_incomplete_upload_days: 끝나지 않은 multipart 업로드를 저장소가 정리할 때까지의 일수
+    - signed_url_cache_enabled: presigned URL 을 Redis 에 두고 재사용할지
+    - signed_url_min_remaining_ratio: 캐시된 URL 을 내줄 때 남아 있어야 하는 유효 시간의 비율
+    - upload_stream_part_size: 서버에서 스트림을 올릴 때 part 크기 (S3 는 마지막이 아닌 part 가 5MiB 이상이어야 한다)
+    - upload_concurrency: 서버에서 스트림을 올릴 때 동시에 올리는 part 수. 메모리는 대략 part 크기 * (이 값 + 1)
+    - upload_part_size: 브라우저 직접 업로드(multipart)의 기본 part 크기. 파일이 크면 part 가 10000 개를
+      넘지 않도록 키운다.
+    - upload_url_expires_seconds: part 업로드용 presigned URL 유효 시간
+    - upload_session_ttl_seconds: 끝나지 않은 업로드 세션을 보관하는 시간
+    """
+    storage_backend: str = "s3"
+    aws_access_key_id: str | None = None
+    aws_secret_access_key: str | None = None
+    aws_default_region: str | None = None
+    s3_endpoint_url: str | None = None
+    storage_local_root: str = "./data/storage"
+    storage_public_url: str = ""
+    storage_signing_key: str | None = None
+    storage_cache_dir: str = "./data/storage-cache"
+    storage_cache_max_bytes: int = 2 * 1024 ** 3
+    storage_cache_etag_ttl_seconds: int = 300
     media_bucket: str = "media"
-    voice_bucket: str = "voice"
\ No newline at end of file
+    voice_bucket: str = "voice"
+    storage_cors_origins: str | None = None
+    storage_abort_incomplete_upload_days: int = 1
+    signed_url_cache_enabled: bool = True
+    signed_url_min_remaining_ratio: float = 0.5
+    upload_stream_part_size: int = 8 * 1024 * 1024
+    upload_concurrency: int = 4
+    upload_part_size: int = 16 * 1024 * 1024
+    upload_url_expires_seconds: int = 3600
+    upload_session_ttl_seconds: int = 24 * 60 * 60
\ No newline at end of file
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+
+import redis
+
+from server.redis.redis_client import get_client
+
+from .storage_client import UploadedFile, generate_media_signed_url, get_settings
+
+logger = logging.getLogger(__name__)
+
+# storage:signedurl:{hash} -> presigned URL
+_PREFIX = "storage:signedurl:"
+
+
+def _cache_key(media: UploadedFile, expires_seconds: int) -> str:
+    # 같은 오브젝트라도 응답 헤더(이름, 타입)나 유효 시간이 다르면 URL 이 다르다.
+    payload = "\0".join((media.bucket, media.object_name, media.content_type, media.name, str(expires_seconds)))
+    return _PREFIX + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def generate_signed_urls(media_list: list[UploadedFile], expires_seconds: int = 3600) -> list[str]:
+    """여러 오브젝트의 presigned URL 을 한 번에 만든다.
+
+    만든 URL 은 Redis 에 두고 재사용하되, 남은 유효 시간이
+    expires_seconds * signed_url_min_remaining_ratio 이상일 때만 내준다. (그 시점에 Redis 에서 만료된다.)
+    캐시 장애는 URL 생성을 막지 않는다.
+    """
+    settings = get_settings()
+    if not media_list:
+        return []
+    if not settings.signed_url_cache_enabled:
+        return [generate_media_signed_url(media, expires_seconds) for media in media_list]
+
+    keys = [_cache_key(media, expires_seconds) for media in media_list]
+    client = get_client()
+    try:
+        cached = client.mget(keys)
+    except redis.RedisError:
+        logger.warning("signed url cache read failed", exc_info=True)
+        cached = [None] * len(keys)
+
+    ttl = int(expires_seconds * (1 - settings.signed_url_min_remaining_ratio))
+    urls: list[str] = []
+    fresh: dict[str, str] = {}
+    for media, key, url in zip(media_list, keys, cached):
+        if url is None:
+            url = fresh.get(key) or generate_media_signed_url(media, expires_seconds)
+            fresh[key] = url
+        urls.append(url)
+
+    if fresh and ttl > 0:
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, url in fresh.items():
+                pipe.set(key, url, ex=ttl)
+            pipe.execute()
+        except redis.RedisError:
+            logger.warning("signed url cache write failed", exc_info=True)
+    return urls
+
+
+def generate_signed_url(media: UploadedFile, expires_seconds: int = 3600) -> str:
+    return generate_signed_urls([media], expires_seconds)[0]
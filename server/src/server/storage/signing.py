@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import time
+
+
+def _message(method: str, bucket: str, object_name: str, expires: int, params: dict[str, str]) -> bytes:
+    fields = [method, bucket, object_name, str(expires)]
+    fields += [f"{name}={value}" for name, value in sorted(params.items())]
+    return "\n".join(fields).encode("utf-8")
+
+
+def sign(key: str, method: str, bucket: str, object_name: str, expires: int, **params: str) -> str:
+    """API 가 직접 내주는 URL 의 서명. expires 는 만료 시각(unix 초)이고, params 도 서명에 들어간다."""
+    message = _message(method, bucket, object_name, expires, params)
+    return hmac.new(key.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def verify(key: str, signature: str, method: str, bucket: str, object_name: str, expires: int, **params: str) -> bool:
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(sign(key, method, bucket, object_name, expires, **params), signature)
@@ -1,13 +1,16 @@
-import boto3
 from functools import lru_cache
 
 from pydantic import BaseModel
+from .backends import ObjectInfo, get_backend
+from .disk_cache import get_disk_cache
 from .settings import StorageSettings
-from botocore.exceptions import ClientError
 
-from typing import BinaryIO
+from contextlib import contextmanager
+from typing import AsyncIterable, BinaryIO, Iterable, Iterator, Optional
+import hashlib
+import mmap
+import os
 import uuid
-import io
 
 
 @lru_cache
@@ -15,24 +18,13 @@ def get_settings() -> StorageSettings:
     return StorageSettings()
 
 
-@lru_cache
-def get_s3_client():
-    settings = get_settings()
-    return boto3.client(
-        "s3",
-        endpoint_url=settings.s3_endpoint_url,
-        aws_access_key_id=settings.aws_access_key_id,
-        aws_secret_access_key=settings.aws_secret_access_key,
-        region_name=settings.aws_default_region,
-    )
-
-
 class UploadedFile(BaseModel):
     bucket: str
     object_name: str
     name: str
     content_type: str
     size: int
+    sha256: str | None = None  # 스트림으로 올릴 때 같이 계산한 내용 해시
 
 
 def upload_media_stream(
@@ -41,94 +33,213 @@ def upload_media_stream(
     content_type: str,
     name: str,
 ):
-    s3 = get_s3_client()
+    """파일을 앞에서부터 part 크기씩 읽어 올린다. seek 하지 않으므로 소켓 같은 스트림도 된다."""
     settings = get_settings()
-
-    bucket = settings.media_bucket
-    object_name = f"{uuid.uuid4().hex}"
-
-    ensure_bucket_exists(s3, bucket)
-
-    # 크기 측정
-    fileobj.seek(0, 2)
-    size = fileobj.tell()
-    fileobj.seek(0) 
-
-    s3.upload_fileobj(
-        Fileobj=fileobj,
-        Bucket=bucket,
-        Key=object_name,
-        ExtraArgs={
-            "ContentType": content_type,
-        },
+    return upload_stream(
+        _iter_file(fileobj, settings.upload_stream_part_size),
+        uuid.uuid4().hex,
+        content_type=content_type,
+        name=name,
     )
 
-    return UploadedFile(
-        bucket=bucket,
-        object_name=object_name,
-        name=name,
+
+async def upload_media_stream_async(
+    chunks: AsyncIterable[bytes],
+    *,
+    content_type: str,
+    name: str,
+) -> UploadedFile:
+    """요청 본문처럼 비동기로 들어오는 데이터를 그대로 올린다."""
+    return await upload_stream_async(
+        chunks,
+        uuid.uuid4().hex,
         content_type=content_type,
-        size=size,  # Get size by seeking to end
+        name=name,
     )
 
 
-def ensure_bucket_exists(s3, bucket: str):
-    try:
-        s3.head_bucket(Bucket=bucket)
-    except ClientError as e:
-        error_code = int(e.response["Error"]["Code"])
-        if error_code == 404:
-            s3.create_bucket(Bucket=bucket)
-        else:
-            raise
+def provision_buckets() -> None:
+    """앱 시작 때 쓰는 버킷들을 미리 만들고 규칙을 건다."""
+    get_backend().provision_all()
+
 
 def upload_audio_bytes(
-    content: bytes, object_name: str
+    content: bytes, object_name: str, bucket: str | None = None
 ) -> UploadedFile:
-    s3 = get_s3_client()
     settings = get_settings()
 
-    bucket = settings.media_bucket
+    bucket = bucket or settings.media_bucket
+    content_type: str = "audio/mpeg"
 
-    data = io.BytesIO(content)
-    size = len(content)
+    get_backend().put_bytes(bucket, object_name, content, content_type)
 
-    content_type: str = "audio/mpeg"
+    return UploadedFile(
+        bucket=bucket,
+        object_name=object_name,
+        name=object_name,
+        content_type=content_type,
+        size=len(content),
+    )
 
-    s3.put_object(
-        Bucket=bucket,
-        Key=object_name,
-        Body=data,
-        ContentLength=size,
-        ContentType=content_type,
+
+def download_object_bytes(bucket: str, object_name: str) -> bytes | None:
+    """오브젝트 전체를 읽어온다. 없으면 None. 원격 저장소면 로컬 디스크 캐시를 거친다."""
+    cache = get_disk_cache()
+    if cache is None:
+        return get_backend().read_bytes(bucket, object_name)
+    f = cache.open(get_backend(), bucket, object_name)
+    if f is None:
+        return None
+    with f:
+        return f.read()
+
+
+def iter_object_chunks(bucket: str, object_name: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """오브젝트를 chunk_size 씩 나눠 읽는다. 전체를 메모리에 올리지 않는다."""
+    cache = get_disk_cache()
+    f = cache.open(get_backend(), bucket, object_name) if cache is not None else None
+    if f is None:
+        # 캐시를 안 쓰거나 오브젝트가 없으면 저장소에서 바로 읽는다. (없으면 저장소 오류가 그대로 난다.)
+        yield from get_backend().iter_chunks(bucket, object_name, chunk_size)
+        return
+    with f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def object_sha256(bucket: str, object_name: str, chunk_size: int = 1024 * 1024) -> str:
+    """오브젝트 내용의 sha256 (hex). 한 번만 읽으므로 디스크 캐시를 거치지 않는다."""
+    digest = hashlib.sha256()
+    for chunk in get_backend().iter_chunks(bucket, object_name, chunk_size):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def head_object(bucket: str, object_name: str) -> Optional[ObjectInfo]:
+    """오브젝트 크기와 ETag. 없으면 None."""
+    return get_backend().head(bucket, object_name)
+
+
+def _open_local(bucket: str, object_name: str) -> Optional[BinaryIO]:
+    """오브젝트를 로컬 파일로 연다. 로컬 저장소의 파일이거나 디스크 캐시에 받은 파일이다."""
+    backend = get_backend()
+    path = backend.local_path(bucket, object_name)
+    if path is not None:
+        return open(path, "rb")
+    cache = get_disk_cache()
+    if cache is None:
+        return None
+    return cache.open(backend, bucket, object_name)
+
+
+@contextmanager
+def map_object(bucket: str, object_name: str) -> Iterator[Optional[bytes | mmap.mmap]]:
+    """오브젝트를 바이트처럼 슬라이스할 수 있게 연다. 없으면 None.
+
+    로컬 파일(로컬 저장소 또는 디스크 캐시)이면 mmap 으로 열어서 슬라이스한 부분만 읽고,
+    아니면 전체를 내려받는다. with 블록 밖에서는 쓰지 않는다.
+    """
+    f = _open_local(bucket, object_name)
+    if f is None:
+        yield download_object_bytes(bucket, object_name)
+        return
+
+    with f:
+        # 빈 파일은 mmap 할 수 없다.
+        if not os.fstat(f.fileno()).st_size:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _iter_file(fileobj: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    while chunk := fileobj.read(chunk_size):
+        yield chunk
+
+
+def upload_stream(
+    chunks: Iterable[bytes],
+    object_name: str,
+    *,
+    content_type: str,
+    bucket: str | None = None,
+    name: str | None = None,
+) -> UploadedFile:
+    """조각으로 들어오는 데이터를 크기를 미리 모른 채 올린다. 바이트 수와 sha256 을 같이 센다."""
+    bucket = bucket or get_settings().media_bucket
+    size, sha256 = get_backend().upload_stream(chunks, bucket, object_name, content_type)
+    return UploadedFile(
+        bucket=bucket,
+        object_name=object_name,
+        name=name or object_name,
+        content_type=content_type,
+        size=size,
+        sha256=sha256,
     )
 
+
+async def upload_stream_async(
+    chunks: AsyncIterable[bytes],
+    object_name: str,
+    *,
+    content_type: str,
+    bucket: str | None = None,
+    name: str | None = None,
+) -> UploadedFile:
+    """upload_stream 의 비동기 버전."""
+    bucket = bucket or get_settings().media_bucket
+    size, sha256 = await get_backend().upload_stream_async(chunks, bucket, object_name, content_type)
     return UploadedFile(
         bucket=bucket,
         object_name=object_name,
-        name=object_name,
+        name=name or object_name,
         content_type=content_type,
         size=size,
+        sha256=sha256,
     )
 
 
+def create_multipart_upload(bucket: str, object_name: str, content_type: str) -> str:
+    """브라우저가 직접 part 를 올릴 multipart 업로드를 시작하고 UploadId 를 돌려준다."""
+    return get_backend().create_multipart_upload(bucket, object_name, content_type)
+
+
+def generate_upload_part_urls(
+    bucket: str,
+    object_name: str,
+    upload_id: str,
+    part_numbers: Iterable[int],
+    expires_seconds: int = 3600,
+) -> dict[int, str]:
+    """part 마다 PUT 할 서명된 URL."""
+    return get_backend().upload_part_urls(bucket, object_name, upload_id, part_numbers, expires_seconds)
+
+
+def complete_multipart_upload(
+    bucket: str, object_name: str, upload_id: str, parts: list[tuple[int, str]]
+) -> int:
+    """(part 번호, ETag) 들로 업로드를 마치고 오브젝트 크기를 돌려준다."""
+    return get_backend().complete_multipart_upload(bucket, object_name, upload_id, parts)
+
+
+def abort_multipart_upload(bucket: str, object_name: str, upload_id: str) -> None:
+    get_backend().abort_multipart_upload(bucket, object_name, upload_id)
+
+
+def delete_objects(bucket: str, object_names: list[str]) -> None:
+    """오브젝트 여러 개를 지운다. S3 는 delete_objects 한 번(최대 1000개씩)으로 지운다."""
+    get_backend().delete_objects(bucket, object_names)
+
+
 def generate_media_signed_url(
     media: UploadedFile,
     expires_seconds: int = 3600,
 ) -> str:
-    s3 = get_s3_client()
-
-    url = s3.generate_presigned_url(
-        ClientMethod="get_object",
-        Params={
-            "Bucket": media.bucket,
-            "Key": media.object_name,
-            "ResponseContentType": media.content_type,
-            "ResponseContentDisposition": (
-                f'attachment; filename="{media.name}"'
-            ),
-        },
-        ExpiresIn=expires_seconds,
+    return get_backend().signed_url(
+        media.bucket,
+        media.object_name,
+        content_type=media.content_type,
+        filename=media.name,
+        expires_seconds=expires_seconds,
     )
-
-    return url
\ No newline at end of file
@@ -0,0 +1,2 @@
+from .subtitle import Cue, FORMATS, iter_cues, iter_srt, iter_webvtt
+from .cache import get_settings, get_subtitle_cache
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+import uuid
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+import redis
+
+from server.redis.redis_client import get_client
+
+from .settings import SubtitleSettings
+
+logger = logging.getLogger(__name__)
+
+# subtitle:{key} -> list, 만든 자막을 조각 단위로 담는다.
+_PREFIX = "subtitle:"
+
+# 이 정도 모이면 Redis 에 한 번에 붙인다.
+_FLUSH_CHARS = 64 * 1024
+# 캐시에서 한 번에 읽는 조각 수
+_READ_BATCH = 16
+
+
+class SubtitleCache:
+    """만든 자막을 흘려보내면서 Redis 에 같이 적어 두고, 다음에는 그대로 흘려보낸다.
+
+    키에는 프로젝트 내용의 해시가 들어가므로 프로젝트가 바뀌면 자연히 새로 만든다.
+    조각 단위로 읽고 쓰므로 자막 전체를 메모리에 올리지 않는다.
+    캐시 장애는 자막 생성을 막지 않는다.
+    """
+
+    def __init__(self, settings: SubtitleSettings):
+        self.settings = settings
+
+    def _read(self, key: str) -> Iterator[str] | None:
+        client = get_client()
+        try:
+            # 읽는 도중에 만료되지 않도록 TTL 을 다시 건다.
+            if not client.expire(_PREFIX + key, self.settings.subtitle_cache_ttl_seconds):
+                return None
+            length = client.llen(_PREFIX + key)
+        except redis.RedisError:
+            logger.warning("subtitle cache read failed", exc_info=True)
+            return None
+
+        def chunks() -> Iterator[str]:
+            for i in range(0, length, _READ_BATCH):
+                yield from client.lrange(_PREFIX + key, i, i + _READ_BATCH - 1)
+
+        return chunks()
+
+    def stream(self, key: str, produce: Iterable[str]) -> Iterator[str]:
+        cached = self._read(key)
+        if cached is not None:
+            yield from cached
+            return
+
+        client = get_client()
+        tmp_key = f"{_PREFIX}{key}:tmp:{uuid.uuid4().hex}"
+        caching = True
+        written = 0
+        buffer: list[str] = []
+        buffered = 0
+
+        def flush() -> None:
+            nonlocal caching, buffered
+            if not buffer:
+                return
+            try:
+                pipe = client.pipeline()
+                pipe.rpush(tmp_key, "".join(buffer))
+                pipe.expire(tmp_key, self.settings.subtitle_cache_ttl_seconds)
+                pipe.execute()
+            except redis.RedisError:
+                logger.warning("subtitle cache write failed", exc_info=True)
+                caching = False
+            buffer.clear()
+            buffered = 0
+
+        completed = False
+        try:
+            for chunk in produce:
+                yield chunk
+                if not caching:
+                    continue
+                written += len(chunk.encode("utf-8"))
+                if written > self.settings.subtitle_cache_max_bytes:
+                    caching = False
+                    buffer.clear()
+                    continue
+                buffer.append(chunk)
+                buffered += len(chunk)
+                if buffered >= _FLUSH_CHARS:
+                    flush()
+            if caching:
+                # 빈 자막도 캐시할 수 있도록 빈 조각을 하나 넣는다.
+                buffer.append("")
+                flush()
+            completed = caching
+        finally:
+            try:
+                if completed:
+                    client.rename(tmp_key, _PREFIX + key)
+                else:
+                    client.delete(tmp_key)
+            except redis.RedisError:
+                logger.warning("subtitle cache write failed", exc_info=True)
+
+
+@lru_cache
+def get_settings() -> SubtitleSettings:
+    return SubtitleSettings()
+
+
+@lru_cache
+def get_subtitle_cache() -> SubtitleCache:
+    return SubtitleCache(get_settings())
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from ..config import EnvBaseSettings
+
+
+class SubtitleSettings(EnvBaseSettings):
+    """자막 생성 설정.
+
+    - subtitle_max_line_chars: 한 줄 최대 글자 수. 넘으면 어절 단위로 줄을 바꾼다.
+    - subtitle_max_lines: 자막 하나의 최대 줄 수. 넘으면 다음 자막으로 나눈다.
+    - subtitle_cache_ttl_seconds: 만든 자막을 Redis 에 보관하는 시간
+    - subtitle_cache_max_bytes: 이보다 큰 자막은 캐시하지 않는다.
+    """
+
+    subtitle_max_line_chars: int = 24
+    subtitle_max_lines: int = 2
+    subtitle_cache_ttl_seconds: int = 24 * 60 * 60
+    subtitle_cache_max_bytes: int = 4 * 1024 * 1024
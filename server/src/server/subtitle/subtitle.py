@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from server.service.project_timeline import iter_section_timings
+from server.service.project_types import Project
+
+
+@dataclass(frozen=True)
+class Cue:
+    start: float
+    end: float
+    lines: list[str]
+
+
+def _split_lines(
+    words: list[tuple[float, str]], max_line_chars: int, max_lines: int
+) -> Iterator[tuple[float, list[str]]]:
+    """어절들을 줄 길이 제한에 맞춰 줄로 나누고, 줄 수가 넘치면 자막을 나눈다.
+
+    (자막 시작 시각, 줄들) 을 돌려준다. 나뉜 자막은 첫 어절의 시각에 시작한다.
+    """
+    lines: list[str] = []
+    line = ""
+    cue_start = words[0][0]
+    for start, text in words:
+        if line and len(line) + 1 + len(text) > max_line_chars:
+            lines.append(line)
+            line = ""
+            if len(lines) == max_lines:
+                yield cue_start, lines
+                lines = []
+                cue_start = start
+        line = f"{line} {text}" if line else text
+    if line:
+        lines.append(line)
+    if lines:
+        yield cue_start, lines
+
+
+def iter_cues(project: Project, max_line_chars: int = 24, max_lines: int = 2) -> Iterator[Cue]:
+    """섹션 → 구간 → 어절 순서대로 걸으며 자막을 만든다.
+
+    is_caption_split 인 어절에서 자막을 끊고 (그 어절까지 한 자막), 구간과 섹션 경계에서도 끊는다.
+    자막은 다음 자막이 시작할 때 끝나고, 섹션의 마지막 자막은 섹션 발화가 끝날 때 끝난다.
+    전체를 모으거나 정렬하지 않으므로 어절 수에 비례한 시간, 일정한 메모리로 동작한다.
+    """
+    for timing in iter_section_timings(project):
+        if not timing.has_audio:
+            continue
+
+        pending: tuple[float, list[str]] | None = None
+        for interval in timing.section.intervals:
+            group: list[tuple[float, str]] = []
+            words = iter(interval.words)
+            while True:
+                word = next(words, None)
+                if word is not None and word.displayed_text.strip():
+                    group.append((timing.speech_start + word.start, word.displayed_text.strip()))
+                if group and (word is None or word.is_caption_split):
+                    for start, lines in _split_lines(group, max_line_chars, max_lines):
+                        if pending is not None:
+                            yield Cue(start=pending[0], end=start, lines=pending[1])
+                        pending = (start, lines)
+                    group = []
+                if word is None:
+                    break
+
+        if pending is not None:
+            yield Cue(start=pending[0], end=max(pending[0], timing.end), lines=pending[1])
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    total_ms = int(round(max(0.0, seconds) * 1000))
+    hours, rem = divmod(total_ms, 3600_000)
+    minutes, rem = divmod(rem, 60_000)
+    secs, ms = divmod(rem, 1000)
+    return f"{hours:02}:{minutes:02}:{secs:02}{separator}{ms:03}"
+
+
+def iter_srt(cues: Iterable[Cue]) -> Iterator[str]:
+    for index, cue in enumerate(cues, start=1):
+        yield (
+            f"{index}\n"
+            f"{_timestamp(cue.start, ',')} --> {_timestamp(cue.end, ',')}\n"
+            + "\n".join(cue.lines)
+            + "\n\n"
+        )
+
+
+def iter_webvtt(cues: Iterable[Cue]) -> Iterator[str]:
+    yield "WEBVTT\n\n"
+    for cue in cues:
+        # WebVTT 에서 "-->" 는 자막 본문에 쓸 수 없다.
+        lines = [line.replace("-->", "->") for line in cue.lines]
+        yield (
+            f"{_timestamp(cue.start, '.')} --> {_timestamp(cue.end, '.')}\n"
+            + "\n".join(lines)
+            + "\n\n"
+        )
+
+
+FORMATS = {
+    "srt": (iter_srt, "application/x-subrip; charset=utf-8"),
+    "vtt": (iter_webvtt, "text/vtt; charset=utf-8"),
+}
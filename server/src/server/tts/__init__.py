@@ -1,3 +1,3 @@
-from .tts import list_voices
-from .tts import synthesize_words_to_mp3
+from .tts import list_voices, list_voices_async
+from .tts import synthesize_words_to_mp3, synthesize_words_to_mp3_async
 from .tts import Word, Section
\ No newline at end of file
@@ -0,0 +1,29 @@
+from functools import lru_cache
+
+from ..settings import TtsSettings
+from .base import TtsBackend
+
+
+@lru_cache
+def get_backend() -> TtsBackend:
+    """TTS_BACKEND 설정("google" | "local")에 맞는 엔진. 프로세스마다 하나."""
+
+    settings = TtsSettings()
+
+    if settings.tts_backend == "local":
+        from .local import LocalTtsBackend
+
+        return LocalTtsBackend(
+            seconds_per_char=settings.tts_local_seconds_per_char,
+            latency_ms=settings.tts_local_latency_ms,
+            latency_jitter_ms=settings.tts_local_latency_jitter_ms,
+        )
+
+    if settings.tts_backend == "google":
+        from .google import GoogleTtsBackend
+
+        if not settings.google_tts_api_key:
+            raise ValueError("GOOGLE_TTS_API_KEY is required for the google TTS backend")
+        return GoogleTtsBackend(api_key=settings.google_tts_api_key)
+
+    raise ValueError(f"unknown TTS backend: {settings.tts_backend}")
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Protocol
+
+from ..types import SynthesisRequest, SynthesisResult
+
+
+class TtsBackend(Protocol):
+    """synthesize_words_to_mp3 / list_voices 뒤에서 실제 합성을 하는 엔진.
+
+    name 은 캐시 키에 들어가므로 엔진마다 달라야 한다.
+    """
+
+    name: str
+
+    def synthesize(self, request: SynthesisRequest) -> SynthesisResult: ...
+
+    async def synthesize_async(self, request: SynthesisRequest) -> SynthesisResult: ...
+
+    def list_voices(self) -> list[str]: ...
+
+    async def list_voices_async(self) -> list[str]: ...
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+import weakref
+from functools import cached_property
+
+from google.api_core.client_options import ClientOptions
+from google.api_core.exceptions import ResourceExhausted
+from google.cloud import texttospeech_v1beta1 as texttospeech
+
+from server.common.exception import RateLimitedError
+
+from ..types import SynthesisRequest, SynthesisResult
+
+
+class GoogleTtsBackend:
+    """Google Cloud Text-to-Speech (v1beta1, SSML mark timepoint 지원)."""
+
+    name = "google"
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        # grpc.aio 채널은 만들어진 이벤트 루프에 묶이므로 루프마다 하나씩 둔다.
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, texttospeech.TextToSpeechAsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @cached_property
+    def client(self) -> texttospeech.TextToSpeechClient:
+        """프로세스 전체에서 공유하는 동기 클라이언트. gRPC 채널을 재사용한다."""
+        return texttospeech.TextToSpeechClient(
+            client_options=ClientOptions(api_key=self.api_key)
+        )
+
+    def async_client(self) -> texttospeech.TextToSpeechAsyncClient:
+        """현재 이벤트 루프에서 공유하는 비동기 클라이언트. 처음 쓸 때 만든다."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = texttospeech.TextToSpeechAsyncClient(
+                client_options=ClientOptions(api_key=self.api_key)
+            )
+            self._async_clients[loop] = client
+        return client
+
+    @staticmethod
+    def _request(request: SynthesisRequest) -> texttospeech.SynthesizeSpeechRequest:
+        return texttospeech.SynthesizeSpeechRequest(
+            input=texttospeech.SynthesisInput(ssml=request.ssml),
+            voice=texttospeech.VoiceSelectionParams(
+                language_code=request.language_code,
+                name=request.voice_name,
+            ),
+            audio_config=texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding[request.audio_encoding],
+            ),
+            enable_time_pointing=[
+                texttospeech.SynthesizeSpeechRequest.TimepointType.SSML_MARK
+            ],
+        )
+
+    @staticmethod
+    def _to_result(response: texttospeech.SynthesizeSpeechResponse) -> SynthesisResult:
+        return SynthesisResult(
+            audio_content=response.audio_content,
+            timepoints={tp.mark_name: tp.time_seconds for tp in response.timepoints},
+        )
+
+    @staticmethod
+    def _voice_names(response: texttospeech.ListVoicesResponse) -> list[str]:
+        return [v.name for v in response.voices if v.name.startswith("ko-KR-Chirp3-")]
+
+    def synthesize(self, request: SynthesisRequest) -> SynthesisResult:
+        try:
+            response = self.client.synthesize_speech(request=self._request(request))
+        except ResourceExhausted as e:
+            raise RateLimitedError(str(e)) from e
+        return self._to_result(response)
+
+    async def synthesize_async(self, request: SynthesisRequest) -> SynthesisResult:
+        try:
+            response = await self.async_client().synthesize_speech(request=self._request(request))
+        except ResourceExhausted as e:
+            raise RateLimitedError(str(e)) from e
+        return self._to_result(response)
+
+    def list_voices(self) -> list[str]:
+        return self._voice_names(self.client.list_voices())
+
+    async def list_voices_async(self) -> list[str]:
+        return self._voice_names(await self.async_client().list_voices())
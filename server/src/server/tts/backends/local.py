@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import html
+import random
+import re
+import time
+
+from ...audio import mp3
+from ..types import SynthesisRequest, SynthesisResult
+
+# build_ssml 이 만드는 '<mark name="wN"/>어절' 를 읽는다.
+_MARK_RE = re.compile(r'<mark name="([^"]+)"/>([^<]*)')
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Google 의 MP3 출력과 같은 설정 (MPEG-2 Layer III, 24kHz, mono, 32kbps)
+_FRAME = mp3.build_header(version=2, bitrate=32, sample_rate=24000, channel_mode=3)
+
+
+class LocalTtsBackend:
+    """네트워크 없이 결정적인 결과를 내는 부하 테스트용 엔진.
+
+    글자 수로 길이를 정해 무음 MP3 프레임을 만들고, mark 마다 그에 맞는 timepoint 를 준다.
+    같은 SSML 이면 항상 같은 결과(지연 포함)를 낸다.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        *,
+        seconds_per_char: float = 0.12,
+        pause_seconds: float = 0.08,
+        latency_ms: int = 0,
+        latency_jitter_ms: int = 0,
+    ):
+        self.seconds_per_char = seconds_per_char
+        self.pause_seconds = pause_seconds
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+
+    def _latency(self, request: SynthesisRequest) -> float:
+        seed = hashlib.sha256(request.ssml.encode("utf-8")).digest()
+        jitter = random.Random(seed).uniform(0, self.latency_jitter_ms)
+        return (self.latency_ms + jitter) / 1000
+
+    def _speak(self, request: SynthesisRequest) -> SynthesisResult:
+        timepoints: dict[str, float] = {}
+        elapsed = 0.0
+
+        marks = _MARK_RE.findall(request.ssml)
+        if marks:
+            for name, text in marks:
+                timepoints[name] = elapsed
+                elapsed += len(html.unescape(text).strip()) * self.seconds_per_char + self.pause_seconds
+        else:
+            elapsed = len(html.unescape(_TAG_RE.sub("", request.ssml)).strip()) * self.seconds_per_char
+
+        return SynthesisResult(
+            audio_content=mp3.silence(elapsed, _FRAME),
+            timepoints=timepoints,
+        )
+
+    def synthesize(self, request: SynthesisRequest) -> SynthesisResult:
+        time.sleep(self._latency(request))
+        return self._speak(request)
+
+    async def synthesize_async(self, request: SynthesisRequest) -> SynthesisResult:
+        await asyncio.sleep(self._latency(request))
+        return self._speak(request)
+
+    def list_voices(self) -> list[str]:
+        return ["ko-KR-Local-A", "ko-KR-Local-B"]
+
+    async def list_voices_async(self) -> list[str]:
+        return self.list_voices()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from functools import lru_cache
+
+from server.storage.storage_client import (
+    delete_objects,
+    download_object_bytes,
+    get_settings as get_storage_settings,
+    upload_audio_bytes,
+)
+
+from .settings import TtsCacheSettings
+from .types import SynthesisRequest, SynthesisResult
+
+logger = logging.getLogger(__name__)
+
+# Redis 키
+# - tts:cache:entry:{key}  -> 메타데이터 JSON (timepoints, 크기, 오브젝트 이름)
+# - tts:cache:index        -> sorted set, member=key, score=마지막 사용 시각
+# - tts:cache:bytes        -> 캐시된 MP3 총 크기
+# - tts:cache:hits / misses -> 카운터
+_ENTRY_PREFIX = "tts:cache:entry:"
+_INDEX_KEY = "tts:cache:index"
+_BYTES_KEY = "tts:cache:bytes"
+_HITS_KEY = "tts:cache:hits"
+_MISSES_KEY = "tts:cache:misses"
+
+# 한 번에 지우는 최대 엔트리 수
+_EVICT_BATCH = 100
+
+
+def make_cache_key(request: SynthesisRequest, backend_name: str) -> str:
+    """SSML, 음성, 오디오 설정과 엔진으로 결정되는 content-addressed 키."""
+
+    payload = json.dumps(
+        {"backend": backend_name, **request.model_dump()},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _redis():
+    # server.redis 는 server.tts 를 import 하므로 순환 import 를 피하려고 지연 import 한다.
+    from server.redis.redis_client import get_client
+
+    return get_client()
+
+
+class TtsCache:
+    """합성 결과 캐시. MP3 는 오브젝트 스토리지, timepoints 는 Redis 에 둔다.
+
+    캐시 장애(Redis/S3)는 합성 자체를 막지 않도록 miss 로 취급한다.
+    """
+
+    def __init__(self, settings: TtsCacheSettings):
+        self.settings = settings
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.tts_cache_enabled
+
+    def _bucket(self) -> str:
+        return get_storage_settings().voice_bucket
+
+    def _object_name(self, key: str) -> str:
+        return f"{self.settings.tts_cache_prefix}/{key}.mp3"
+
+    def get(self, key: str) -> SynthesisResult | None:
+        if not self.enabled:
+            return None
+
+        try:
+            client = _redis()
+            raw = client.get(_ENTRY_PREFIX + key)
+            if raw is None:
+                client.incr(_MISSES_KEY)
+                return None
+
+            entry = json.loads(raw)
+            audio_content = download_object_bytes(entry["bucket"], entry["object_name"])
+            if audio_content is None:
+                # 오브젝트가 먼저 사라진 경우 메타데이터도 정리한다.
+                self._forget(client, [key])
+                client.incr(_MISSES_KEY)
+                return None
+
+            client.zadd(_INDEX_KEY, {key: time.time()})
+            client.incr(_HITS_KEY)
+        except Exception:
+            logger.exception("tts cache lookup failed: %s", key)
+            return None
+
+        return SynthesisResult(audio_content=audio_content, timepoints=entry["timepoints"])
+
+    def put(self, key: str, result: SynthesisResult) -> None:
+        if not self.enabled:
+            return
+
+        try:
+            bucket = self._bucket()
+            object_name = self._object_name(key)
+            upload_audio_bytes(result.audio_content, object_name, bucket=bucket)
+
+            entry = {
+                "bucket": bucket,
+                "object_name": object_name,
+                "size": len(result.audio_content),
+                "timepoints": result.timepoints,
+            }
+            client = _redis()
+            # 만료는 evict() 가 인덱스 기준으로 처리한다. (TTL 을 걸면 총 크기 카운터가 어긋난다.)
+            created = client.set(_ENTRY_PREFIX + key, json.dumps(entry), nx=True)
+            client.zadd(_INDEX_KEY, {key: time.time()})
+            if created:
+                client.incrby(_BYTES_KEY, entry["size"])
+
+            self.evict()
+        except Exception:
+            logger.exception("tts cache store failed: %s", key)
+
+    def evict(self) -> int:
+        """max_age 를 넘긴 엔트리와, 총 크기가 max_bytes 를 넘는 만큼 오래된 엔트리를 지운다."""
+
+        client = _redis()
+        evicted = 0
+
+        cutoff = time.time() - self.settings.tts_cache_max_age_seconds
+        while True:
+            expired = client.zrangebyscore(_INDEX_KEY, "-inf", cutoff, start=0, num=_EVICT_BATCH)
+            if not expired:
+                break
+            evicted += self._forget(client, expired)
+
+        while True:
+            excess = int(client.get(_BYTES_KEY) or 0) - self.settings.tts_cache_max_bytes
+            if excess <= 0:
+                break
+
+            oldest = client.zrange(_INDEX_KEY, 0, _EVICT_BATCH - 1)
+            if not oldest:
+                # 인덱스가 비었는데 카운터가 남아 있으면 카운터가 어긋난 것이다.
+                client.set(_BYTES_KEY, 0)
+                break
+
+            # 넘친 만큼만 오래된 순서로 고른다.
+            victims: list[str] = []
+            for key, raw in zip(oldest, client.mget([_ENTRY_PREFIX + key for key in oldest])):
+                victims.append(key)
+                excess -= json.loads(raw)["size"] if raw is not None else 0
+                if excess <= 0:
+                    break
+            evicted += self._forget(client, victims)
+
+        return evicted
+
+    def _forget(self, client, keys: list[str]) -> int:
+        entry_keys = [_ENTRY_PREFIX + key for key in keys]
+        raw_entries = client.mget(entry_keys)
+
+        pipe = client.pipeline()
+        for entry_key in entry_keys:
+            pipe.delete(entry_key)
+        pipe.zrem(_INDEX_KEY, *keys)
+        deleted = pipe.execute()[:-1]
+
+        # 동시에 같은 엔트리를 지운 경우 실제로 지운 쪽만 크기를 뺀다.
+        freed = 0
+        objects: dict[str, list[str]] = {}
+        for raw, was_deleted in zip(raw_entries, deleted):
+            if raw is None or not was_deleted:
+                continue
+            entry = json.loads(raw)
+            freed += entry["size"]
+            objects.setdefault(entry["bucket"], []).append(entry["object_name"])
+
+        if freed:
+            client.decrby(_BYTES_KEY, freed)
+        for bucket, object_names in objects.items():
+            delete_objects(bucket, object_names)
+        return sum(deleted)
+
+    def stats(self) -> dict:
+        client = _redis()
+        hits, misses, size = client.mget(_HITS_KEY, _MISSES_KEY, _BYTES_KEY)
+        return {
+            "hits": int(hits or 0),
+            "misses": int(misses or 0),
+            "entries": client.zcard(_INDEX_KEY),
+            "bytes": int(size or 0),
+        }
+
+
+@lru_cache
+def get_tts_cache() -> TtsCache:
+    return TtsCache(TtsCacheSettings())
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+import uuid
+from functools import lru_cache
+from typing import Awaitable, Callable, TypeVar
+
+from server.common.exception import RateLimitedError
+
+from .settings import TtsRateLimitSettings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Redis 키
+# - tts:ratelimit:state   -> hash (tokens, ts, limit, decreased_at)
+# - tts:ratelimit:leases  -> sorted set, member=lease id, score=만료 시각(ms)
+# - tts:ratelimit:waiting -> 슬롯을 기다리는 호출 수
+# - tts:ratelimit:count:{초} -> 초당 시작한 호출 수
+_STATE_KEY = "tts:ratelimit:state"
+_LEASES_KEY = "tts:ratelimit:leases"
+_WAITING_KEY = "tts:ratelimit:waiting"
+_COUNT_PREFIX = "tts:ratelimit:count:"
+
+# 슬롯이 비기를 기다릴 때 다시 확인하는 간격 (초)
+_POLL_INTERVAL = 0.05
+
+# 토큰 버킷 + 동시 실행 수 제한을 한 번에 확인하고 슬롯을 잡는다.
+# 반환값: 0 이면 획득, -1 이면 동시 실행 수가 꽉 참, 양수면 토큰이 찰 때까지 기다릴 ms
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local lease_ttl = tonumber(ARGV[4])
+local initial_limit = tonumber(ARGV[5])
+
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts', 'limit')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+local limit = tonumber(state[3]) or initial_limit
+tokens = math.min(burst, tokens + math.max(0, now - ts) / 1000 * rate)
+
+local wait = 0
+if redis.call('ZCARD', KEYS[2]) >= math.max(1, math.floor(limit)) then
+    wait = -1
+elseif tokens < 1 then
+    wait = math.ceil((1 - tokens) / rate * 1000)
+else
+    tokens = tokens - 1
+    redis.call('ZADD', KEYS[2], now + lease_ttl, ARGV[3])
+    local count_key = KEYS[3] .. math.floor(now / 1000)
+    redis.call('INCR', count_key)
+    redis.call('EXPIRE', count_key, 10)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now), 'limit', tostring(limit))
+return wait
+"""
+
+# 슬롯을 반납하면서 동시 실행 수 상한을 AIMD 로 조정한다.
+# 성공: limit += increase / limit (한 바퀴에 +increase), quota 초과: limit *= decrease
+_RELEASE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local throttled = ARGV[2] == '1'
+local increase = tonumber(ARGV[3])
+local decrease = tonumber(ARGV[4])
+local min_limit = tonumber(ARGV[5])
+local max_limit = tonumber(ARGV[6])
+local cooldown = tonumber(ARGV[7])
+
+redis.call('ZREM', KEYS[2], ARGV[1])
+
+local limit = tonumber(redis.call('HGET', KEYS[1], 'limit')) or max_limit
+if throttled then
+    -- 같은 오류 폭주에 여러 번 줄이지 않도록 cooldown 동안은 한 번만 줄인다.
+    local decreased_at = tonumber(redis.call('HGET', KEYS[1], 'decreased_at')) or 0
+    if now - decreased_at >= cooldown then
+        limit = math.max(min_limit, limit * decrease)
+        -- ts 도 같이 옮겨야 다음 acquire 가 비우기 전 시각부터 토큰을 다시 채우지 않는다.
+        redis.call('HSET', KEYS[1], 'decreased_at', tostring(now), 'tokens', '0', 'ts', tostring(now))
+    end
+else
+    limit = math.min(max_limit, limit + increase / limit)
+end
+
+redis.call('HSET', KEYS[1], 'limit', tostring(limit))
+return tostring(limit)
+"""
+
+
+def _redis():
+    # server.redis 는 server.tts 를 import 하므로 순환 import 를 피하려고 지연 import 한다.
+    from server.redis.redis_client import get_client
+
+    return get_client()
+
+
+class TtsRateLimiter:
+    """여러 프로세스(API, 워커)가 공유하는 TTS 호출 제한기.
+
+    - 토큰 버킷으로 초당 호출 수를 quota 이하로 맞추고
+    - 동시 실행 수 상한을 AIMD 로 조정한다. quota 오류가 나면 줄이고, 성공하면 조금씩 늘린다.
+    """
+
+    def __init__(self, settings: TtsRateLimitSettings):
+        self.settings = settings
+        self._acquire = None
+        self._release = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.tts_rate_limit_enabled
+
+    @property
+    def rate(self) -> float:
+        return self.settings.tts_rate_limit_per_minute / 60
+
+    def _scripts(self):
+        if self._acquire is None:
+            client = _redis()
+            self._acquire = client.register_script(_ACQUIRE_SCRIPT)
+            self._release = client.register_script(_RELEASE_SCRIPT)
+        return self._acquire, self._release
+
+    def _try_acquire(self, lease_id: str) -> int:
+        acquire, _ = self._scripts()
+        s = self.settings
+        return int(acquire(
+            keys=[_STATE_KEY, _LEASES_KEY, _COUNT_PREFIX],
+            args=[self.rate, s.tts_rate_limit_burst, lease_id, s.tts_rate_limit_lease_ms, s.tts_concurrency_max],
+        ))
+
+    def _wait_seconds(self, wait: int) -> float:
+        # 여러 프로세스가 동시에 깨어나지 않도록 약간 흩뜨린다.
+        base = _POLL_INTERVAL if wait < 0 else wait / 1000
+        return base * random.uniform(1.0, 1.5)
+
+    def _check_deadline(self, deadline: float) -> None:
+        if time.monotonic() > deadline:
+            raise RateLimitedError("timed out waiting for a TTS rate limit slot")
+
+    def acquire(self) -> str:
+        lease_id = uuid.uuid4().hex
+        deadline = time.monotonic() + self.settings.tts_rate_limit_timeout_seconds
+        client = _redis()
+
+        wait = self._try_acquire(lease_id)
+        if wait == 0:
+            return lease_id
+
+        client.incr(_WAITING_KEY)
+        try:
+            while wait != 0:
+                self._check_deadline(deadline)
+                time.sleep(self._wait_seconds(wait))
+                wait = self._try_acquire(lease_id)
+        finally:
+            client.decr(_WAITING_KEY)
+        return lease_id
+
+    async def acquire_async(self) -> str:
+        lease_id = uuid.uuid4().hex
+        deadline = time.monotonic() + self.settings.tts_rate_limit_timeout_seconds
+
+        wait = await asyncio.to_thread(self._try_acquire, lease_id)
+        if wait == 0:
+            return lease_id
+
+        client = _redis()
+        await asyncio.to_thread(client.incr, _WAITING_KEY)
+        try:
+            while wait != 0:
+                self._check_deadline(deadline)
+                await asyncio.sleep(self._wait_seconds(wait))
+                wait = await asyncio.to_thread(self._try_acquire, lease_id)
+        finally:
+            await asyncio.to_thread(client.decr, _WAITING_KEY)
+        return lease_id
+
+    def release(self, lease_id: str, throttled: bool = False) -> None:
+        _, release = self._scripts()
+        s = self.settings
+        limit = release(
+            keys=[_STATE_KEY, _LEASES_KEY],
+            args=[
+                lease_id,
+                "1" if throttled else "0",
+                s.tts_concurrency_increase,
+                s.tts_concurrency_decrease,
+                s.tts_concurrency_min,
+                s.tts_concurrency_max,
+                s.tts_concurrency_cooldown_ms,
+            ],
+        )
+        if throttled:
+            logger.warning("tts quota exceeded, concurrency limit now %s", limit)
+
+    def call(self, fn: Callable[[], T]) -> T:
+        """슬롯을 잡고 fn 을 부른다.
+
+        fn 이 quota 오류(RateLimitedError)를 내면 상한을 줄이고, 정해진 횟수만큼 슬롯을 다시 잡아
+        재시도한다. 슬롯을 기다리다 시간이 다 되면 재시도 없이 RateLimitedError 를 낸다.
+        """
+        if not self.enabled:
+            return fn()
+
+        retries = self.settings.tts_rate_limit_retries
+        for attempt in range(retries + 1):
+            lease_id = self.acquire()
+            throttled = False
+            try:
+                return fn()
+            except RateLimitedError:
+                throttled = True
+                if attempt == retries:
+                    raise
+            finally:
+                self.release(lease_id, throttled)
+
+    async def call_async(self, fn: Callable[[], Awaitable[T]]) -> T:
+        if not self.enabled:
+            return await fn()
+
+        retries = self.settings.tts_rate_limit_retries
+        for attempt in range(retries + 1):
+            lease_id = await self.acquire_async()
+            throttled = False
+            try:
+                return await fn()
+            except RateLimitedError:
+                throttled = True
+                if attempt == retries:
+                    raise
+            finally:
+                await asyncio.to_thread(self.release, lease_id, throttled)
+
+    def stats(self) -> dict:
+        client = _redis()
+        now_ms = int(time.time() * 1000)
+        client.zremrangebyscore(_LEASES_KEY, "-inf", now_ms)
+        limit, tokens = client.hmget(_STATE_KEY, "limit", "tokens")
+        # 막 끝난 1초 동안 시작한 호출 수
+        last_second = client.get(f"{_COUNT_PREFIX}{now_ms // 1000 - 1}")
+        return {
+            "enabled": self.enabled,
+            "rate_limit_per_second": self.rate,
+            "current_rate_per_second": int(last_second or 0),
+            "tokens": float(tokens) if tokens is not None else float(self.settings.tts_rate_limit_burst),
+            "concurrency_limit": float(limit) if limit is not None else float(self.settings.tts_concurrency_max),
+            "in_flight": client.zcard(_LEASES_KEY),
+            "waiting": max(0, int(client.get(_WAITING_KEY) or 0)),
+        }
+
+
+@lru_cache
+def get_rate_limiter() -> TtsRateLimiter:
+    return TtsRateLimiter(TtsRateLimitSettings())
@@ -4,9 +4,76 @@ from ..config import EnvBaseSettings
 
 
 class TtsSettings(EnvBaseSettings):
-    """Google TTS 관련 설정.
+    """TTS 관련 설정.
 
-    - google_tts_api_key: Google Cloud Text-to-Speech API 키
+    - tts_backend: 합성 엔진. "google" 또는 네트워크 없이 도는 "local" (부하 테스트용)
+    - google_tts_api_key: Google Cloud Text-to-Speech API 키 (google 엔진일 때 필요)
+    - tts_language_code / tts_voice_name: 기본 음성
+    - tts_max_ssml_bytes: 요청 하나에 담을 SSML 최대 바이트 (API 제한은 5000)
+    - tts_max_parallel_requests: 긴 섹션을 나눠 동시에 보낼 최대 요청 수
+    - tts_local_*: local 엔진의 글자당 길이와 인위적인 지연(ms)
     """
 
-    google_tts_api_key: str
+    tts_backend: str = "google"
+    google_tts_api_key: str | None = None
+    tts_language_code: str = "ko-KR"
+    tts_voice_name: str = "ko-KR-Wavenet-C"
+    tts_max_ssml_bytes: int = 4500
+    tts_max_parallel_requests: int = 8
+    tts_local_seconds_per_char: float = 0.12
+    tts_local_latency_ms: int = 0
+    tts_local_latency_jitter_ms: int = 0
+
+
+class TtsCacheSettings(EnvBaseSettings):
+    """TTS 합성 결과 캐시 설정.
+
+    - tts_cache_enabled: 캐시 사용 여부
+    - tts_cache_max_bytes: 캐시된 MP3 의 총 크기 상한. 넘으면 오래 안 쓴 것부터 지운다.
+    - tts_cache_max_age_seconds: 마지막 사용 후 이 시간이 지나면 지운다.
+    - tts_cache_prefix: voice 버킷 안의 오브젝트 prefix
+    """
+
+    tts_cache_enabled: bool = True
+    tts_cache_max_bytes: int = 1024 * 1024 * 1024
+    tts_cache_max_age_seconds: int = 30 * 24 * 60 * 60
+    tts_cache_prefix: str = "tts/cache"
+
+
+class TtsRateLimitSettings(EnvBaseSettings):
+    """TTS 호출 제한 설정. API 와 워커 프로세스가 Redis 로 공유한다.
+
+    - tts_rate_limit_per_minute / tts_rate_limit_burst: 토큰 버킷 (quota 에 맞춘다)
+    - tts_concurrency_min / max: 동시 실행 수 상한의 범위. 처음에는 max 로 시작한다.
+    - tts_concurrency_increase: 성공할 때마다 limit 에 increase / limit 만큼 더한다.
+    - tts_concurrency_decrease: quota 오류가 나면 limit 에 곱한다.
+    - tts_concurrency_cooldown_ms: 이 시간 안의 quota 오류는 한 번만 반영한다.
+    - tts_rate_limit_lease_ms: 프로세스가 죽어도 슬롯이 풀리도록 하는 만료 시간
+    - tts_rate_limit_timeout_seconds: 슬롯을 기다리는 최대 시간
+    - tts_rate_limit_retries: quota 오류 시 슬롯을 다시 잡아 재시도하는 횟수
+    """
+
+    tts_rate_limit_enabled: bool = True
+    tts_rate_limit_per_minute: int = 1000
+    tts_rate_limit_burst: int = 20
+    tts_concurrency_min: int = 1
+    tts_concurrency_max: int = 32
+    tts_concurrency_increase: float = 1.0
+    tts_concurrency_decrease: float = 0.5
+    tts_concurrency_cooldown_ms: int = 1000
+    tts_rate_limit_lease_ms: int = 60_000
+    tts_rate_limit_timeout_seconds: float = 120.0
+    tts_rate_limit_retries: int = 3
+
+
+class TtsSingleFlightSettings(EnvBaseSettings):
+    """같은 합성 요청을 하나로 합치는 설정.
+
+    - tts_singleflight_lease_ms: leader lease 의 만료 시간. leader 가 작업하는 동안 이 시간의 1/3 마다 연장하므로
+      작업 시간과 상관없고, leader 프로세스가 죽었을 때 다른 프로세스가 기다리는 최대 시간이 된다.
+    - tts_singleflight_poll_ms: lease 가 풀렸는지 확인하는 간격
+    """
+
+    tts_singleflight_enabled: bool = True
+    tts_singleflight_lease_ms: int = 60_000
+    tts_singleflight_poll_ms: int = 50
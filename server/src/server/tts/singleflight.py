@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import threading
+import time
+import uuid
+import weakref
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+from .settings import TtsSingleFlightSettings
+
+T = TypeVar("T")
+
+_LEASE_PREFIX = "tts:singleflight:"
+
+# 내 lease 일 때만 지운다.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# 내 lease 일 때만 만료 시간을 늘린다.
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def _redis():
+    # server.redis 는 server.tts 를 import 하므로 순환 import 를 피하려고 지연 import 한다.
+    from server.redis.redis_client import get_client
+
+    return get_client()
+
+
+class SingleFlight:
+    """같은 키의 작업이 동시에 여러 번 요청되면 한 번만 실행한다.
+
+    - 같은 프로세스 안에서는 먼저 온 호출(leader)의 결과를 나머지가 그대로 받는다.
+    - 다른 프로세스끼리는 Redis lease 로 leader 를 하나만 정한다. lease 를 못 잡은 쪽은
+      lease 가 풀릴 때까지 기다렸다가 lookup(캐시 조회)으로 결과를 가져오고,
+      그래도 없으면 (leader 가 실패했거나 캐시를 끈 경우) 다시 leader 가 되려고 한다.
+    """
+
+    def __init__(self, settings: TtsSingleFlightSettings):
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+        # 이벤트 루프마다 진행 중인 작업
+        self._async_calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Future]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._release = None
+        self._renew = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.tts_singleflight_enabled
+
+    def _try_lease(self, key: str, token: str) -> bool:
+        return bool(_redis().set(
+            _LEASE_PREFIX + key, token, nx=True, px=self.settings.tts_singleflight_lease_ms
+        ))
+
+    def _release_lease(self, key: str, token: str) -> None:
+        if self._release is None:
+            self._release = _redis().register_script(_RELEASE_SCRIPT)
+        self._release(keys=[_LEASE_PREFIX + key], args=[token])
+
+    def _renew_lease(self, key: str, token: str) -> bool:
+        if self._renew is None:
+            self._renew = _redis().register_script(_RENEW_SCRIPT)
+        return bool(self._renew(keys=[_LEASE_PREFIX + key], args=[token, self.settings.tts_singleflight_lease_ms]))
+
+    def _lease_held(self, key: str) -> bool:
+        return bool(_redis().exists(_LEASE_PREFIX + key))
+
+    @property
+    def _renew_interval(self) -> float:
+        return self.settings.tts_singleflight_lease_ms / 3 / 1000
+
+    @contextlib.contextmanager
+    def _heartbeat(self, key: str, token: str) -> Iterator[None]:
+        """fn 이 도는 동안 lease 를 연장한다. leader 가 속도 제한을 오래 기다려도 lease 가 만료되지 않는다."""
+        stop = threading.Event()
+
+        def renew():
+            while not stop.wait(self._renew_interval):
+                if not self._renew_lease(key, token):
+                    return
+
+        thread = threading.Thread(target=renew, name=f"singleflight-lease:{key}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    async def _heartbeat_async(self, key: str, token: str) -> None:
+        while True:
+            await asyncio.sleep(self._renew_interval)
+            if not await asyncio.to_thread(self._renew_lease, key, token):
+                return
+
+    def _run(self, key: str, fn: Callable[[], T], lookup: Callable[[], Optional[T]]) -> T:
+        token = uuid.uuid4().hex
+        poll = self.settings.tts_singleflight_poll_ms / 1000
+        while True:
+            if self._try_lease(key, token):
+                try:
+                    with self._heartbeat(key, token):
+                        return fn()
+                finally:
+                    self._release_lease(key, token)
+
+            while self._lease_held(key):
+                time.sleep(poll)
+            result = lookup()
+            if result is not None:
+                return result
+
+    async def _run_async(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        lookup: Callable[[], Awaitable[Optional[T]]],
+    ) -> T:
+        token = uuid.uuid4().hex
+        poll = self.settings.tts_singleflight_poll_ms / 1000
+        while True:
+            if await asyncio.to_thread(self._try_lease, key, token):
+                heartbeat = asyncio.create_task(self._heartbeat_async(key, token))
+                try:
+                    return await fn()
+                finally:
+                    heartbeat.cancel()
+                    await asyncio.to_thread(self._release_lease, key, token)
+
+            while await asyncio.to_thread(self._lease_held, key):
+                await asyncio.sleep(poll)
+            result = await lookup()
+            if result is not None:
+                return result
+
+    def do(self, key: str, fn: Callable[[], T], lookup: Callable[[], Optional[T]]) -> T:
+        if not self.enabled:
+            return fn()
+
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._run(key, fn, lookup)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def do_async(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        lookup: Callable[[], Awaitable[Optional[T]]],
+    ) -> T:
+        if not self.enabled:
+            return await fn()
+
+        calls = self._async_calls.setdefault(asyncio.get_running_loop(), {})
+        while (future := calls.get(key)) is not None:
+            try:
+                # 따라온 쪽이 취소돼도 공유 future 는 취소되지 않도록 shield 한다.
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # leader 가 취소된 것이면 따라온 쪽은 취소된 게 아니므로 다시 leader 가 되려고 한다.
+                if not future.cancelled() or asyncio.current_task().cancelling():
+                    raise
+
+        future = calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await self._run_async(key, fn, lookup)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없으면 "exception was never retrieved" 경고가 나지 않게 한다.
+            future.exception()
+            raise
+        finally:
+            del calls[key]
+
+
+@lru_cache
+def get_single_flight() -> SingleFlight:
+    return SingleFlight(TtsSingleFlightSettings())
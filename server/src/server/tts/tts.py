@@ -1,10 +1,17 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List
 
-from google.api_core.client_options import ClientOptions
-from google.cloud import texttospeech_v1beta1 as texttospeech
 from pydantic import BaseModel
 
+from ..audio import mp3
+from .backends import get_backend
+from .cache import get_tts_cache, make_cache_key
+from .rate_limit import get_rate_limiter
 from .settings import TtsSettings
+from .singleflight import get_single_flight
+from .types import SynthesisRequest, SynthesisResult
 
 class Word(BaseModel):
     text: str
@@ -45,77 +52,183 @@ def build_ssml(text: str) -> str:
     return "".join(parts)
 
 
-def _build_client() -> texttospeech.TextToSpeechClient:
-    settings = TtsSettings()
-    api_key = settings.google_tts_api_key
-    return texttospeech.TextToSpeechClient(
-        client_options=ClientOptions(api_key=api_key)
-    )
+# 문장 끝으로 보는 어절 끝 문자
+_SENTENCE_ENDINGS = (".", "!", "?", "。", "！", "？", "…")
+
+_SSML_OVERHEAD = len("<speak></speak>")
+
+
+def _mark_size(index: int, text: str) -> int:
+    # build_ssml 이 어절 하나에 쓰는 '<mark name="wN"/>어절 ' 의 바이트 수
+    return len(f'<mark name="w{index}"/>{text} '.encode("utf-8"))
+
+
+def plan_chunks(words: List[Word], max_ssml_bytes: int) -> list[range]:
+    """words 를 SSML 크기 제한 안에서 나눈다.
+
+    가능하면 문장 끝에서 자르고, 한 문장이 제한을 넘으면 어절(mark) 경계에서 자른다.
+    각 청크의 mark 이름은 청크 안에서 w0 부터 다시 매긴다.
+    """
+
+    chunks: list[range] = []
+    start = 0
+    size = _SSML_OVERHEAD
+    # 현재 청크 안의 마지막 문장 끝 (다음 어절 index)
+    boundary: int | None = None
+
+    for i, w in enumerate(words):
+        cost = _mark_size(i - start, w.text)
+        while size + cost > max_ssml_bytes and i > start:
+            cut = boundary if boundary is not None else i
+            chunks.append(range(start, cut))
+            start = cut
+            boundary = None
+            size = _SSML_OVERHEAD + sum(_mark_size(j - start, words[j].text) for j in range(start, i))
+            cost = _mark_size(i - start, w.text)
+
+        size += cost
+        if w.text.endswith(_SENTENCE_ENDINGS):
+            boundary = i + 1
+
+    if start < len(words):
+        chunks.append(range(start, len(words)))
+    return chunks
+
+
+@lru_cache
+def get_settings() -> TtsSettings:
+    return TtsSettings()
 
 
 def list_voices(prefix: str | None = None) -> List[str]:
-    """Return available TTS voices as a plain list of dicts.
+    """Return available TTS voice names.
 
     Args:
         prefix: If given, only voices whose name starts with this prefix
             will be returned (for example, "ko-" for Korean voices).
+    """
+
+    voices = get_backend().list_voices()
+    return [v for v in voices if not prefix or v.startswith(prefix)]
+
+
+async def list_voices_async(prefix: str | None = None) -> List[str]:
+    voices = await get_backend().list_voices_async()
+    return [v for v in voices if not prefix or v.startswith(prefix)]
+
+
+def _request(ssml: str, voice_name: str | None = None) -> SynthesisRequest:
+    settings = get_settings()
+    return SynthesisRequest(
+        ssml=ssml,
+        language_code=settings.tts_language_code,
+        # list_voices 로 조회한 음성 이름
+        voice_name=voice_name or settings.tts_voice_name,
+    )
+
+
+def synthesize_ssml(request: SynthesisRequest) -> SynthesisResult:
+    """SSML 하나를 합성한다.
 
-    Returns:
-        List of voice metadata dictionaries with keys:
-        name, language_codes, gender, sample_rate_hz.
+    같은 SSML/음성/설정의 결과가 캐시에 있으면 엔진을 부르지 않고, 같은 요청이 동시에
+    진행 중이면 (다른 프로세스라도) 그 결과를 함께 쓴다.
     """
 
-    client = _build_client()
-    response = client.list_voices()
+    backend = get_backend()
+    cache = get_tts_cache()
+    key = make_cache_key(request, backend.name)
 
-    voices: List[str] = []
-    for v in response.voices:
-        if prefix and not v.name.startswith(prefix):
-            continue
-        
-        if v.name.startswith("ko-KR-Chirp3-"):
-            voices.append(v.name)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
 
-    return voices
+    def run() -> SynthesisResult:
+        result = get_rate_limiter().call(lambda: backend.synthesize(request))
+        cache.put(key, result)
+        return result
 
+    return get_single_flight().do(key, run, lambda: cache.get(key))
 
 
-def synthesize_words_to_mp3(words: List[Word]) -> dict:
-    client = _build_client()
+async def synthesize_ssml_async(request: SynthesisRequest) -> SynthesisResult:
+    """synthesize_ssml 의 비동기 버전. 캐시(Redis/S3) 접근만 스레드로 넘긴다."""
 
-    synthesis_input = texttospeech.SynthesisInput(ssml=build_ssml(" ".join([w.text for w in words])))
+    backend = get_backend()
+    cache = get_tts_cache()
+    key = make_cache_key(request, backend.name)
 
-    voice = texttospeech.VoiceSelectionParams(
-        language_code="ko-KR",
-        # Replace this with a concrete voice name from list_google_tts_voices
-        name="ko-KR-Wavenet-C",
-    )
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+        return cached
 
-    audio_config = texttospeech.AudioConfig(
-        audio_encoding=texttospeech.AudioEncoding.MP3,
-    )
+    async def run() -> SynthesisResult:
+        result = await get_rate_limiter().call_async(lambda: backend.synthesize_async(request))
+        await asyncio.to_thread(cache.put, key, result)
+        return result
 
-    response = client.synthesize_speech(
-        request=texttospeech.SynthesizeSpeechRequest(
-            input=synthesis_input,
-            voice=voice,
-            audio_config=audio_config,
-            enable_time_pointing=[
-                texttospeech.SynthesizeSpeechRequest.TimepointType.SSML_MARK
-            ],
-        )
-    )
+    return await get_single_flight().do_async(key, run, lambda: asyncio.to_thread(cache.get, key))
+
+
+def _stitch_chunks(words: List[Word], chunks: list[range], results: list[SynthesisResult]) -> bytes:
+    """청크별 MP3 프레임을 이어 붙이고, timepoints 를 앞 청크 길이만큼 밀어서 words 에 적용한다."""
+
+    if len(results) == 1:
+        parts = [results[0].audio_content]
+    else:
+        parts = [mp3.strip_headers(result.audio_content) for result in results]
+
+    offset = 0.0
+    for chunk, result, part in zip(chunks, results, parts):
+        for local_index, i in enumerate(chunk):
+            start = result.timepoints.get(f"w{local_index}")
+            if start is not None:
+                words[i].start = offset + start
+        offset += mp3.duration_seconds(part)
+
+    return b"".join(parts)
+
+
+def _chunk_requests(words: List[Word], voice_name: str | None) -> tuple[list[range], list[SynthesisRequest]]:
+    chunks = plan_chunks(words, get_settings().tts_max_ssml_bytes)
+    requests = [_request(build_ssml(" ".join(words[i].text for i in chunk)), voice_name) for chunk in chunks]
+    return chunks, requests
+
+
+def synthesize_words_to_mp3(words: List[Word], voice_name: str | None = None) -> dict:
+    """words 를 합성한다. 긴 섹션은 SSML 크기 제한에 맞게 나눠서 동시에 합성한 뒤 이어 붙인다."""
+
+    chunks, requests = _chunk_requests(words, voice_name)
+
+    if len(requests) <= 1:
+        results = [synthesize_ssml(request) for request in requests]
+    else:
+        workers = min(len(requests), get_settings().tts_max_parallel_requests)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(synthesize_ssml, requests))
+
+    return {
+        "audio_content": _stitch_chunks(words, chunks, results),
+        "words": words,
+    }
+
+
+async def synthesize_words_to_mp3_async(words: List[Word], voice_name: str | None = None) -> dict:
+    """synthesize_words_to_mp3 의 비동기 버전. 청크들은 하나의 이벤트 루프에서 동시에 요청한다."""
+
+    chunks, requests = _chunk_requests(words, voice_name)
+
+    semaphore = asyncio.Semaphore(get_settings().tts_max_parallel_requests)
+
+    async def run(request: SynthesisRequest) -> SynthesisResult:
+        async with semaphore:
+            return await synthesize_ssml_async(request)
 
-    # time_points를 words.start에 적용
-    for tp in response.timepoints:
-        for i, w in enumerate(words):
-            if tp.mark_name == f"w{i}":
-                w.start = tp.time_seconds
-                break
-        
+    results = await asyncio.gather(*(run(request) for request in requests))
+    # 프레임 파싱은 CPU 작업이라 이벤트 루프 밖에서 한다.
+    audio_content = await asyncio.to_thread(_stitch_chunks, words, chunks, list(results))
 
     return {
-        "audio_content": response.audio_content,
+        "audio_content": audio_content,
         "words": words,
     }
 
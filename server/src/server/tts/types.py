@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+
+
+class SynthesisRequest(BaseModel):
+    """백엔드에 보내는 합성 요청 하나.
+
+    - ssml: build_ssml 로 만든 SSML (mark 포함)
+    - language_code / voice_name: 음성
+    - audio_encoding: 출력 형식 (현재는 MP3 만 쓴다)
+    """
+
+    ssml: str
+    language_code: str
+    voice_name: str
+    audio_encoding: str = "MP3"
+
+
+class SynthesisResult(BaseModel):
+    """SSML 한 번을 합성한 결과.
+
+    - audio_content: MP3 바이트
+    - timepoints: SSML mark 이름 -> 시작 시각(초)
+    """
+
+    audio_content: bytes
+    timepoints: dict[str, float]
@@ -0,0 +1,88 @@
+"""TTS 작업 actor.
+
+워커 실행:
+    dramatiq server.worker.actors --processes 4 --threads 4
+
+재시도를 모두 소진한 메시지는 dramatiq 의 dead-letter 큐(tts.XQ)로 옮겨진다.
+"""
+
+import asyncio
+import logging
+import random
+
+import dramatiq
+from dramatiq.rate_limits import ConcurrentRateLimiter
+
+from server.database.session import SessionLocal
+from server.service.tts import generate_speech_section_audio
+
+from .broker import rate_limit_backend
+from .jobs import JobStatus, create_job, get_settings, update_job
+
+logger = logging.getLogger(__name__)
+
+_settings = get_settings()
+
+def _project_limiter(project_id: str) -> ConcurrentRateLimiter:
+    return ConcurrentRateLimiter(
+        rate_limit_backend,
+        f"tts-project:{project_id}",
+        limit=_settings.tts_job_project_concurrency,
+        ttl=_settings.tts_job_time_limit_ms,
+    )
+
+
+@dramatiq.actor(
+    queue_name="tts",
+    max_retries=_settings.tts_job_max_retries,
+    min_backoff=_settings.tts_job_min_backoff_ms,
+    max_backoff=_settings.tts_job_max_backoff_ms,
+    time_limit=_settings.tts_job_time_limit_ms,
+)
+def generate_section_audio(job_id: str, project_id: str, section_id: str) -> None:
+    with _project_limiter(project_id).acquire(raise_on_failure=False) as acquired:
+        if not acquired:
+            # 프로젝트의 다른 작업이 끝날 때까지 미룬다. 재시도 미들웨어를 거치지 않으므로
+            # 재시도 횟수(tts_job_max_retries)는 실제로 실패했을 때만 줄어든다.
+            _send(job_id, project_id, section_id, delay=random.randint(
+                _settings.tts_job_min_backoff_ms, 2 * _settings.tts_job_min_backoff_ms
+            ))
+            return
+        update_job(job_id, JobStatus.running)
+        db = SessionLocal()
+        try:
+            section = asyncio.run(generate_speech_section_audio(db, project_id, section_id))
+        except Exception as e:
+            update_job(job_id, JobStatus.retrying, error=str(e))
+            raise
+        finally:
+            db.close()
+
+    if section is None:
+        # 섹션이 그 사이 지워졌으면 재시도할 의미가 없다.
+        update_job(job_id, JobStatus.failed, error="Speech section not found")
+        return
+    update_job(job_id, JobStatus.succeeded)
+
+
+@dramatiq.actor(queue_name="tts")
+def mark_job_failed(message_data: dict, exception_data: dict) -> None:
+    """재시도를 모두 소진해 dead-letter 큐로 간 작업의 상태를 남긴다."""
+    job_id = message_data["args"][0]
+    update_job(job_id, JobStatus.failed, error=exception_data.get("message"))
+
+
+def enqueue_section_audio(project_id: str, section_id: str):
+    """섹션 오디오 생성 작업을 큐에 넣고 바로 job 을 돌려준다."""
+    job, created = create_job(project_id, section_id)
+    if created:
+        _send(job.id, project_id, section_id)
+    return job
+
+
+def _send(job_id: str, project_id: str, section_id: str, delay: int | None = None) -> None:
+    generate_section_audio.send_with_options(
+        args=(job_id, project_id, section_id),
+        delay=delay,
+        on_failure=mark_job_failed,
+    )
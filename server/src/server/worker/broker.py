@@ -0,0 +1,22 @@
+import dramatiq
+from dramatiq.brokers.redis import RedisBroker
+from dramatiq.rate_limits.backends import RedisBackend
+
+from server.redis.redis_settings import RedisSettings
+
+# API 프로세스(enqueue)와 워커 프로세스가 같은 Redis 를 브로커로 쓴다.
+_settings = RedisSettings()
+
+broker = RedisBroker(
+    host=_settings.redis_host,
+    port=_settings.redis_port,
+    db=_settings.redis_db,
+)
+dramatiq.set_broker(broker)
+
+# 프로젝트별 동시 실행 제한에 쓰는 백엔드
+rate_limit_backend = RedisBackend(
+    host=_settings.redis_host,
+    port=_settings.redis_port,
+    db=_settings.redis_db,
+)
@@ -0,0 +1,57 @@
+"""만료된 파일 정리.
+
+직접 실행:
+    python -m server.worker.gc --dry-run
+
+워커로 실행할 때는 collect_expired_files_job 을 주기적으로 enqueue 한다. (cron 등)
+"""
+
+import argparse
+import dataclasses
+import json
+import logging
+
+import dramatiq
+
+from server.database.session import SessionLocal
+from server.service.file_gc import GcReport, collect_expired_files
+
+from . import broker  # noqa: F401  브로커 설정
+from .jobs import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def run(dry_run: bool = False) -> GcReport:
+    settings = get_settings()
+    db = SessionLocal()
+    try:
+        return collect_expired_files(
+            db,
+            dry_run=dry_run,
+            batch_size=settings.gc_batch_size,
+            pause_seconds=settings.gc_batch_pause_ms / 1000,
+            grace_days=settings.gc_grace_days,
+        )
+    finally:
+        db.close()
+
+
+@dramatiq.actor(queue_name="maintenance", max_retries=0, time_limit=60 * 60_000)
+def collect_expired_files_job(dry_run: bool = False) -> None:
+    report = run(dry_run)
+    logger.info("file gc finished: %s", json.dumps(dataclasses.asdict(report), default=str))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="delete_date 가 지난 파일을 정리한다.")
+    parser.add_argument("--dry-run", action="store_true", help="지우지 않고 대상만 보고한다.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    report = run(args.dry_run)
+    print(json.dumps(dataclasses.asdict(report), default=str, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from enum import Enum
+from functools import lru_cache
+from typing import Optional
+
+from pydantic import BaseModel
+
+from server.redis.redis_client import get_client
+
+from .settings import WorkerSettings
+
+
+class JobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    retrying = "retrying"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class TtsJob(BaseModel):
+    id: str
+    project_id: str
+    section_id: str
+    status: JobStatus
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+
+@lru_cache
+def get_settings() -> WorkerSettings:
+    return WorkerSettings()
+
+
+_FINISHED = (JobStatus.succeeded, JobStatus.failed)
+
+# 키 값이 읽어 둔 값과 같을 때만 바꾼다. 읽어 둔 값이 "" 이면 키가 없을 때만 쓴다.
+_COMPARE_AND_SET_SCRIPT = """
+if (redis.call('GET', KEYS[1]) or '') == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# 키 값이 읽어 둔 값과 같을 때만 지운다.
+_COMPARE_AND_DELETE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _job_key(job_id: str) -> str:
+    return f"tts:job:{job_id}"
+
+
+def _section_job_key(section_id: str) -> str:
+    """섹션의 마지막 작업 id. 작업 상태는 작업마다 따로 있다."""
+    return f"tts:job:section:{section_id}"
+
+
+def _compare_and_set(key: str, expected: Optional[str], value: str) -> bool:
+    script = get_client().register_script(_COMPARE_AND_SET_SCRIPT)
+    return bool(script(keys=[key], args=[expected or "", value, get_settings().tts_job_status_ttl_seconds]))
+
+
+def _compare_and_delete(key: str, expected: str) -> None:
+    get_client().register_script(_COMPARE_AND_DELETE_SCRIPT)(keys=[key], args=[expected])
+
+
+def get_job(job_id: str) -> Optional[TtsJob]:
+    data = get_client().get(_job_key(job_id))
+    if data is None:
+        return None
+    return TtsJob.model_validate(json.loads(data))
+
+
+def create_job(project_id: str, section_id: str) -> tuple[TtsJob, bool]:
+    """섹션 작업을 하나 만든다.
+
+    같은 섹션의 작업이 아직 끝나지 않았으면 새로 만들지 않고 그 작업을 돌려준다.
+    (연타된 "전체 생성" 요청이 같은 작업을 여러 번 쌓지 않도록)
+    작업마다 새 id 로 기록하므로 끝나 가는 이전 작업의 상태를 덮어쓰지 않는다.
+
+    Returns:
+        (job, created)
+    """
+
+    now = time.time()
+    job = TtsJob(
+        id=uuid.uuid4().hex,
+        project_id=project_id,
+        section_id=section_id,
+        status=JobStatus.queued,
+        created_at=now,
+        updated_at=now,
+    )
+
+    # 섹션이 새 작업을 가리키기 전에 작업 기록부터 둔다. 다른 요청이 기록 없는 작업 id 를 끝난 작업으로 보지 않도록.
+    # 새 id 라서 NX 는 다른 작업의 기록을 덮어쓰지 않기 위한 안전장치다.
+    client = get_client()
+    client.set(_job_key(job.id), job.model_dump_json(), nx=True, ex=get_settings().tts_job_status_ttl_seconds)
+    while True:
+        existing_id = client.get(_section_job_key(section_id))
+        existing = get_job(existing_id) if existing_id else None
+        if existing is not None and existing.status not in _FINISHED:
+            client.delete(_job_key(job.id))
+            return existing, False
+        # 읽은 사이 다른 요청이 섹션에 작업을 걸었으면 다시 본다.
+        if _compare_and_set(_section_job_key(section_id), existing_id, job.id):
+            return job, True
+
+
+def update_job(job_id: str, status: JobStatus, error: Optional[str] = None) -> Optional[TtsJob]:
+    """작업 상태를 바꾼다. 끝난 작업(succeeded/failed)은 늦게 온 메시지가 되돌리지 않는다."""
+    while True:
+        data = get_client().get(_job_key(job_id))
+        if data is None:
+            return None
+        job = TtsJob.model_validate(json.loads(data))
+        if job.status in _FINISHED:
+            return job
+
+        job.status = status
+        job.error = error
+        job.updated_at = time.time()
+        if status == JobStatus.running:
+            job.attempts += 1
+        # 읽은 사이 다른 갱신이 있었으면 다시 읽는다.
+        if _compare_and_set(_job_key(job_id), data, job.model_dump_json()):
+            break
+
+    if status in _FINISHED:
+        # 끝난 작업은 섹션의 진행 중 작업에서 뺀다. (다른 작업으로 바뀌었으면 건드리지 않는다)
+        _compare_and_delete(_section_job_key(job.section_id), job.id)
+    return job
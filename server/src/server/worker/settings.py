@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from ..config import EnvBaseSettings
+
+
+class WorkerSettings(EnvBaseSettings):
+    """dramatiq 워커(TTS 작업 큐) 설정.
+
+    - tts_job_max_retries: 실패한 작업의 최대 재시도 횟수. 넘으면 dead-letter 큐로 간다.
+    - tts_job_min_backoff_ms / tts_job_max_backoff_ms: 재시도 지수 백오프 범위
+    - tts_job_time_limit_ms: 작업 하나의 최대 실행 시간
+    - tts_job_project_concurrency: 한 프로젝트에서 동시에 실행되는 작업 수 상한
+    - tts_job_status_ttl_seconds: 작업 상태를 Redis 에 보관하는 시간
+    - gc_batch_size: 파일 정리 때 한 번에 읽고 지우는 files 행 수
+    - gc_batch_pause_ms: 배치 사이에 쉬는 시간 (저장소/DB 부하 조절)
+    - gc_grace_days: delete_date 가 지나고 이 일수만큼 더 기다린 뒤 지운다.
+    """
+
+    tts_job_max_retries: int = 5
+    tts_job_min_backoff_ms: int = 1_000
+    tts_job_max_backoff_ms: int = 5 * 60_000
+    tts_job_time_limit_ms: int = 10 * 60_000
+    tts_job_project_concurrency: int = 2
+    tts_job_status_ttl_seconds: int = 24 * 60 * 60
+    gc_batch_size: int = 1000
+    gc_batch_pause_ms: int = 200
+    gc_grace_days: int = 1
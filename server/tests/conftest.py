@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def redis_client():
+    """프로세스 안에서 도는 Redis. Lua 스크립트도 돌린다."""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis(decode_responses=True)
+    yield client
+    client.flushall()
+
+
+@pytest.fixture
+def database_url():
+    """TEST_DATABASE_URL 의 Postgres (postgresql+psycopg2://...). 테이블을 새로 만들고, 끝나면 지운다.
+
+    JSONB, jsonpath, 행 값 비교 등 Postgres 기능을 쓰므로 SQLite 로 대신하지 않는다. 없으면 건너뛴다.
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from sqlalchemy import create_engine
+    from server.database.models import Base
+
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield url
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(database_url):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    engine = create_engine(database_url)
+    with Session(engine, autoflush=False) as session:
+        yield session
+    engine.dispose()
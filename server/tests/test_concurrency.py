@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from server.common.exception import ConflictError
+from server.common.retry import retry_on_conflict
+from server.repositories import ProjectModelRepository, ProjectRepository, SectionRepository
+from server.service.project_types import BlankSection, Media, Project
+
+
+@pytest.fixture
+def other(database_url):
+    """같은 행을 동시에 고치는 다른 요청의 세션"""
+    engine = create_engine(database_url)
+    with Session(engine, autoflush=False) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def project(db):
+    body = Project(id="p", title="t", sections=[BlankSection(id="s1", duration=1.0)], scenes=[], media=[])
+    return ProjectModelRepository(db).create("p", body)
+
+
+def _media(id: str) -> Media:
+    return Media(id=id, name=id, content_type="image/png", size=1, file_id=id)
+
+
+def test_update_checks_expected_version(db, project):
+    repo = ProjectRepository(db)
+    with pytest.raises(ConflictError):
+        repo.update("p", expected_version=project.version + 1, body={"title": "x", "media": []})
+    assert repo.update("p", expected_version=project.version, body={"title": "x", "media": []}).version == 2
+    assert repo.update("없음", body={}) is None
+
+
+def test_stale_read_modify_write_conflicts(db, other, project):
+    # 이 세션이 version 1 을 읽어 들고 있다. (참조를 놓으면 세션이 잊어버린다)
+    stale = ProjectRepository(db).get("p")
+    assert stale.version == 1
+    assert ProjectModelRepository(other).add_media("p", _media("m1"))
+
+    with pytest.raises(ConflictError):
+        ProjectModelRepository(db).set_title("p", "새 제목")
+    # 다른 요청이 붙인 media 를 덮어쓰지 않았다.
+    record = ProjectModelRepository(other).get("p")
+    assert (record.body.title, [m.id for m in record.body.media], record.version) == ("t", ["m1"], 2)
+
+
+def test_retry_on_conflict_rereads(db, other, project):
+    stale = ProjectRepository(db).get("p")
+    ProjectModelRepository(other).add_media("p", _media("m1"))
+    calls = []
+
+    def set_title():
+        calls.append(stale.version)
+        return ProjectModelRepository(db).set_title("p", "새 제목")
+
+    summary = asyncio.run(retry_on_conflict(db, set_title))
+    assert summary.title == "새 제목"
+    # 처음에는 낡은 버전으로 써서 충돌하고, rollback 뒤 다시 읽어서 쓴다.
+    assert calls == [1, 2]
+    record = ProjectModelRepository(other).get("p")
+    assert (record.body.title, [m.id for m in record.body.media], record.version) == ("새 제목", ["m1"], 3)
+
+
+def test_retry_on_conflict_gives_up(db, monkeypatch):
+    monkeypatch.setattr("server.common.retry.BASE_DELAY", 0)
+    calls = []
+
+    def always_conflicts():
+        calls.append(1)
+        raise ConflictError("project was modified")
+
+    with pytest.raises(ConflictError):
+        asyncio.run(retry_on_conflict(db, always_conflicts, attempts=3))
+    assert len(calls) == 3
+
+
+def test_concurrent_appends_do_not_conflict(db, other, project):
+    assert ProjectModelRepository(db).add_media("p", _media("m1"))
+    assert ProjectModelRepository(other).add_media("p", _media("m2"))
+    assert not ProjectModelRepository(db).add_media("없음", _media("m3"))
+    record = ProjectModelRepository(db).get("p")
+    assert ([m.id for m in record.body.media], record.version) == (["m1", "m2"], 3)
+
+
+def test_project_update_checks_expected_version(db, project):
+    repo = ProjectModelRepository(db)
+    body = project.body.model_copy(update={"title": "x"})
+    with pytest.raises(ConflictError):
+        repo.update("p", body, expected_version=2)
+    assert repo.update("p", body, expected_version=1).version == 2
+
+
+def test_section_replace_is_compare_and_swap(db, other, project):
+    mine = SectionRepository(db).get("p", "s1")
+    theirs = SectionRepository(other).get("p", "s1")
+    assert mine.version == theirs.version == 1
+
+    theirs.duration = 2.0
+    assert SectionRepository(other).replace("p", theirs)
+    assert theirs.version == 2
+
+    mine.duration = 3.0
+    with pytest.raises(ConflictError):
+        SectionRepository(db).replace("p", mine)
+    assert SectionRepository(db).get("p", "s1").duration == 2.0
+
+    # 버전 없이 쓰면 확인하지 않고 덮어쓴다.
+    mine.version = None
+    assert SectionRepository(db).replace("p", mine)
+    assert mine.version == 3
+
+
+def test_replace_missing_section_is_not_a_conflict(db, project):
+    assert not SectionRepository(db).replace("p", BlankSection(id="없음", duration=1.0, version=1))
+    assert SectionRepository(db).update("p", "s1", duration=5.0)
+    assert SectionRepository(db).get("p", "s1").version == 2
@@ -0,0 +1,74 @@
+from datetime import date, timedelta
+
+import pytest
+
+from server.database.models import FileModel, ProjectModel, SectionModel
+from server.repositories import FileRepository
+from server.service import file, file_gc
+
+OLD = date.today() - timedelta(days=10)
+
+
+@pytest.fixture
+def deleted_objects(monkeypatch):
+    deleted: list[str] = []
+    monkeypatch.setattr(file, "delete_objects", lambda bucket, object_names: deleted.extend(object_names))
+    return deleted
+
+
+def _file(id: str, delete_date: date = date.max) -> FileModel:
+    return FileModel(
+        id=id, project_id="p", delete_date=delete_date, bucket="media", object_name=f"obj/{id}", name=id, size=100
+    )
+
+
+@pytest.fixture
+def files(db):
+    db.add(ProjectModel(id="p", body={"title": "t", "media": [{"id": "m", "file_id": "in-body"}]}))
+    db.flush()
+    db.add(SectionModel(id="s", project_id="p", position="a", type="speech", file_id="in-section", data={}))
+    # 아직 쓰는 파일이 (delete_date, id) 순서의 맨 앞에 온다.
+    db.add_all([_file("in-body", OLD - timedelta(days=1)), _file("in-section", OLD - timedelta(days=1))])
+    # 같은 delete_date 끼리는 id 로 순서를 정한다.
+    db.add_all([_file(f"expired-{i}", OLD) for i in range(10)])
+    db.add_all([_file("recent", date.today()), _file("kept")])
+    db.commit()
+
+
+def _remaining(db) -> list[str]:
+    return sorted(id for (id,) in db.query(FileModel.id))
+
+
+def test_expired_page_walks_ties_in_order(db, files):
+    repo = FileRepository(db)
+    seen, after = [], None
+    while page := repo.get_expired_page(OLD, after=after, limit=4):
+        seen.extend(f.id for f in page)
+        after = (page[-1].delete_date, page[-1].id)
+    assert seen == ["in-body", "in-section"] + [f"expired-{i}" for i in range(10)]
+
+
+def test_collect_skips_referenced_files_without_rescanning(db, files, deleted_objects):
+    report = file_gc.collect_expired_files(db, batch_size=3, pause_seconds=0, grace_days=5)
+
+    # 지우지 않고 남겨 둔 행을 다시 읽지 않으므로 배치 네 번에 끝난다.
+    assert (report.batches, report.scanned, report.skipped_referenced) == (4, 12, 2)
+    assert (report.deleted_files, report.deleted_objects, report.released_bytes) == (10, 10, 1000)
+    assert sorted(deleted_objects) == sorted(f"obj/expired-{i}" for i in range(10))
+    assert _remaining(db) == ["in-body", "in-section", "kept", "recent"]
+
+
+def test_collect_respects_grace_days_and_max_batches(db, files, deleted_objects):
+    assert file_gc.collect_expired_files(db, pause_seconds=0, grace_days=30).scanned == 0
+    report = file_gc.collect_expired_files(db, batch_size=3, pause_seconds=0, grace_days=5, max_batches=2)
+    assert (report.batches, report.deleted_files) == (2, 4)
+    assert len(_remaining(db)) == 10
+
+
+def test_dry_run_deletes_nothing(db, files, deleted_objects):
+    report = file_gc.collect_expired_files(db, dry_run=True, batch_size=5, pause_seconds=0, grace_days=5)
+    assert report.dry_run
+    assert (report.scanned, report.deleted_files, report.released_bytes) == (12, 10, 1000)
+    assert report.sample == [f"obj/expired-{i}" for i in range(10)]
+    assert deleted_objects == []
+    assert len(_remaining(db)) == 14
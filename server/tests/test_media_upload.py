@@ -0,0 +1,67 @@
+import math
+
+import pytest
+
+from server.common.exception import InvalidInputError
+from server.service import media_upload
+from server.service.media_upload import MAX_OBJECT_SIZE, MAX_PARTS, MIN_PART_SIZE, UploadSession, choose_part_size, part_urls
+from server.storage.settings import StorageSettings
+
+MiB = 1024 * 1024
+
+
+@pytest.fixture
+def part_size(monkeypatch):
+    """기본 part 크기를 바꾼다."""
+    settings = StorageSettings.model_construct(upload_part_size=16 * MiB)
+    monkeypatch.setattr(media_upload, "get_settings", lambda: settings)
+
+    def set(size: int) -> None:
+        settings.upload_part_size = size
+
+    return set
+
+
+@pytest.mark.parametrize(
+    "size, expected",
+    [
+        (1, 16 * MiB),
+        (16 * MiB * MAX_PARTS, 16 * MiB),
+        # 기본 크기로는 part 가 MAX_PARTS 개를 넘는다.
+        (16 * MiB * MAX_PARTS + 1, 16 * MiB + 1),
+        (MAX_OBJECT_SIZE, math.ceil(MAX_OBJECT_SIZE / MAX_PARTS)),
+    ],
+)
+def test_choose_part_size(part_size, size, expected):
+    assert choose_part_size(size) == expected
+    assert math.ceil(size / expected) <= MAX_PARTS
+
+
+def test_part_size_is_at_least_s3_minimum(part_size):
+    part_size(1 * MiB)
+    assert choose_part_size(10 * MiB) == MIN_PART_SIZE
+
+
+@pytest.mark.parametrize("size", [MIN_PART_SIZE * MAX_PARTS + 1, 123_456_789_012, MAX_OBJECT_SIZE - 1])
+def test_part_count_within_s3_limits(part_size, size):
+    part_size(MIN_PART_SIZE)
+    chosen = choose_part_size(size)
+    assert MIN_PART_SIZE <= chosen <= 5 * 1024 * MiB  # S3 part 하나는 5GiB 까지
+    assert math.ceil(size / chosen) <= MAX_PARTS
+
+
+def test_part_urls_rejects_unknown_parts(part_size, monkeypatch):
+    monkeypatch.setattr(
+        media_upload,
+        "generate_upload_part_urls",
+        lambda bucket, object_name, upload_id, part_numbers, expires_seconds: {n: f"url/{n}" for n in part_numbers},
+    )
+    session = UploadSession(
+        id="u", project_id="p", bucket="media", object_name="o", upload_id="up", name="a.mp4",
+        content_type="video/mp4", size=40 * MiB, part_size=16 * MiB, part_count=3, created_at=0.0,
+    )
+    assert part_urls(session) == {1: "url/1", 2: "url/2", 3: "url/3"}
+    assert part_urls(session, [2]) == {2: "url/2"}
+    for numbers in ([0], [4], [1, 4]):
+        with pytest.raises(InvalidInputError):
+            part_urls(session, numbers)
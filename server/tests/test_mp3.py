@@ -0,0 +1,200 @@
+import random
+
+import pytest
+
+from server.audio import mp3
+
+# 24kHz 모노 32kbps MPEG-2 Layer III: 프레임 하나가 576 샘플, 96 바이트
+HEADER = mp3.build_header()
+# TOC 까지 들어가는 Xing 태그를 담을 만큼 큰 프레임 (417 바이트)
+LARGE_HEADER = mp3.build_header(version=1, sample_rate=44100, bitrate=128)
+
+
+def _frames(count: int, header: mp3.FrameHeader = HEADER) -> bytes:
+    return mp3.silent_frame(header) * count
+
+
+def _id3v2(body: bytes) -> bytes:
+    size = len(body)
+    syncsafe = bytes((size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + syncsafe + body
+
+
+def _lame_info_frame(header: mp3.FrameHeader, *, flags: int, delay: int, padding: int) -> bytes:
+    """Xing 뒤 선택 필드를 flags 대로 채운 Info 프레임. LAME 태그 위치가 flags 에 따라 밀린다."""
+    frame = bytearray(mp3.silent_frame(header))
+    offset = 4 + header.side_info_length
+    tag = b"Info" + flags.to_bytes(4, "big")
+    tag += bytes(4) if flags & 0x1 else b""
+    tag += bytes(4) if flags & 0x2 else b""
+    tag += bytes(100) if flags & 0x4 else b""
+    tag += bytes(4) if flags & 0x8 else b""
+    lame = bytearray(24)
+    lame[0:9] = b"LAME3.100"
+    lame[21] = delay >> 4
+    lame[22] = ((delay & 0x0F) << 4) | (padding >> 8)
+    lame[23] = padding & 0xFF
+    tag += lame
+    frame[offset:offset + len(tag)] = tag
+    return bytes(frame)
+
+
+def test_parse_header_fields():
+    header = mp3.parse_header(bytes.fromhex("fff3 44c0"))  # MPEG-2 L3 32kbps 24kHz mono
+    assert header == HEADER
+    assert (header.version, header.layer, header.bitrate, header.sample_rate) == (2, 3, 32, 24000)
+    assert header.channels == 1
+    assert not header.has_crc
+    assert header.samples_per_frame == 576
+    assert header.frame_length == 96
+    assert header.duration == pytest.approx(0.024)
+    assert header.side_info_length == 9
+
+
+@pytest.mark.parametrize(
+    "version, sample_rate, bitrate, padding, frame_length",
+    [
+        (1, 44100, 128, False, 417),
+        (1, 44100, 128, True, 418),
+        (1, 48000, 320, False, 960),
+        (2, 22050, 64, False, 208),
+        (2.5, 8000, 8, False, 72),
+    ],
+)
+def test_frame_length(version, sample_rate, bitrate, padding, frame_length):
+    header = mp3.build_header(version=version, sample_rate=sample_rate, bitrate=bitrate, padding=padding)
+    assert header.frame_length == frame_length
+    assert mp3.parse_header(header.raw) == header
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "fff3 44",  # 4바이트가 안 된다
+        "ff13 44c0",  # 동기 워드가 아니다
+        "ffeb 44c0",  # version 01 (reserved)
+        "fff1 44c0",  # layer 00 (reserved)
+        "fff3 04c0",  # free bitrate
+        "fff3 f4c0",  # bad bitrate
+        "fff3 4cc0",  # sample rate index 3
+    ],
+)
+def test_parse_header_rejects_invalid(raw):
+    assert mp3.parse_header(bytes.fromhex(raw)) is None
+
+
+def test_header_for():
+    header = mp3.header_for(44100, 2)
+    assert (header.version, header.sample_rate, header.channels) == (1, 44100, 2)
+    with pytest.raises(ValueError):
+        mp3.header_for(44000, 1)
+
+
+def test_iter_frames_skips_tags_and_garbage():
+    frames = _frames(3)
+    data = _id3v2(b"\xff\xfb" + bytes(30)) + frames[:96] + b"\xff\xf3junk" + frames[96:] + b"TAG" + bytes(125)
+    assert [header for _, header in mp3.iter_frames(data)] == [HEADER] * 3
+    assert mp3.strip_headers(data) == frames
+    assert mp3.duration_seconds(data) == pytest.approx(3 * 0.024)
+
+
+@pytest.mark.parametrize("flags", [0x0, 0x1, 0x3, 0x7, 0xF])
+def test_analyze_reads_lame_delay_and_padding(flags):
+    info_frame = _lame_info_frame(LARGE_HEADER, flags=flags, delay=576, padding=1234)
+    assert len(info_frame) == LARGE_HEADER.frame_length
+    info = mp3.analyze(_id3v2(bytes(20)) + info_frame + _frames(10, LARGE_HEADER))
+    # Info 프레임은 소리가 없으므로 세지 않는다.
+    assert info.frame_count == 10
+    assert info.duration == pytest.approx(10 * 1152 / 44100)
+    assert info.data_size == 10 * LARGE_HEADER.frame_length
+    assert (info.sample_rate, info.channels) == (44100, 1)
+    assert (info.encoder_delay, info.encoder_padding) == (576, 1234)
+
+
+def test_analyze_without_info_frame():
+    info = mp3.analyze(_frames(5))
+    assert info.frame_count == 5
+    assert (info.encoder_delay, info.encoder_padding) == (0, 0)
+
+
+def test_analyze_empty():
+    info = mp3.analyze(b"")
+    assert (info.frame_count, info.duration, info.sample_rate, info.channels) == (0, 0.0, 0, 0)
+
+
+def test_xing_without_lame_tag():
+    frame = bytearray(mp3.silent_frame(HEADER))
+    offset = 4 + HEADER.side_info_length
+    frame[offset:offset + 8] = b"Xing" + bytes(4)
+    info = mp3.analyze(bytes(frame) + _frames(2))
+    assert info.frame_count == 2
+    assert (info.encoder_delay, info.encoder_padding) == (0, 0)
+
+
+def _chunked(data: bytes, sizes: list[int]):
+    pos = 0
+    for size in sizes:
+        yield data[pos:pos + size]
+        pos += size
+    yield data[pos:]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_iter_stream_frames_matches_strip_headers(seed):
+    rng = random.Random(seed)
+    info_frame = mp3.build_info_frame(HEADER, frame_count=0, data_size=0)
+    data = _id3v2(bytes(rng.randrange(300))) + info_frame + _frames(20) + b"TAG" + bytes(125)
+    sizes = [rng.randint(1, 200) for _ in range(40)]
+    assert b"".join(mp3.iter_stream_frames(_chunked(data, sizes))) == mp3.strip_headers(data) == _frames(20)
+
+
+def test_iter_stream_frames_drops_truncated_last_frame():
+    data = _frames(3) + mp3.silent_frame(HEADER)[:50]
+    assert b"".join(mp3.iter_stream_frames([data])) == _frames(3)
+
+
+def test_iter_stream_frames_tag_only():
+    assert list(mp3.iter_stream_frames([_id3v2(bytes(5))])) == []
+    assert list(mp3.iter_stream_frames([])) == []
+
+
+@pytest.mark.parametrize("header", [HEADER, LARGE_HEADER, mp3.header_for(48000, 2)])
+def test_build_info_frame_round_trip(header):
+    audio = _frames(30, header)
+    info_frame = mp3.build_info_frame(
+        header, frame_count=30, data_size=len(audio), encoder_delay=1105, encoder_padding=2047
+    )
+    assert len(info_frame) == header.frame_length
+    assert mp3.is_info_frame(info_frame, 0, header)
+
+    info = mp3.analyze(info_frame + audio)
+    assert info.frame_count == 30
+    assert info.data_size == len(audio)
+    assert (info.encoder_delay, info.encoder_padding) == (1105, 2047)
+    assert mp3.strip_headers(info_frame + audio) == audio
+
+    # Xing 의 프레임 수와 바이트 수는 Info 프레임 자신을 포함한다.
+    offset = 4 + header.side_info_length
+    assert int.from_bytes(info_frame[offset + 8:offset + 12], "big") == 31
+    assert int.from_bytes(info_frame[offset + 12:offset + 16], "big") == len(audio) + len(info_frame)
+    # LAME 태그 CRC 는 그 앞의 모든 바이트에 대한 값이다.
+    crc_offset = offset + 16 + 34
+    assert info_frame[crc_offset:crc_offset + 2] == mp3._crc16(info_frame[:crc_offset]).to_bytes(2, "big")
+
+
+def test_build_info_frame_rejects_small_frame():
+    with pytest.raises(ValueError):
+        mp3.build_info_frame(mp3.build_header(bitrate=8), frame_count=1, data_size=1)
+
+
+@pytest.mark.parametrize("frame_count", [0, 1, 681, 682, 2000])
+def test_iter_silence(frame_count):
+    chunks = list(mp3.iter_silence(frame_count, HEADER, chunk_size=64 * 1024))
+    assert b"".join(chunks) == _frames(frame_count)
+    assert all(len(chunk) <= 64 * 1024 for chunk in chunks)
+    assert mp3.frames_for(frame_count * HEADER.duration, HEADER) == frame_count
+
+
+def test_concat_strips_each_part():
+    part = _id3v2(bytes(10)) + mp3.build_info_frame(HEADER, frame_count=2, data_size=192) + _frames(2)
+    assert mp3.concat([part, part]) == _frames(4)
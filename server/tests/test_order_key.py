@@ -0,0 +1,77 @@
+import importlib.util
+import random
+from itertools import islice
+from pathlib import Path
+
+import pytest
+
+from server.common.order_key import DIGITS, iter_keys, key_between
+
+_MIGRATION = Path(__file__).resolve().parents[1] / "alembic" / "versions" / "c4d8e2a61f37_sections_scenes_tables.py"
+
+
+def _check_key(key: str):
+    assert key
+    assert set(key) <= set(DIGITS)
+    assert not key.endswith(DIGITS[0])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_inserts_keep_order(seed):
+    rng = random.Random(seed)
+    keys: list[str] = []
+    for _ in range(300):
+        i = rng.randint(0, len(keys))
+        a = keys[i - 1] if i > 0 else None
+        b = keys[i] if i < len(keys) else None
+        key = key_between(a, b)
+        _check_key(key)
+        if a is not None:
+            assert a < key
+        if b is not None:
+            assert key < b
+        keys.insert(i, key)
+    assert keys == sorted(keys)
+
+
+@pytest.mark.parametrize("insert_at", ["front", "back", "second"])
+def test_repeated_inserts_at_same_place(insert_at):
+    keys = [key_between(None, None)]
+    for _ in range(500):
+        if insert_at == "front":
+            i = 0
+        elif insert_at == "back":
+            i = len(keys)
+        else:
+            i = 1
+        a = keys[i - 1] if i > 0 else None
+        b = keys[i] if i < len(keys) else None
+        key = key_between(a, b)
+        _check_key(key)
+        keys.insert(i, key)
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+
+
+def test_key_between_rejects_out_of_order():
+    with pytest.raises(ValueError):
+        key_between("b", "a")
+    with pytest.raises(ValueError):
+        key_between("a", "a")
+
+
+def test_iter_keys_are_increasing():
+    keys = list(islice(iter_keys(), 1000))
+    for key in keys:
+        _check_key(key)
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+
+
+def test_migration_keys_match_iter_keys():
+    # 마이그레이션은 앱 코드를 import 하지 않으려고 키 생성기를 따로 들고 있다.
+    spec = importlib.util.spec_from_file_location("c4d8e2a61f37_sections_scenes_tables", _MIGRATION)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    assert migration._DIGITS == DIGITS
+    assert list(islice(migration._keys(), 1000)) == list(islice(iter_keys(), 1000))
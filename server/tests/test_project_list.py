@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from server.common.exception import InvalidInputError
+from server.database.models import ProjectModel
+from server.repositories import ProjectModelRepository, ProjectSummary
+from server.service.project import _decode_cursor, _encode_cursor, get_project_page
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def test_cursor_round_trip():
+    summary = ProjectSummary(id="p-1", title="t", updated_at=T0 + timedelta(microseconds=123))
+    cursor = _encode_cursor(summary)
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == (summary.updated_at, "p-1")
+
+
+@pytest.mark.parametrize("cursor", ["!!!", "bm90IGpzb24", "WzFd", "WyJ4IiwgInAiXQ"])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidInputError):
+        _decode_cursor(cursor)
+
+
+@pytest.fixture
+def projects(db):
+    # p0..p6, 같은 시각에 고친 프로젝트끼리는 id 로 순서를 정한다.
+    times = [T0, T0, T0 + timedelta(minutes=1), T0 + timedelta(minutes=1), T0 + timedelta(minutes=1), T0 + timedelta(minutes=2), T0]
+    db.add_all(
+        ProjectModel(id=f"p{i}", body={"title": f"제목 {i}", "media": []}, updated_at=updated_at)
+        for i, updated_at in enumerate(times)
+    )
+    db.commit()
+    return ["p5", "p4", "p3", "p2", "p6", "p1", "p0"]
+
+
+def _all_pages(database_url: str, limit: int) -> list[list[ProjectSummary]]:
+    async def run():
+        engine = create_async_engine(make_url(database_url).set(drivername="postgresql+asyncpg"))
+        pages, cursor = [], None
+        try:
+            async with AsyncSession(engine) as db:
+                while True:
+                    page, cursor = await get_project_page(db, limit, cursor)
+                    pages.append(page)
+                    if cursor is None:
+                        return pages
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 50])
+def test_pages_cover_projects_newest_first(database_url, projects, limit):
+    pages = _all_pages(database_url, limit)
+    assert [p.id for page in pages for p in page] == projects
+    assert all(len(page) == limit for page in pages[:-1])
+    assert pages[0][0].title == "제목 5"
+
+
+def test_empty_list(database_url):
+    assert _all_pages(database_url, 10) == [[]]
+
+
+def test_title_change_moves_project_to_front(db, projects):
+    ProjectModelRepository(db).set_title("p0", "새 제목")
+    page = ProjectModelRepository(db).get_summary_page(2)
+    assert [(p.id, p.title) for p in page] == [("p0", "새 제목"), ("p5", "제목 5")]
+    after = (page[-1].updated_at, page[-1].id)
+    assert [p.id for p in ProjectModelRepository(db).get_summary_page(10, after)] == projects[1:-1]
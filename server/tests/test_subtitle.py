@@ -0,0 +1,163 @@
+import pytest
+import redis
+
+from server.service.project_types import AudioInfo, BlankSection, Interval, Project, SpeechSection, Word
+from server.subtitle import cache
+from server.subtitle.settings import SubtitleSettings
+from server.subtitle.subtitle import Cue, _split_lines, iter_cues, iter_srt, iter_webvtt
+
+
+def _word(text: str, start: float, split: bool = False) -> Word:
+    return Word(text=text, displayed_text=text, is_caption_split=split, start=start)
+
+
+def _speech(id: str, intervals: list[list[Word]], duration: float, generated: bool = True) -> SpeechSection:
+    return SpeechSection(
+        id=id,
+        duration=duration,
+        is_generated=generated,
+        intervals=[Interval(id=f"{id}-{i}", words=words) for i, words in enumerate(intervals)],
+        file_id=f"{id}.mp3" if generated else None,
+        audio=AudioInfo(duration=duration, frame_count=0, sample_rate=24000, channels=1, data_size=0),
+    )
+
+
+def _project(*sections) -> Project:
+    return Project(id="p", title="t", sections=list(sections), scenes=[], media=[])
+
+
+def test_split_lines_wraps_at_word_boundaries():
+    words = [(float(i), text) for i, text in enumerate(["aaaaa", "bbbbb", "ccccc", "ddddd", "eeeee"])]
+    # 한 줄 11자, 두 줄이 넘치면 다음 자막은 넘친 어절의 시각에 시작한다.
+    assert list(_split_lines(words, 11, 2)) == [
+        (0.0, ["aaaaa bbbbb", "ccccc ddddd"]),
+        (4.0, ["eeeee"]),
+    ]
+
+
+def test_split_lines_keeps_long_word_on_own_line():
+    words = [(0.0, "짧은"), (1.0, "가" * 30), (2.0, "말")]
+    assert list(_split_lines(words, 10, 3)) == [(0.0, ["짧은", "가" * 30, "말"])]
+
+
+def test_iter_cues_splits_at_caption_split_and_interval():
+    section = _speech(
+        "s",
+        [
+            [_word("안녕", 0.0), _word("하세요", 0.3, split=True), _word("오늘은", 0.8), _word(" ", 1.0), _word("맑음", 1.1)],
+            [_word("끝", 1.5)],
+        ],
+        duration=2.0,
+    )
+    # 앞의 빈 섹션(0.48초 = 무음 프레임 20개)만큼 밀린다.
+    project = _project(BlankSection(id="b", duration=0.48), _speech("x", [[_word("안", 0.0)]], 1.0, generated=False), section)
+    cues = list(iter_cues(project))
+
+    assert [cue.lines for cue in cues] == [["안녕 하세요"], ["오늘은 맑음"], ["끝"]]
+    # 자막은 다음 자막이 시작할 때 끝나고, 마지막 자막은 섹션 발화가 끝날 때 끝난다.
+    assert [(cue.start, cue.end) for cue in cues] == pytest.approx([(0.48, 1.28), (1.28, 1.98), (1.98, 2.48)])
+
+
+def test_iter_cues_restarts_per_section():
+    project = _project(
+        _speech("a", [[_word("하나", 0.0), _word("둘", 0.5)]], duration=1.0),
+        _speech("b", [[_word("셋", 0.2)]], duration=1.0),
+    )
+    cues = list(iter_cues(project, max_line_chars=2, max_lines=1))
+    assert cues == [
+        Cue(start=0.0, end=0.5, lines=["하나"]),
+        Cue(start=0.5, end=1.0, lines=["둘"]),
+        Cue(start=pytest.approx(1.2), end=pytest.approx(2.0), lines=["셋"]),
+    ]
+
+
+def test_iter_cues_without_audio():
+    assert list(iter_cues(_project(_speech("a", [[_word("하나", 0.0)]], 1.0, generated=False)))) == []
+
+
+def test_srt_and_webvtt_format():
+    cues = [Cue(start=0.0, end=1.5, lines=["하나", "a --> b"]), Cue(start=3723.0456, end=3724.0, lines=["둘"])]
+    assert "".join(iter_srt(cues)) == (
+        "1\n00:00:00,000 --> 00:00:01,500\n하나\na --> b\n\n"
+        "2\n01:02:03,046 --> 01:02:04,000\n둘\n\n"
+    )
+    assert "".join(iter_webvtt(cues)) == (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:01.500\n하나\na -> b\n\n"
+        "01:02:03.046 --> 01:02:04.000\n둘\n\n"
+    )
+
+
+@pytest.fixture
+def redis_cache(monkeypatch, redis_client):
+    monkeypatch.setattr(cache, "get_client", lambda: redis_client)
+    return redis_client
+
+
+def _cache(**settings) -> cache.SubtitleCache:
+    return cache.SubtitleCache(SubtitleSettings(**settings))
+
+
+class _Producer:
+    """몇 번 불렸는지 세는 자막 생성기"""
+
+    def __init__(self, chunks: list[str]):
+        self.chunks = chunks
+        self.calls = 0
+
+    def __iter__(self):
+        self.calls += 1
+        yield from self.chunks
+
+
+def test_stream_caches_then_replays(redis_cache, monkeypatch):
+    monkeypatch.setattr(cache, "_FLUSH_CHARS", 10)
+    monkeypatch.setattr(cache, "_READ_BATCH", 2)
+    chunks = [f"{i}\n00:00 --> 00:01\n자막 {i}\n\n" for i in range(20)]
+    producer = _Producer(chunks)
+    subtitle_cache = _cache()
+
+    assert "".join(subtitle_cache.stream("k", producer)) == "".join(chunks)
+    assert "".join(subtitle_cache.stream("k", producer)) == "".join(chunks)
+    assert producer.calls == 1
+    assert redis_cache.keys("*") == ["subtitle:k"]
+    assert 0 < redis_cache.ttl("subtitle:k") <= 24 * 60 * 60
+
+
+def test_stream_caches_empty_subtitle(redis_cache):
+    producer = _Producer([])
+    subtitle_cache = _cache()
+    assert list(subtitle_cache.stream("k", producer)) == []
+    assert "".join(subtitle_cache.stream("k", producer)) == ""
+    assert producer.calls == 1
+
+
+def test_stream_skips_cache_over_max_bytes(redis_cache):
+    producer = _Producer(["가" * 10, "나" * 10])
+    subtitle_cache = _cache(subtitle_cache_max_bytes=40)
+    # 한글 한 글자는 UTF-8 로 3바이트라 두 번째 조각에서 넘친다.
+    assert "".join(subtitle_cache.stream("k", producer)) == "가" * 10 + "나" * 10
+    assert redis_cache.keys("*") == []
+    list(subtitle_cache.stream("k", producer))
+    assert producer.calls == 2
+
+
+def test_abandoned_stream_leaves_no_cache(redis_cache, monkeypatch):
+    monkeypatch.setattr(cache, "_FLUSH_CHARS", 1)
+    stream = _cache().stream("k", _Producer(["a", "b", "c"]))
+    assert next(stream) == "a"
+    assert next(stream) == "b"
+    assert redis_cache.keys("*") != []  # 임시 키에 앞부분이 적혀 있다.
+    # 클라이언트가 중간에 끊으면 임시 키를 지운다.
+    stream.close()
+    assert redis_cache.keys("*") == []
+
+
+def test_stream_survives_redis_failure(redis_cache, monkeypatch):
+    def fail(*args, **kwargs):
+        raise redis.ConnectionError("redis is down")
+
+    monkeypatch.setattr(redis_cache, "expire", fail)
+    monkeypatch.setattr(redis_cache, "pipeline", fail)
+    monkeypatch.setattr(redis_cache, "delete", fail)
+    assert "".join(_cache().stream("k", _Producer(["a", "b"]))) == "ab"
@@ -0,0 +1,183 @@
+import json
+
+import pytest
+
+from server.tts import cache
+from server.tts.settings import TtsCacheSettings
+from server.tts.types import SynthesisRequest, SynthesisResult
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def objects(monkeypatch, redis_client):
+    """저장소 대신 쓰는 dict. (bucket, object_name) -> bytes"""
+    store: dict[tuple[str, str], bytes] = {}
+
+    def upload(data, object_name, bucket):
+        store[(bucket, object_name)] = data
+
+    def delete(bucket, object_names):
+        for object_name in object_names:
+            store.pop((bucket, object_name), None)
+
+    monkeypatch.setattr(cache, "_redis", lambda: redis_client)
+    monkeypatch.setattr(cache, "upload_audio_bytes", upload)
+    monkeypatch.setattr(cache, "download_object_bytes", lambda bucket, object_name: store.get((bucket, object_name)))
+    monkeypatch.setattr(cache, "delete_objects", delete)
+    monkeypatch.setattr(cache, "get_storage_settings", lambda: type("S", (), {"voice_bucket": "voice"})())
+    return store
+
+
+def _cache(**settings) -> cache.TtsCache:
+    return cache.TtsCache(TtsCacheSettings(**settings))
+
+
+def _result(size: int, mark: float = 0.0) -> SynthesisResult:
+    return SynthesisResult(audio_content=b"\x00" * size, timepoints={"w0": mark})
+
+
+def test_cache_key_depends_on_request_and_backend():
+    request = SynthesisRequest(ssml="<speak>a</speak>", language_code="ko-KR", voice_name="v")
+    key = cache.make_cache_key(request, "google")
+    assert key == cache.make_cache_key(request.model_copy(), "google")
+    assert key != cache.make_cache_key(request, "local")
+    assert key != cache.make_cache_key(request.model_copy(update={"voice_name": "w"}), "google")
+    assert key != cache.make_cache_key(request.model_copy(update={"ssml": "<speak>b</speak>"}), "google")
+
+
+def test_put_then_get(objects, clock, redis_client):
+    tts_cache = _cache()
+    assert tts_cache.get("a") is None
+    tts_cache.put("a", _result(10, 0.5))
+    assert tts_cache.get("a") == _result(10, 0.5)
+    assert tts_cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "bytes": 10}
+    assert objects == {("voice", "tts/cache/a.mp3"): b"\x00" * 10}
+
+
+def test_put_same_key_counts_bytes_once(objects, clock):
+    tts_cache = _cache()
+    tts_cache.put("a", _result(10))
+    tts_cache.put("a", _result(10))
+    assert tts_cache.stats()["bytes"] == 10
+
+
+def test_evicts_least_recently_used_over_max_bytes(objects, clock):
+    tts_cache = _cache(tts_cache_max_bytes=25)
+    for key in ("a", "b"):
+        clock.now += 1
+        tts_cache.put(key, _result(10))
+    clock.now += 1
+    assert tts_cache.get("a") is not None  # b 가 가장 오래 안 쓴 엔트리가 된다.
+
+    clock.now += 1
+    tts_cache.put("c", _result(10))
+
+    assert tts_cache.get("b") is None
+    assert tts_cache.get("a") is not None and tts_cache.get("c") is not None
+    assert tts_cache.stats()["bytes"] == 20
+    assert ("voice", "tts/cache/b.mp3") not in objects
+
+
+def test_evicts_only_as_much_as_needed(objects, clock):
+    tts_cache = _cache(tts_cache_max_bytes=1000)
+    for i in range(10):
+        clock.now += 1
+        tts_cache.put(f"k{i}", _result(100))
+    assert tts_cache.stats()["bytes"] == 1000
+
+    clock.now += 1
+    tts_cache.put("big", _result(250))
+    # 넘친 250 바이트를 채울 만큼, 오래된 순서로 셋만 지운다.
+    assert [tts_cache.get(f"k{i}") is None for i in range(10)] == [True] * 3 + [False] * 7
+    assert tts_cache.stats()["bytes"] == 950
+    assert len(objects) == 8
+
+
+def test_evicts_entries_older_than_max_age(objects, clock):
+    tts_cache = _cache(tts_cache_max_age_seconds=60)
+    tts_cache.put("old", _result(10))
+    clock.now += 30
+    tts_cache.put("new", _result(10))
+    clock.now += 45
+
+    assert tts_cache.evict() == 1
+    assert tts_cache.stats()["entries"] == 1
+    assert tts_cache.stats()["bytes"] == 10
+    assert tts_cache.get("old") is None
+    assert tts_cache.get("new") is not None
+
+
+def test_evict_in_batches(objects, clock, monkeypatch):
+    monkeypatch.setattr(cache, "_EVICT_BATCH", 3)
+    tts_cache = _cache(tts_cache_max_age_seconds=60)
+    for i in range(10):
+        tts_cache.put(f"k{i}", _result(1))
+    clock.now += 61
+    assert tts_cache.evict() == 10
+    assert tts_cache.stats() == {"hits": 0, "misses": 0, "entries": 0, "bytes": 0}
+    assert objects == {}
+
+
+def test_missing_object_is_a_miss_and_forgets_entry(objects, clock):
+    tts_cache = _cache()
+    tts_cache.put("a", _result(10))
+    objects.clear()
+    assert tts_cache.get("a") is None
+    assert tts_cache.stats() == {"hits": 0, "misses": 1, "entries": 0, "bytes": 0}
+
+
+def test_forget_twice_frees_bytes_once(objects, clock, redis_client):
+    tts_cache = _cache()
+    tts_cache.put("a", _result(10))
+    tts_cache.put("b", _result(5))
+    # 동시에 같은 엔트리를 지우는 두 요청
+    assert tts_cache._forget(redis_client, ["a"]) == 1
+    assert tts_cache._forget(redis_client, ["a"]) == 0
+    assert tts_cache.stats()["bytes"] == 5
+
+
+def test_resets_drifted_byte_counter(objects, clock, redis_client):
+    tts_cache = _cache(tts_cache_max_bytes=100)
+    redis_client.set(cache._BYTES_KEY, 500)
+    assert tts_cache.evict() == 0
+    assert tts_cache.stats()["bytes"] == 0
+
+
+def test_disabled_cache_does_nothing(objects, clock, redis_client):
+    tts_cache = _cache(tts_cache_enabled=False)
+    tts_cache.put("a", _result(10))
+    assert tts_cache.get("a") is None
+    assert objects == {}
+    assert redis_client.keys("*") == []
+
+
+def test_redis_failure_is_a_miss(objects, clock, monkeypatch):
+    tts_cache = _cache()
+    tts_cache.put("a", _result(10))
+
+    def down():
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(cache, "_redis", down)
+    assert tts_cache.get("a") is None
+    tts_cache.put("b", _result(10))  # 저장 실패도 합성을 막지 않는다.
+
+
+def test_entry_metadata(objects, clock, redis_client):
+    _cache().put("a", _result(7, 1.25))
+    entry = json.loads(redis_client.get(cache._ENTRY_PREFIX + "a"))
+    assert entry == {"bucket": "voice", "object_name": "tts/cache/a.mp3", "size": 7, "timepoints": {"w0": 1.25}}
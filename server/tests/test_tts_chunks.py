@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from server.audio import mp3
+from server.tts.tts import Word, _stitch_chunks, build_ssml, plan_chunks
+from server.tts.types import SynthesisResult
+
+HEADER = mp3.build_header()  # 프레임 하나 0.024초
+
+
+def _words(texts: list[str]) -> list[Word]:
+    return [Word(text=text, displayed_text=text, is_caption_splitted=False, start=0.0) for text in texts]
+
+
+def _ssml_size(words: list[Word], chunk: range) -> int:
+    return len(build_ssml(" ".join(words[i].text for i in chunk)).encode("utf-8"))
+
+
+def _check_cover(words: list[Word], chunks: list[range]):
+    assert chunks[0].start == 0
+    assert chunks[-1].stop == len(words)
+    for a, b in zip(chunks, chunks[1:]):
+        assert a.stop == b.start
+    assert all(len(chunk) > 0 for chunk in chunks)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chunks_fit_limit_and_cover_words(seed):
+    rng = random.Random(seed)
+    texts = ["가" * rng.randint(1, 8) + rng.choice(["", "", "", "."]) for _ in range(rng.randint(1, 300))]
+    words = _words(texts)
+    limit = rng.randint(150, 2000)
+    chunks = plan_chunks(words, limit)
+    _check_cover(words, chunks)
+    for chunk in chunks:
+        assert _ssml_size(words, chunk) <= limit
+
+
+def test_short_text_is_one_chunk():
+    words = _words(["안녕하세요", "SSML", "테스트", "입니다."])
+    assert plan_chunks(words, 5000) == [range(0, 4)]
+
+
+def test_no_words():
+    assert plan_chunks([], 5000) == []
+
+
+def test_cuts_at_sentence_end():
+    words = _words(["하나", "둘.", "셋", "넷", "다섯.", "여섯", "일곱."])
+    # 네 어절까지 들어가는 크기. (plan_chunks 는 어절마다 뒤 공백까지 센다)
+    limit = _ssml_size(words, range(0, 4)) + 1
+    assert _ssml_size(words, range(0, 5)) > limit
+    chunks = plan_chunks(words, limit)
+    # 네 어절까지 들어가더라도 그 앞의 문장 끝에서 자른다.
+    assert chunks == [range(0, 2), range(2, 5), range(5, 7)]
+
+
+def test_cuts_long_sentence_at_word():
+    words = _words(["긴"] * 50 + ["문장."])
+    limit = 300
+    chunks = plan_chunks(words, limit)
+    assert len(chunks) > 1
+    _check_cover(words, chunks)
+    for chunk in chunks:
+        assert _ssml_size(words, chunk) <= limit
+
+
+def test_oversized_word_gets_own_chunk():
+    words = _words(["짧은", "가" * 200, "말."])
+    chunks = plan_chunks(words, 200)
+    _check_cover(words, chunks)
+    assert range(1, 2) in chunks
+
+
+def _result(frame_count: int, timepoints: dict[str, float], info_frame: bool = True) -> SynthesisResult:
+    audio = mp3.silent_frame(HEADER) * frame_count
+    if info_frame:
+        audio = mp3.build_info_frame(HEADER, frame_count=frame_count, data_size=len(audio)) + audio
+    return SynthesisResult(audio_content=audio, timepoints=timepoints)
+
+
+def test_stitch_shifts_timepoints_by_previous_chunks():
+    words = _words(["a", "b", "c", "d", "e"])
+    chunks = [range(0, 2), range(2, 4), range(4, 5)]
+    results = [
+        _result(50, {"w0": 0.0, "w1": 0.5}),  # 1.2초
+        _result(25, {"w0": 0.1, "w1": 0.3}),  # 0.6초
+        _result(10, {"w0": 0.05}),
+    ]
+    audio = _stitch_chunks(words, chunks, results)
+
+    assert [w.start for w in words] == pytest.approx([0.0, 0.5, 1.3, 1.5, 1.85])
+    # 청크마다 붙어 있던 Info 프레임은 떼고 소리가 담긴 프레임만 잇는다.
+    assert audio == mp3.silent_frame(HEADER) * 85
+    assert mp3.duration_seconds(audio) == pytest.approx(85 * 0.024)
+
+
+def test_stitch_keeps_missing_timepoints():
+    words = _words(["a", "b", "c"])
+    words[1].start = 9.0
+    _stitch_chunks(words, [range(0, 2), range(2, 3)], [_result(10, {"w0": 0.0}), _result(10, {"w0": 0.1})])
+    assert [w.start for w in words] == pytest.approx([0.0, 9.0, 0.34])
+
+
+def test_stitch_single_chunk_keeps_audio_as_is():
+    words = _words(["a", "b"])
+    result = _result(10, {"w0": 0.0, "w1": 0.2})
+    assert _stitch_chunks(words, [range(0, 2)], [result]) == result.audio_content
+    assert [w.start for w in words] == pytest.approx([0.0, 0.2])
@@ -0,0 +1,188 @@
+import asyncio
+
+import pytest
+
+from server.common.exception import RateLimitedError
+from server.tts import rate_limit
+from server.tts.settings import TtsRateLimitSettings
+
+
+@pytest.fixture(autouse=True)
+def redis(monkeypatch, redis_client):
+    monkeypatch.setattr(rate_limit, "_redis", lambda: redis_client)
+    return redis_client
+
+
+def _limiter(**settings) -> rate_limit.TtsRateLimiter:
+    # 분당 1회로 두어 테스트하는 동안 토큰이 거의 다시 차지 않게 한다.
+    settings = {"tts_rate_limit_per_minute": 1, "tts_rate_limit_burst": 100, **settings}
+    return rate_limit.TtsRateLimiter(TtsRateLimitSettings(**settings))
+
+
+def _state(redis) -> dict[str, float]:
+    return {key: float(value) for key, value in redis.hgetall(rate_limit._STATE_KEY).items()}
+
+
+def _server_ms(redis) -> int:
+    seconds, micros = redis.time()
+    return seconds * 1000 + micros // 1000
+
+
+def test_token_bucket_allows_burst_then_waits(redis):
+    limiter = _limiter(tts_rate_limit_burst=3, tts_rate_limit_per_minute=60)
+    assert [limiter._try_acquire(f"l{i}") for i in range(3)] == [0, 0, 0]
+    wait = limiter._try_acquire("l3")
+    # 분당 60회면 토큰 하나가 차는 데 1초
+    assert 900 < wait <= 1000
+    assert redis.zcard(rate_limit._LEASES_KEY) == 3
+
+
+def test_tokens_refill_with_elapsed_time(redis):
+    limiter = _limiter(tts_rate_limit_burst=1, tts_rate_limit_per_minute=60)
+    assert limiter._try_acquire("a") == 0
+    assert limiter._try_acquire("b") > 0
+    # 2초 전에 마지막으로 확인한 것처럼 되돌린다. 버킷 크기(1)까지만 찬다.
+    redis.hset(rate_limit._STATE_KEY, "ts", _server_ms(redis) - 2000)
+    assert limiter._try_acquire("b") == 0
+    assert _state(redis)["tokens"] < 0.1
+
+
+def test_concurrency_limit(redis):
+    limiter = _limiter(tts_concurrency_max=2)
+    assert limiter._try_acquire("a") == 0
+    assert limiter._try_acquire("b") == 0
+    assert limiter._try_acquire("c") == -1
+    limiter.release("a")
+    assert limiter._try_acquire("c") == 0
+
+
+def test_expired_leases_free_slots(redis):
+    limiter = _limiter(tts_concurrency_max=1)
+    assert limiter._try_acquire("dead") == 0
+    assert limiter._try_acquire("b") == -1
+    # 슬롯을 잡은 프로세스가 죽어서 반납하지 못한 채 lease 가 만료됐다.
+    redis.zadd(rate_limit._LEASES_KEY, {"dead": _server_ms(redis) - 1})
+    assert limiter._try_acquire("b") == 0
+    assert redis.zrange(rate_limit._LEASES_KEY, 0, -1) == ["b"]
+
+
+def test_throttle_decreases_limit_once_per_cooldown(redis):
+    limiter = _limiter(tts_concurrency_max=32, tts_concurrency_decrease=0.5, tts_concurrency_cooldown_ms=60_000)
+    for lease in ("a", "b", "c"):
+        assert limiter._try_acquire(lease) == 0
+    limiter.release("a", throttled=True)
+    limiter.release("b", throttled=True)  # cooldown 안이라 다시 줄이지 않는다.
+
+    state = _state(redis)
+    assert state["limit"] == 16
+    # 줄일 때 토큰도 비운다.
+    assert state["tokens"] == 0
+    assert limiter._try_acquire("d") > 0
+
+    # cooldown 이 지나면 다시 줄인다.
+    redis.hset(rate_limit._STATE_KEY, "decreased_at", _server_ms(redis) - 60_000)
+    limiter.release("c", throttled=True)
+    assert _state(redis)["limit"] == 8
+    assert redis.zcard(rate_limit._LEASES_KEY) == 0
+
+
+def test_throttle_respects_min_limit(redis):
+    limiter = _limiter(tts_concurrency_min=3, tts_concurrency_max=4, tts_concurrency_cooldown_ms=0)
+    for lease in ("a", "b"):
+        limiter._try_acquire(lease)
+        limiter.release(lease, throttled=True)
+    assert _state(redis)["limit"] == 3
+
+
+def test_success_increases_limit_additively(redis):
+    limiter = _limiter(tts_concurrency_max=10, tts_concurrency_increase=1.0)
+    redis.hset(rate_limit._STATE_KEY, "limit", 4)
+    for i in range(4):
+        assert limiter._try_acquire(str(i)) == 0
+        limiter.release(str(i))
+    # limit 개를 성공하면 대략 1 늘어난다.
+    assert 4.9 < _state(redis)["limit"] < 5.0
+
+    for i in range(100):
+        limiter._try_acquire(f"x{i}")
+        limiter.release(f"x{i}")
+    assert _state(redis)["limit"] == 10
+
+
+def test_fractional_limit_floors(redis):
+    limiter = _limiter()
+    redis.hset(rate_limit._STATE_KEY, "limit", 1.9)
+    assert limiter._try_acquire("a") == 0
+    assert limiter._try_acquire("b") == -1
+
+
+def test_call_retries_throttled_calls(redis):
+    # quota 오류가 나면 토큰을 비우므로 금방 다시 차게 한다.
+    limiter = _limiter(tts_rate_limit_retries=2, tts_concurrency_cooldown_ms=0, tts_rate_limit_per_minute=600_000)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RateLimitedError("quota")
+        return "ok"
+
+    assert limiter.call(fn) == "ok"
+    assert len(calls) == 3
+    assert redis.zcard(rate_limit._LEASES_KEY) == 0
+    assert _state(redis)["limit"] == 32 * 0.5 * 0.5 + 1 / 8
+
+
+def test_call_gives_up_after_retries(redis):
+    limiter = _limiter(tts_rate_limit_retries=1, tts_rate_limit_per_minute=600_000)
+
+    def fn():
+        raise RateLimitedError("quota")
+
+    with pytest.raises(RateLimitedError):
+        limiter.call(fn)
+    assert redis.zcard(rate_limit._LEASES_KEY) == 0
+
+
+def test_call_releases_slot_on_other_errors(redis):
+    limiter = _limiter()
+    with pytest.raises(ValueError):
+        limiter.call(lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert redis.zcard(rate_limit._LEASES_KEY) == 0
+    assert _state(redis)["limit"] == 32
+
+
+def test_acquire_times_out(redis):
+    limiter = _limiter(tts_concurrency_max=1, tts_rate_limit_timeout_seconds=0.1)
+    limiter.acquire()
+    with pytest.raises(RateLimitedError):
+        limiter.acquire()
+    assert int(redis.get(rate_limit._WAITING_KEY)) == 0
+
+
+async def _ok():
+    return "ok"
+
+
+def test_call_async(redis):
+    limiter = _limiter()
+    assert asyncio.run(limiter.call_async(_ok)) == "ok"
+    assert redis.zcard(rate_limit._LEASES_KEY) == 0
+
+
+def test_disabled_limiter_calls_directly(redis):
+    limiter = _limiter(tts_rate_limit_enabled=False)
+    assert limiter.call(lambda: "ok") == "ok"
+    assert redis.keys("*") == []
+
+
+def test_stats(redis):
+    limiter = _limiter(tts_concurrency_max=5)
+    lease = limiter.acquire()
+    stats = limiter.stats()
+    assert stats["in_flight"] == 1
+    assert stats["concurrency_limit"] == 5
+    assert stats["waiting"] == 0
+    assert 98 < stats["tokens"] <= 99.01
+    limiter.release(lease)
+    assert limiter.stats()["in_flight"] == 0